@@ -0,0 +1,12 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: __init__.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Tools for analysing the costs of the SSE schemes, e.g. tuning their parameters
+"""
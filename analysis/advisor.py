@@ -0,0 +1,253 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: advisor.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Scheme advisor, benchmarking every scheme on a stratified sample of a database
+
+The keywords are divided into strata by the lengths of their lists, and each stratum is sampled in proportion,
+so that the sample has the list length distribution of the whole database.
+Every scheme encrypts the sample and searches the keywords of the query log (or all sampled keywords),
+then the measurements are extrapolated to the whole database:
+
+- The encrypted database size and the setup time are proportional to the total size N
+- The search latencies are kept as they are, since the cost of a search mainly depends on the length of the list.
+  The schemes whose search cost grows with the whole database (e.g. the tokens of SSE2 cover all documents)
+  are underestimated.
+"""
+import collections
+import math
+import random
+import time
+import typing
+
+import schemes
+import schemes.CGKO06.SSE2.config
+from analysis.cost_model import DatabaseStatistics, TUNABLE_SCHEMES, tune_config
+from toolkit.database_utils import get_total_size
+
+__all__ = [
+    "ALL_SCHEMES",
+    "RECOMMEND_METRICS",
+    "SchemeReport",
+    "percentile",
+    "stratified_sample",
+    "prepare_config",
+    "default_config_for_database",
+    "benchmark_scheme",
+    "advise",
+    "recommend",
+]
+
+ALL_SCHEMES = (
+    "CGKO06.SSE1",
+    "CGKO06.SSE2",
+    "CJJ14.PiBas",
+    "CJJ14.PiPack",
+    "CJJ14.PiPtr",
+    "CJJ14.Pi2Lev",
+    "CT14.Pi",
+    "ANSS16.Scheme3",
+    "DP17.Pi",
+)
+
+DEFAULT_SAMPLE_KEYWORD_COUNT = 200
+DEFAULT_STRATA_COUNT = 4
+
+# metric -> whether the larger is the better
+RECOMMEND_METRICS = {
+    "p50_search_seconds": False,
+    "p99_search_seconds": False,
+    "edb_bytes_per_posting": False,
+    "setup_postings_per_second": True,
+}
+
+
+class SchemeReport:
+    """ The measurements of a scheme on the sample, and the extrapolations to the whole database.
+    If the scheme fails on the sample, error is the reason and the measurements are None.
+    """
+    __slots__ = [
+        "scheme", "config", "error",
+        "edb_bytes", "edb_bytes_per_posting", "setup_seconds", "setup_postings_per_second",
+        "token_bytes", "token_gen_seconds", "p50_search_seconds", "p99_search_seconds",
+        "full_edb_bytes", "full_setup_seconds",
+    ]
+
+    def __init__(self, scheme: str, config: dict = None, error: str = None):
+        self.scheme = scheme
+        self.config = config
+        self.error = error
+        for field in self.__slots__[3:]:
+            setattr(self, field, None)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        if not self.ok:
+            return f"<SchemeReport {self.scheme} error: {self.error}>"
+        return f"<SchemeReport {self.scheme} {self.edb_bytes_per_posting:.1f} B/posting, " \
+               f"p50 {self.p50_search_seconds * 1000:.3f} ms, p99 {self.p99_search_seconds * 1000:.3f} ms>"
+
+
+def percentile(sorted_values: list, percent: float) -> float:
+    """ Nearest-rank percentile
+    """
+    return sorted_values[max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)]
+
+
+def stratified_sample(db: dict,
+                      sample_keyword_count: int,
+                      *,
+                      strata_count: int = DEFAULT_STRATA_COUNT,
+                      required_keywords: typing.Iterable[bytes] = (),
+                      rng: random.Random = None) -> dict:
+    """ Sample the keywords of db, stratified by the lengths of their lists
+    :param required_keywords: The keywords always in the sample (e.g. the queried ones), if they are in db,
+    they are counted in sample_keyword_count
+    """
+    rng = random if rng is None else rng
+    if sample_keyword_count >= len(db):
+        return dict(db)
+
+    sample_keywords = list(dict.fromkeys(keyword for keyword in required_keywords if keyword in db))
+    sample_keywords = sample_keywords[:sample_keyword_count]
+    chosen = set(sample_keywords)
+    remaining_keywords = sorted((keyword for keyword in db if keyword not in chosen), key=lambda kw: len(db[kw]))
+    remaining_count = sample_keyword_count - len(sample_keywords)
+
+    # equal-frequency strata of the remaining keywords, each sampled in proportion
+    strata_count = max(1, min(strata_count, len(remaining_keywords)))
+    for i in range(strata_count):
+        stratum = remaining_keywords[len(remaining_keywords) * i // strata_count:
+                                     len(remaining_keywords) * (i + 1) // strata_count]
+        quota = remaining_count * (i + 1) // strata_count - remaining_count * i // strata_count
+        sample_keywords.extend(rng.sample(stratum, min(quota, len(stratum))))
+    return {keyword: db[keyword] for keyword in sample_keywords}
+
+
+def prepare_config(scheme_name: str, db: dict, stats: DatabaseStatistics = None) -> dict:
+    """ The config of a scheme for db: the tuned one if the scheme has tunable parameters,
+    otherwise, the default one with the parameters determined by the database
+    """
+    stats = DatabaseStatistics.from_database(db) if stats is None else stats
+    if scheme_name in TUNABLE_SCHEMES:
+        config_dict, _ = tune_config(scheme_name, stats)
+        return config_dict
+    return default_config_for_database(scheme_name, db, stats)
+
+
+def default_config_for_database(scheme_name: str, db: dict, stats: DatabaseStatistics = None) -> dict:
+    """ The default config of a scheme, with the parameters determined by the database (e.g. the identifier size)
+    """
+    stats = DatabaseStatistics.from_database(db) if stats is None else stats
+    config_dict = schemes.load_sse_module(scheme_name).SSEConfig.get_default_config()
+    if "param_identifier_size" in config_dict:
+        config_dict["param_identifier_size"] = stats.identifier_size
+    if "param_l" in config_dict and scheme_name.startswith("CGKO06"):  # the maximum keyword size
+        config_dict["param_l"] = max(config_dict["param_l"], stats.keyword_size)
+    if scheme_name == "CGKO06.SSE2":
+        schemes.CGKO06.SSE2.config.scan_database_and_update_config_dict(config_dict, db)
+    return config_dict
+
+
+def benchmark_scheme(scheme_name: str,
+                     sample_db: dict,
+                     queries: typing.List[bytes],
+                     *,
+                     config_dict: dict = None,
+                     full_total_size: int = None) -> SchemeReport:
+    """ Encrypt the sample and search the queries (keywords in the sample) with a scheme
+    :param full_total_size: (Optional) The total size of the whole database to extrapolate to
+    """
+    try:
+        config_dict = prepare_config(scheme_name, sample_db) if config_dict is None else config_dict
+        scheme = schemes.load_sse_module(scheme_name).SSEScheme(config_dict)
+        key = scheme.KeyGen()
+
+        begin = time.perf_counter()
+        edb = scheme.EDBSetup(key, sample_db)
+        setup_seconds = time.perf_counter() - begin
+        edb_bytes = len(edb.serialize())
+
+        begin = time.perf_counter()
+        tokens = {keyword: scheme.TokenGen(key, keyword) for keyword in dict.fromkeys(queries)}
+        token_gen_seconds = (time.perf_counter() - begin) / max(len(tokens), 1)
+        latency_list = []
+        for keyword in queries:
+            begin = time.perf_counter()
+            scheme.Search(edb, tokens[keyword])
+            latency_list.append(time.perf_counter() - begin)
+    except Exception as e:
+        return SchemeReport(scheme_name, config_dict, error=f"{type(e).__name__}: {e}")
+
+    report = SchemeReport(scheme_name, config_dict)
+    sample_total_size = get_total_size(sample_db)
+    report.edb_bytes = edb_bytes
+    report.edb_bytes_per_posting = edb_bytes / sample_total_size
+    report.setup_seconds = setup_seconds
+    report.setup_postings_per_second = sample_total_size / setup_seconds if setup_seconds > 0 else math.inf
+    report.token_bytes = sum(len(token.serialize()) for token in tokens.values()) / max(len(tokens), 1)
+    report.token_gen_seconds = token_gen_seconds
+    latency_list.sort()
+    report.p50_search_seconds = percentile(latency_list, 50) if latency_list else 0.0
+    report.p99_search_seconds = percentile(latency_list, 99) if latency_list else 0.0
+
+    full_total_size = sample_total_size if full_total_size is None else full_total_size
+    report.full_edb_bytes = int(report.edb_bytes_per_posting * full_total_size)
+    report.full_setup_seconds = setup_seconds * full_total_size / sample_total_size
+    return report
+
+
+def advise(db: dict,
+           query_log: typing.Optional[typing.Iterable[bytes]] = None,
+           *,
+           scheme_names: typing.Iterable[str] = ALL_SCHEMES,
+           sample_keyword_count: int = DEFAULT_SAMPLE_KEYWORD_COUNT,
+           strata_count: int = DEFAULT_STRATA_COUNT,
+           rng: random.Random = None) -> typing.List[SchemeReport]:
+    """ Benchmark the schemes on a stratified sample of db
+    :param query_log: (Optional) The queried keywords, with repetitions.
+    The most frequent ones are put in the sample, and the queries of the sampled keywords are replayed.
+    If None, each sampled keyword is queried once.
+    """
+    if query_log is not None:
+        query_log = list(query_log)
+        query_frequency = collections.Counter(query_log)
+        required_keywords = [keyword for keyword, _ in query_frequency.most_common(sample_keyword_count // 2)]
+    else:
+        required_keywords = []
+
+    sample_db = stratified_sample(db, sample_keyword_count, strata_count=strata_count,
+                                  required_keywords=required_keywords, rng=rng)
+    if query_log is not None:
+        queries = [keyword for keyword in query_log if keyword in sample_db]
+    else:
+        queries = list(sample_db)
+
+    full_total_size = get_total_size(db)
+    return [benchmark_scheme(scheme_name, sample_db, queries, full_total_size=full_total_size)
+            for scheme_name in scheme_names]
+
+
+def recommend(reports: typing.Iterable[SchemeReport], metric: str = "p99_search_seconds") -> SchemeReport:
+    """ The best scheme by the metric among the succeeded ones
+    """
+    if metric not in RECOMMEND_METRICS:
+        raise ValueError(f"Unsupported metric {metric}, it should be one of {', '.join(RECOMMEND_METRICS)}.")
+    succeeded_reports = [report for report in reports if report.ok]
+    if not succeeded_reports:
+        raise ValueError("No scheme succeeded.")
+    if RECOMMEND_METRICS[metric]:
+        return max(succeeded_reports, key=lambda report: getattr(report, metric))
+    return min(succeeded_reports, key=lambda report: getattr(report, metric))
@@ -0,0 +1,326 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: benchmark.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: End-to-end benchmark suite of the schemes, with scaling curves and regression comparison
+
+Every scheme is run on synthetic databases of each total size (the number of postings)
+and each list length distribution, measuring:
+- the EDBSetup time, and the size of the serialized encrypted database
+- the mean TokenGen time, and the distribution of the Search latencies
+- the peak resident set size of the process running the case
+
+Each case runs in a forked process (if available), so that its peak RSS is not polluted by the other cases.
+The results are saved as json, and two runs (e.g. before and after an upgrade) can be compared to flag regressions.
+"""
+import json
+import math
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+import typing
+
+import schemes
+from analysis.advisor import ALL_SCHEMES, percentile, default_config_for_database
+
+__all__ = [
+    "DISTRIBUTIONS",
+    "COMPARED_METRICS",
+    "RESULT_FORMAT_VERSION",
+    "Regression",
+    "generate_database",
+    "benchmark_case",
+    "run_benchmark",
+    "save_results",
+    "load_results",
+    "scaling_exponents",
+    "compare_results",
+]
+
+DISTRIBUTIONS = ("uniform", "zipf")
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_MEAN_LIST_LENGTH = 10
+DEFAULT_QUERY_COUNT = 100
+DEFAULT_TOLERANCE = 0.2
+
+# the metrics compared between two runs, all of them are the smaller the better
+COMPARED_METRICS = (
+    "setup_seconds",
+    "edb_bytes",
+    "token_gen_seconds",
+    "p50_search_seconds",
+    "p99_search_seconds",
+    "peak_rss_bytes",
+)
+
+RESULT_FORMAT_VERSION = 1
+
+
+def _list_lengths(total_size: int, keyword_count: int, distribution: str, rng: random.Random) -> typing.List[int]:
+    """ The lengths of keyword_count lists summing to total_size, each of them is at least 1
+    """
+    if distribution == "uniform":
+        weights = [rng.random() + 0.5 for _ in range(keyword_count)]
+    elif distribution == "zipf":  # the list length of the i-th keyword is proportional to 1 / i
+        weights = [1 / rank for rank in range(1, keyword_count + 1)]
+    else:
+        raise ValueError(f"Unsupported distribution {distribution}, it should be one of {', '.join(DISTRIBUTIONS)}.")
+
+    # one posting for each keyword, then the rest in proportion to the weights
+    rest_size = total_size - keyword_count
+    weight_sum = sum(weights)
+    lengths = [1 + int(rest_size * weight / weight_sum) for weight in weights]
+    for i in range(total_size - sum(lengths)):  # the rounding remainder, to the heaviest ones
+        lengths[i % keyword_count] += 1
+    return lengths
+
+
+def generate_database(total_size: int,
+                      distribution: str = "uniform",
+                      *,
+                      mean_list_length: int = DEFAULT_MEAN_LIST_LENGTH,
+                      keyword_size: int = 16,
+                      identifier_size: int = 8,
+                      rng: random.Random = None) -> dict:
+    """ Generate a database of total_size postings.
+    The identifiers are drawn from total_size // mean_list_length documents (so that a document has
+    mean_list_length keywords on average), and the identifiers of a list are distinct.
+    :param distribution: The distribution of the list lengths, uniform (each list length is about the mean),
+    or zipf (the list length of the i-th keyword is proportional to 1 / i)
+    """
+    rng = random.Random() if rng is None else rng
+    if total_size <= 0 or mean_list_length <= 0:
+        raise ValueError("The total size and the mean list length must be positive.")
+    keyword_count = max(total_size // mean_list_length, 1)
+    lengths = _list_lengths(total_size, keyword_count, distribution, rng)
+    document_count = max(keyword_count, max(lengths))  # the identifiers of a list are distinct
+
+    db = {}
+    while len(db) < keyword_count:
+        db.setdefault(rng.randbytes(keyword_size), None)
+    for keyword, length in zip(db, lengths):
+        db[keyword] = [document.to_bytes(identifier_size, "big")
+                       for document in rng.sample(range(document_count), length)]
+    return db
+
+
+def _peak_rss_bytes() -> int:
+    # ru_maxrss is in kilobytes on Linux, and in bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def benchmark_case(scheme_name: str,
+                   db: dict,
+                   queries: typing.List[bytes],
+                   *,
+                   config_dict: dict = None) -> dict:
+    """ Benchmark a scheme on db, searching the queries (keywords in db)
+    :return: The record of the case. If the scheme fails, the error is recorded and the measurements are None.
+    """
+    record = {
+        "scheme": scheme_name,
+        "total_size": sum(len(id_list) for id_list in db.values()),
+        "keyword_count": len(db),
+        "query_count": len(queries),
+        "error": None,
+    }
+    try:
+        config_dict = default_config_for_database(scheme_name, db) if config_dict is None else config_dict
+        scheme = schemes.load_sse_module(scheme_name).SSEScheme(config_dict)
+        key = scheme.KeyGen()
+
+        begin = time.perf_counter()
+        edb = scheme.EDBSetup(key, db)
+        record["setup_seconds"] = time.perf_counter() - begin
+        record["edb_bytes"] = len(edb.serialize())
+
+        begin = time.perf_counter()
+        tokens = [scheme.TokenGen(key, keyword) for keyword in queries]
+        record["token_gen_seconds"] = (time.perf_counter() - begin) / max(len(queries), 1)
+
+        latency_list = []
+        for token in tokens:
+            begin = time.perf_counter()
+            scheme.Search(edb, token)
+            latency_list.append(time.perf_counter() - begin)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    latency_list.sort()
+    record["mean_search_seconds"] = sum(latency_list) / len(latency_list) if latency_list else 0.0
+    for percent in (50, 90, 99):
+        record[f"p{percent}_search_seconds"] = percentile(latency_list, percent) if latency_list else 0.0
+    record["max_search_seconds"] = latency_list[-1] if latency_list else 0.0
+    record["peak_rss_bytes"] = _peak_rss_bytes()
+    return record
+
+
+_isolated_case = None  # (scheme_name, db, queries), inherited by the forked process
+
+
+def _benchmark_isolated_case(_):
+    scheme_name, db, queries = _isolated_case
+    return benchmark_case(scheme_name, db, queries)
+
+
+def _run_isolated(scheme_name: str, db: dict, queries: typing.List[bytes]) -> dict:
+    """ Run a case in a fresh forked process, the database is inherited without pickling
+    """
+    global _isolated_case
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return benchmark_case(scheme_name, db, queries)
+    _isolated_case = scheme_name, db, queries
+    try:
+        with multiprocessing.get_context("fork").Pool(1, maxtasksperchild=1) as pool:
+            return pool.apply(_benchmark_isolated_case, (None,))
+    finally:
+        _isolated_case = None
+
+
+def run_benchmark(scheme_names: typing.Iterable[str] = ALL_SCHEMES,
+                  sizes: typing.Iterable[int] = DEFAULT_SIZES,
+                  distributions: typing.Iterable[str] = DISTRIBUTIONS,
+                  *,
+                  query_count: int = DEFAULT_QUERY_COUNT,
+                  mean_list_length: int = DEFAULT_MEAN_LIST_LENGTH,
+                  isolate: bool = True,
+                  seed: int = 0,
+                  progress_callback: typing.Optional[typing.Callable[[dict], None]] = None) -> dict:
+    """ Run every scheme on the databases of each size and distribution.
+    The databases and the queries are determined by the seed, so that two runs are comparable.
+    :param query_count: The number of queries of each case, the queried keywords are chosen uniformly
+    :param isolate: Whether to run each case in a fresh process, for the peak RSS of the case
+    :param progress_callback: If not None, it is called with each finished record
+    :return: The results, with the metadata of the environment and the records of the cases
+    """
+    scheme_names = list(scheme_names)
+    records = []
+    for distribution in distributions:
+        for total_size in sizes:
+            rng = random.Random(f"{seed}-{distribution}-{total_size}")
+            db = generate_database(total_size, distribution, mean_list_length=mean_list_length, rng=rng)
+            keywords = list(db)
+            queries = [rng.choice(keywords) for _ in range(query_count)]
+            for scheme_name in scheme_names:
+                if isolate:
+                    record = _run_isolated(scheme_name, db, queries)
+                else:
+                    record = benchmark_case(scheme_name, db, queries)
+                record["distribution"] = distribution
+                records.append(record)
+                if progress_callback is not None:
+                    progress_callback(record)
+
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "metadata": {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "query_count": query_count,
+            "mean_list_length": mean_list_length,
+            "isolate": isolate,
+        },
+        "records": records,
+    }
+
+
+def save_results(results: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r") as f:
+        results = json.load(f)
+    if results.get("format_version") != RESULT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark result format {results.get('format_version')}.")
+    return results
+
+
+def _case_key(record: dict) -> tuple:
+    return record["scheme"], record["distribution"], record["total_size"]
+
+
+def scaling_exponents(results: dict, metric: str) -> typing.Dict[typing.Tuple[str, str], float]:
+    """ The scaling exponent of a metric of each (scheme, distribution), i.e. the slope of the least squares fit
+    of log(metric) against log(total size), e.g. 1 for a linear growth, 0 for a constant.
+    The ones with less than two sizes are omitted.
+    """
+    curves = {}
+    for record in results["records"]:
+        if record["error"] is None and record.get(metric, 0) > 0:
+            curves.setdefault((record["scheme"], record["distribution"]), []).append(
+                (math.log(record["total_size"]), math.log(record[metric])))
+
+    exponents = {}
+    for curve_key, points in curves.items():
+        if len({x for x, _ in points}) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        exponents[curve_key] = sum((x - mean_x) * (y - mean_y) for x, y in points) / \
+                               sum((x - mean_x) ** 2 for x, _ in points)
+    return exponents
+
+
+class Regression(typing.NamedTuple):
+    scheme: str
+    distribution: str
+    total_size: int
+    metric: str
+    baseline: typing.Optional[float]
+    current: typing.Optional[float]
+
+    @property
+    def ratio(self) -> float:
+        if self.baseline is None or self.current is None:
+            return math.nan
+        return self.current / self.baseline if self.baseline > 0 else math.inf
+
+    def __str__(self):
+        if self.current is None:
+            change = "failed"
+        else:
+            change = f"{self.baseline:.6g} -> {self.current:.6g} ({self.ratio:.2f}x)"
+        return f"{self.scheme} {self.distribution} N={self.total_size} {self.metric}: {change}"
+
+
+def compare_results(baseline: dict,
+                    current: dict,
+                    *,
+                    tolerance: float = DEFAULT_TOLERANCE,
+                    metrics: typing.Iterable[str] = COMPARED_METRICS) -> typing.List[Regression]:
+    """ Flag the metrics of the cases in both runs that are worse than the baseline by more than the tolerance
+    (e.g. 0.2 for 20%), and the cases failed in the current run but succeeded in the baseline.
+    """
+    if tolerance < 0:
+        raise ValueError("The tolerance must be non-negative.")
+    metrics = list(metrics)
+    baseline_records = {_case_key(record): record for record in baseline["records"]}
+    regressions = []
+    for record in current["records"]:
+        baseline_record = baseline_records.get(_case_key(record))
+        if baseline_record is None or baseline_record["error"] is not None:
+            continue
+        if record["error"] is not None:
+            regressions.append(Regression(*_case_key(record), "error", None, None))
+            continue
+        for metric in metrics:
+            if record[metric] > baseline_record[metric] * (1 + tolerance):
+                regressions.append(Regression(*_case_key(record), metric, baseline_record[metric], record[metric]))
+    return regressions
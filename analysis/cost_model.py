@@ -0,0 +1,441 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: cost_model.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Cost model of the searches of the schemes, and a tuner choosing their parameters for a database
+
+The model predicts, from the statistics of a database (see DatabaseStatistics),
+the expected numbers of PRF calls, hash calls, dictionary/array lookups, decryptions and decrypted bytes
+of a search for a uniformly chosen keyword, and the number of bytes of the encrypted database.
+The numbers of operations are converted into seconds by the unit costs of a CostModel,
+which can be calibrated on the current machine.
+
+The tuner enumerates the candidate parameters of a scheme, keeps the candidates whose encrypted database
+is at most max_space_ratio times as large as the smallest one, and chooses the one of the fastest search.
+"""
+import math
+import os
+import random
+import time
+import typing
+
+import schemes
+import toolkit.hash
+import toolkit.prf
+import toolkit.symmetric_encryption
+from toolkit.data_structures.label_table import DEFAULT_MAX_LOAD_FACTOR
+from toolkit.database_utils import get_total_size, get_distinct_keyword_count, get_list_length_histogram
+
+__all__ = [
+    "DatabaseStatistics",
+    "CostPrediction",
+    "CostModel",
+    "TUNABLE_SCHEMES",
+    "predict_cost",
+    "tune_config",
+    "check_prediction",
+]
+
+DEFAULT_MAX_SPACE_RATIO = 1.5
+
+# Unit costs (seconds) measured with HmacPRF, SHA1 and AES-CBC on one core, used if the model is not calibrated
+DEFAULT_UNIT_COSTS = {
+    "prf_call": 1.5e-5,
+    "hash_call": 1.4e-6,
+    "lookup": 6e-8,
+    "ske_call": 3e-5,
+    "ske_byte": 1.2e-10,
+}
+
+
+class DatabaseStatistics:
+    """ The statistics of a database used by the cost model
+    """
+    __slots__ = ["total_size", "keyword_count", "keyword_size", "identifier_size", "length_histogram"]
+
+    def __init__(self,
+                 total_size: int,
+                 keyword_count: int,
+                 keyword_size: int,
+                 identifier_size: int,
+                 length_histogram: typing.Dict[int, int]):
+        self.total_size = total_size
+        self.keyword_count = keyword_count
+        self.keyword_size = keyword_size  # the maximum size of the keywords
+        self.identifier_size = identifier_size  # the maximum size of the identifiers
+        self.length_histogram = length_histogram  # |DB(w)| -> the number of keywords w
+
+    @classmethod
+    def from_database(cls, db: dict) -> 'DatabaseStatistics':
+        if not db:
+            raise ValueError("The database is empty.")
+        return cls(get_total_size(db),
+                   get_distinct_keyword_count(db),
+                   max(len(keyword) for keyword in db),
+                   max((len(identifier) for identifier_list in db.values() for identifier in identifier_list),
+                       default=0),
+                   get_list_length_histogram(db))
+
+    def __repr__(self):
+        return f"<DatabaseStatistics N: {self.total_size}, keyword count: {self.keyword_count}>"
+
+
+class CostPrediction:
+    """ The expected numbers of operations of a search for a uniformly chosen keyword,
+    and the number of bytes of the encrypted database
+    """
+    __slots__ = ["prf_calls", "hash_calls", "lookups", "ske_calls", "ske_bytes", "edb_bytes"]
+
+    def __init__(self, prf_calls=0.0, hash_calls=0.0, lookups=0.0, ske_calls=0.0, ske_bytes=0.0, edb_bytes=0):
+        self.prf_calls = prf_calls
+        self.hash_calls = hash_calls
+        self.lookups = lookups
+        self.ske_calls = ske_calls
+        self.ske_bytes = ske_bytes
+        self.edb_bytes = edb_bytes
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return f"<CostPrediction {self.to_dict()}>"
+
+
+class CostModel:
+    """ The unit costs (seconds) of the operations of a search
+    """
+    __slots__ = list(DEFAULT_UNIT_COSTS)
+
+    def __init__(self, **unit_costs):
+        unknown_costs = set(unit_costs) - set(DEFAULT_UNIT_COSTS)
+        if unknown_costs:
+            raise ValueError(f"Unknown unit costs: {', '.join(sorted(unknown_costs))}")
+        for field, default_cost in DEFAULT_UNIT_COSTS.items():
+            setattr(self, field, unit_costs.get(field, default_cost))
+
+    def search_seconds(self, prediction: CostPrediction) -> float:
+        return (prediction.prf_calls * self.prf_call +
+                prediction.hash_calls * self.hash_call +
+                prediction.lookups * self.lookup +
+                prediction.ske_calls * self.ske_call +
+                prediction.ske_bytes * self.ske_byte)
+
+    @classmethod
+    def calibrate(cls,
+                  prf_name: str = "HmacPRF",
+                  hash_name: str = "SHA1",
+                  ske_name: str = "AES-CBC",
+                  key_length: int = 32,
+                  repeat: int = 1000) -> 'CostModel':
+        """ Measure the unit costs with the given primitives on the current machine
+        """
+
+        def _measure(func) -> float:
+            begin = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            return (time.perf_counter() - begin) / repeat
+
+        key = os.urandom(key_length)
+        prf = toolkit.prf.get_prf_implementation(prf_name)(key_length=key_length, output_length=key_length)
+        hash_h = toolkit.hash.get_hash_implementation(hash_name)()
+        ske = toolkit.symmetric_encryption.get_symmetric_encryption_implementation(ske_name)(key_length=key_length)
+        table = {os.urandom(key_length): b"" for _ in range(repeat)}
+        label = os.urandom(key_length)
+
+        small_cipher = ske.Encrypt(key, b"\x00")
+        large_cipher = ske.Encrypt(key, b"\x00" * 4096)
+        small_seconds = _measure(lambda: ske.Decrypt(key, small_cipher))
+        large_seconds = _measure(lambda: ske.Decrypt(key, large_cipher))
+        ske_byte = max(large_seconds - small_seconds, 0.0) / (len(large_cipher) - len(small_cipher))
+
+        return cls(prf_call=_measure(lambda: prf(key, label)),
+                   hash_call=_measure(lambda: hash_h(label)),
+                   lookup=_measure(lambda: table.get(label)),
+                   ske_call=max(small_seconds - ske_byte * len(small_cipher), 0.0),
+                   ske_byte=ske_byte)
+
+    def __repr__(self):
+        return f"<CostModel {', '.join(f'{field}: {getattr(self, field):.3g}s' for field in self.__slots__)}>"
+
+
+def _cipher_len(ske, key_length: int, plaintext_len: int) -> int:
+    return len(ske.Encrypt(b"\x00" * key_length, b"\x00" * plaintext_len))
+
+
+def _label_table_bytes(entry_count: int, label_len: int, value_len: int) -> int:
+    """ The size of a LabelTable of entry_count entries, whose slots are one occupancy byte, a label and a value
+    """
+    capacity = int(entry_count / DEFAULT_MAX_LOAD_FACTOR) + 1
+    return capacity * (1 + label_len + value_len)
+
+
+def _average(stats: DatabaseStatistics,
+             per_keyword_cost: typing.Callable[[int], typing.Optional[tuple]]) -> typing.Optional[list]:
+    """ The averages of the per-keyword costs over the keywords, except the last cost (i.e. the storage) is summed.
+    Returns None if the cost of any keyword is None, i.e. the list cannot be encrypted.
+    """
+    total = None
+    for list_len, keyword_count in stats.length_histogram.items():
+        costs = per_keyword_cost(list_len)
+        if costs is None:
+            return None
+        if total is None:
+            total = [0.0] * len(costs)
+        for index, cost in enumerate(costs):
+            total[index] += cost * keyword_count
+    return [cost / stats.keyword_count for cost in total[:-1]] + [total[-1]]
+
+
+def _predict_pi_pack(config, stats: DatabaseStatistics) -> typing.Optional[CostPrediction]:
+    block_cipher_len = _cipher_len(config.ske, config.param_lambda,
+                                   config.param_B * config.param_identifier_size)
+    label_len = config.prf_f_output_length
+
+    def _per_keyword(list_len: int):
+        block_count = math.ceil(list_len / config.param_B)
+        # the walk stops at the first missing counter
+        return block_count + 1, block_count + 1, block_count, block_count * block_cipher_len, block_count
+
+    prf_calls, lookups, ske_calls, ske_bytes, entry_count = _average(stats, _per_keyword)
+    return CostPrediction(prf_calls=prf_calls, lookups=lookups, ske_calls=ske_calls, ske_bytes=ske_bytes,
+                          edb_bytes=_label_table_bytes(int(entry_count), label_len, block_cipher_len))
+
+
+def _predict_pi_2lev(config, stats: DatabaseStatistics) -> typing.Optional[CostPrediction]:
+    b, B, b_prime, B_prime = config.param_b, config.param_B, config.param_b_prime, config.param_B_prime
+    dict_cipher_len = _cipher_len(config.ske, config.param_lambda, b * config.param_identifier_size + 1)
+    array_cipher_len = _cipher_len(config.ske, config.param_lambda, B * config.param_identifier_size + 1)
+    label_len = config.prf_f_output_length
+
+    A_len = 1
+    for list_len, keyword_count in stats.length_histogram.items():
+        if list_len > b:
+            A_len += math.ceil(list_len / B) * keyword_count
+        if list_len > b_prime * B:
+            A_len += math.ceil(list_len / (B * B_prime)) * keyword_count
+    if A_len > 2 ** (config.param_index_size_of_A * 8):
+        return None
+
+    def _per_keyword(list_len: int):
+        if list_len <= b:  # small
+            array_read_count = 0
+        elif list_len <= B * b_prime:  # medium
+            array_read_count = math.ceil(list_len / B)
+        elif list_len < B * B_prime * b_prime:  # large, with a level of pointer blocks
+            array_read_count = math.ceil(list_len / B) + math.ceil(list_len / (B * B_prime))
+        else:  # too large
+            return None
+        return 1 + array_read_count, 1 + array_read_count, \
+            dict_cipher_len + array_read_count * array_cipher_len, \
+            array_read_count * array_cipher_len
+
+    averages = _average(stats, _per_keyword)
+    if averages is None:
+        return None
+    lookups, ske_calls, ske_bytes, array_bytes = averages
+    # one entry of D for each keyword
+    table_bytes = _label_table_bytes(stats.keyword_count, label_len, dict_cipher_len)
+    return CostPrediction(prf_calls=1, lookups=lookups, ske_calls=ske_calls, ske_bytes=ske_bytes,
+                          edb_bytes=int(array_bytes) + table_bytes)
+
+
+def _dp17_levels(config, total_size: int) -> typing.Optional[typing.List[int]]:
+    """ The stored levels, the same as [DP17] Pi._Enc
+    """
+    l = math.ceil(math.log2(total_size))
+    s = math.ceil(l * config.param_actual_storage_level_ratio)
+    if s <= 0:
+        return None
+    p = math.ceil(l / s)
+    levels = [l - i * p for i in range(0, s)]
+    if config.param_L > 1:
+        levels.append(0)
+    levels.reverse()
+    return levels
+
+
+def _predict_dp17(config, stats: DatabaseStatistics) -> typing.Optional[CostPrediction]:
+    N = stats.total_size
+    levels = _dp17_levels(config, N)
+    if levels is None:
+        return None
+    entry_cipher_len = config.param_identifier_cipher_len
+    L = config.param_L
+
+    def _per_keyword(list_len: int):
+        level = next((i for i in levels if L * 2 ** i >= list_len), None)
+        if level is None:
+            return None
+        # each chunk of size 2^i is in a bucket of 2^(i+1) entries, all decrypted at once
+        chunk_count = math.ceil(list_len / 2 ** level)
+        return chunk_count * 2 ** (level + 1) * entry_cipher_len, 0
+
+    averages = _average(stats, _per_keyword)
+    if averages is None:
+        return None
+    ske_bytes, _ = averages
+    array_bytes = sum((2 * N + 2 ** (i + 1)) * entry_cipher_len for i in levels)
+    table_bytes = N * 2 * config.param_hash_h_digest_size
+    return CostPrediction(hash_calls=2 * L, lookups=L, ske_calls=1, ske_bytes=ske_bytes,
+                          edb_bytes=array_bytes + table_bytes)
+
+
+def _predict_sse1(config, stats: DatabaseStatistics) -> typing.Optional[CostPrediction]:
+    # the addresses are ψ(K1, ctr) < 2^log2(s), and ctr ranges over 1, ..., N
+    if config.param_s != 2 ** config.param_log2_s or stats.total_size >= config.param_s or \
+            stats.keyword_count > config.param_dictionary_size:
+        return None
+    node_cipher_len = _cipher_len(config.ske1, config.param_k, config.param_node_size)
+    average_list_len = stats.total_size / stats.keyword_count
+    table_bytes = config.param_dictionary_size * (config.param_l + config.prf_f.output_length)
+    # the nodes of a list are linked, so each node is looked up and decrypted in turn
+    return CostPrediction(lookups=1 + average_list_len, ske_calls=average_list_len,
+                          ske_bytes=average_list_len * node_cipher_len,
+                          edb_bytes=config.param_s * node_cipher_len + table_bytes)
+
+
+def _powers_of_two(low: int, high: int) -> typing.List[int]:
+    return [2 ** e for e in range(low.bit_length() - 1, high.bit_length())]
+
+
+def _candidates_pi_pack(stats: DatabaseStatistics, base_config: dict) -> typing.Iterator[dict]:
+    for B in _powers_of_two(1, 4096):
+        yield {"param_B": B}
+
+
+def _candidates_pi_2lev(stats: DatabaseStatistics, base_config: dict) -> typing.Iterator[dict]:
+    identifier_size = base_config["param_identifier_size"]
+    for B in _powers_of_two(1, 4096):
+        for b in _powers_of_two(1, 4096):
+            # the size of an index of A is (B * identifier_size) // B' = (b * identifier_size) // b'
+            for index_size in range(1, 9):
+                B_prime, b_prime = (B * identifier_size) // index_size, (b * identifier_size) // index_size
+                if B_prime < 1 or b_prime < 1:
+                    continue
+                yield {"param_B": B, "param_b": b, "param_B_prime": B_prime, "param_b_prime": b_prime}
+
+
+def _candidates_dp17(stats: DatabaseStatistics, base_config: dict) -> typing.Iterator[dict]:
+    for L in (1, 2, 4, 8, 16):
+        for ratio_percent in range(10, 101, 10):
+            yield {"param_L": L, "param_actual_storage_level_ratio": ratio_percent / 100}
+
+
+def _candidates_sse1(stats: DatabaseStatistics, base_config: dict) -> typing.Iterator[dict]:
+    # the counters 1, ..., N must be represented in log2(s) bits, and s must be a power of two
+    yield {"param_s": 2 ** stats.total_size.bit_length(),
+           "param_dictionary_size": max(stats.keyword_count, 1),
+           "param_l": max(base_config["param_l"], stats.keyword_size)}
+
+
+# scheme name -> (candidate parameters, predictor)
+_SCHEME_TUNERS = {
+    "CJJ14.PiPack": (_candidates_pi_pack, _predict_pi_pack),
+    "CJJ14.Pi2Lev": (_candidates_pi_2lev, _predict_pi_2lev),
+    "DP17.Pi": (_candidates_dp17, _predict_dp17),
+    "CGKO06.SSE1": (_candidates_sse1, _predict_sse1),
+}
+
+TUNABLE_SCHEMES = tuple(_SCHEME_TUNERS)
+
+
+def _get_scheme_tuner(scheme_name: str):
+    if scheme_name not in _SCHEME_TUNERS:
+        raise ValueError(f"Scheme {scheme_name} has no tunable parameter, "
+                         f"the tunable schemes are {', '.join(TUNABLE_SCHEMES)}.")
+    return _SCHEME_TUNERS[scheme_name]
+
+
+def predict_cost(config_dict: dict, stats: DatabaseStatistics) -> typing.Optional[CostPrediction]:
+    """ Predict the costs of the scheme given by config_dict["scheme"] on a database of the statistics,
+    returns None if the parameters cannot encrypt the database
+    """
+    _, predict = _get_scheme_tuner(config_dict.get("scheme"))
+    config = schemes.load_sse_module(config_dict["scheme"]).SSEConfig(config_dict)
+    return predict(config, stats)
+
+
+def tune_config(scheme_name: str,
+                stats: DatabaseStatistics,
+                *,
+                base_config: dict = None,
+                cost_model: CostModel = None,
+                max_space_ratio: float = DEFAULT_MAX_SPACE_RATIO) -> typing.Tuple[dict, CostPrediction]:
+    """ Choose the parameters of a scheme for a database of the statistics
+    :param base_config: (Optional) The config whose parameters are not tuned, the default config if None
+    :param cost_model: (Optional) The unit costs, the default ones if None
+    :param max_space_ratio: The candidates whose encrypted database is larger than max_space_ratio times
+    the smallest one are not chosen
+    :return: The tuned config, and its prediction
+    """
+    candidates, predict = _get_scheme_tuner(scheme_name)
+    if max_space_ratio < 1:
+        raise ValueError("The maximum space ratio must be at least 1.")
+    if base_config is None:
+        base_config = schemes.load_sse_module(scheme_name).SSEConfig.get_default_config()
+    cost_model = CostModel() if cost_model is None else cost_model
+
+    base_config = dict(base_config)
+    if "param_identifier_size" in base_config:
+        base_config["param_identifier_size"] = stats.identifier_size
+
+    sse_config_class = schemes.load_sse_module(scheme_name).SSEConfig
+    feasible_list = []
+    for params in candidates(stats, base_config):
+        config_dict = dict(base_config, **params)
+        try:
+            prediction = predict(sse_config_class(config_dict), stats)
+        except ValueError:  # rejected by the config of the scheme
+            continue
+        if prediction is not None:
+            feasible_list.append((config_dict, prediction))
+
+    if not feasible_list:
+        raise ValueError(f"No parameters of {scheme_name} can encrypt the database.")
+
+    space_bound = max_space_ratio * min(prediction.edb_bytes for _, prediction in feasible_list)
+    return min(((config_dict, prediction) for config_dict, prediction in feasible_list
+                if prediction.edb_bytes <= space_bound),
+               key=lambda pair: (cost_model.search_seconds(pair[1]), pair[1].edb_bytes))
+
+
+def check_prediction(config_dict: dict,
+                     db: dict,
+                     *,
+                     sample_keyword_count: int = 100,
+                     cost_model: CostModel = None,
+                     rng: random.Random = None) -> dict:
+    """ Build the encrypted database of a sample of the keywords of db,
+    and compare the measured sizes and search time with the predicted ones on the same sample
+    """
+    rng = random if rng is None else rng
+    cost_model = CostModel() if cost_model is None else cost_model
+    keywords = list(db)
+    sample_db = {keyword: db[keyword] for keyword in rng.sample(keywords, min(sample_keyword_count, len(keywords)))}
+    prediction = predict_cost(config_dict, DatabaseStatistics.from_database(sample_db))
+    if prediction is None:
+        raise ValueError("The parameters cannot encrypt the sample.")
+
+    scheme = schemes.load_sse_module(config_dict["scheme"]).SSEScheme(config_dict)
+    key = scheme.KeyGen()
+    edb = scheme.EDBSetup(key, sample_db)
+    tokens = [scheme.TokenGen(key, keyword) for keyword in sample_db]
+    begin = time.perf_counter()
+    for token in tokens:
+        scheme.Search(edb, token)
+    measured_search_seconds = (time.perf_counter() - begin) / len(tokens)
+
+    return {
+        "sample_keyword_count": len(sample_db),
+        "predicted_edb_bytes": prediction.edb_bytes,
+        "measured_edb_bytes": len(edb.serialize()),
+        "predicted_search_seconds": cost_model.search_seconds(prediction),
+        "measured_search_seconds": measured_search_seconds,
+    }
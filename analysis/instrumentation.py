@@ -0,0 +1,320 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: instrumentation.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Opt-in accounting of the operations of each call of a scheme
+
+The primitives of the config (PRF, PRP, SKE and hash) are replaced by counting proxies,
+and during a search, the containers of the encrypted database (dicts, arrays, tables) are replaced likewise.
+A probe is an access to a container giving a stored item (or a miss),
+the accesses giving a nested container (e.g. a level of [DP17]) are not counted, but the nested one is counted.
+
+The operations in worker processes (e.g. param_worker_count > 1, SearchParallel) are not counted.
+
+Usage:
+    with instrument(scheme) as instrumented:
+        edb = instrumented.EDBSetup(key, db)
+        result = instrumented.Search(edb, token)
+        print(result.cost_report.to_dict())
+"""
+import contextlib
+import time
+import typing
+
+from schemes.interface.inverted_index_sse import InvertedIndexSSE
+from schemes.interface.structures import SSEEncryptedDatabase, SSEResult
+from toolkit.hash import AbstractHash
+from toolkit.prf.abstraction import AbstractPRF
+from toolkit.prp.abstraction import AbstractPRP, AbstractBitwisePRP
+from toolkit.symmetric_encryption.abstraction import AbstractSymmetricEncryption
+
+__all__ = [
+    "OPERATION_COUNT_FIELDS",
+    "CostReport",
+    "InstrumentedScheme",
+    "instrument",
+]
+
+OPERATION_COUNT_FIELDS = (
+    "prf_calls",
+    "prp_calls",
+    "hash_calls",
+    "ske_encrypt_calls",
+    "ske_decrypt_calls",
+    "bytes_encrypted",  # plaintext bytes
+    "bytes_decrypted",  # ciphertext bytes
+    "probes",
+    "result_bytes",
+)
+
+
+class CostReport:
+    """ The operation counts and the elapsed time of a call of a scheme
+    """
+    __slots__ = ["operation", "seconds", "counts"]
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.seconds = 0.0
+        self.counts = dict.fromkeys(OPERATION_COUNT_FIELDS, 0)
+
+    def add(self, field: str, count: int = 1):
+        self.counts[field] += count
+
+    def __getitem__(self, field: str) -> int:
+        return self.counts[field]
+
+    def to_dict(self) -> dict:
+        return {"operation": self.operation, "seconds": self.seconds, **self.counts}
+
+    def __repr__(self):
+        return f"<CostReport {self.operation} {self.counts}>"
+
+
+class _Accountant:
+    """ The report being accumulated by the proxies, None if no call is accounted now
+    """
+    __slots__ = ["current"]
+
+    def __init__(self):
+        self.current = None
+
+    def add(self, field: str, count: int = 1):
+        if self.current is not None:
+            self.current.add(field, count)
+
+
+class _Proxy:
+    __slots__ = ["_wrapped", "_accountant"]
+
+    def __init__(self, wrapped, accountant: _Accountant):
+        self._wrapped = wrapped
+        self._accountant = accountant
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+
+class _CountingPRF(_Proxy):
+    __slots__ = []
+
+    def __call__(self, key: bytes, message: bytes) -> bytes:
+        self._accountant.add("prf_calls")
+        return self._wrapped(key, message)
+
+    def batch(self, key: bytes, messages: typing.Iterable[bytes]) -> typing.List[bytes]:
+        messages = list(messages)
+        self._accountant.add("prf_calls", len(messages))
+        return self._wrapped.batch(key, messages)
+
+
+class _CountingPRP(_Proxy):
+    __slots__ = []
+
+    def __call__(self, key, message):
+        self._accountant.add("prp_calls")
+        return self._wrapped(key, message)
+
+    def batch(self, key, messages):
+        messages = list(messages)
+        self._accountant.add("prp_calls", len(messages))
+        return self._wrapped.batch(key, messages)
+
+
+class _CountingHash(_Proxy):
+    __slots__ = []
+
+    def __call__(self, message: bytes) -> bytes:
+        self._accountant.add("hash_calls")
+        return self._wrapped(message)
+
+
+class _CountingSymmetricEncryption(_Proxy):
+    __slots__ = []
+
+    def Encrypt(self, key: bytes, message: bytes) -> bytes:
+        self._accountant.add("ske_encrypt_calls")
+        self._accountant.add("bytes_encrypted", len(message))
+        return self._wrapped.Encrypt(key, message)
+
+    def Decrypt(self, key: bytes, cipher_text: bytes) -> bytes:
+        self._accountant.add("ske_decrypt_calls")
+        self._accountant.add("bytes_decrypted", len(cipher_text))
+        return self._wrapped.Decrypt(key, cipher_text)
+
+    def DecryptMany(self, key: bytes, cipher_texts: typing.Iterable[bytes]) -> typing.List[bytes]:
+        cipher_texts = list(cipher_texts)
+        self._accountant.add("ske_decrypt_calls", len(cipher_texts))
+        self._accountant.add("bytes_decrypted", sum(map(len, cipher_texts)))
+        return self._wrapped.DecryptMany(key, cipher_texts)
+
+    def DecryptConcatenated(self, key: bytes, cipher_buffer: bytes, cipher_len: int) -> list:
+        self._accountant.add("ske_decrypt_calls", len(cipher_buffer) // cipher_len)
+        self._accountant.add("bytes_decrypted", len(cipher_buffer))
+        return self._wrapped.DecryptConcatenated(key, cipher_buffer, cipher_len)
+
+
+def _is_container(value) -> bool:
+    return not isinstance(value, (bytes, bytearray, memoryview, str)) and hasattr(value, "__getitem__")
+
+
+class _CountingContainer(_Proxy):
+    __slots__ = []
+
+    def _count_or_wrap(self, value):
+        if _is_container(value):
+            return _CountingContainer(value, self._accountant)
+        self._accountant.add("probes")
+        return value
+
+    def __getitem__(self, key):
+        try:
+            value = self._wrapped[key]
+        except (KeyError, IndexError):
+            self._accountant.add("probes")
+            raise
+        if isinstance(key, slice):
+            self._accountant.add("probes", len(value))
+            return value
+        return self._count_or_wrap(value)
+
+    def get(self, key, default=None):
+        value = self._wrapped.get(key, default)
+        return self._count_or_wrap(value)
+
+    def __contains__(self, key) -> bool:
+        self._accountant.add("probes")
+        return key in self._wrapped
+
+    def __len__(self):
+        return len(self._wrapped)
+
+    def __iter__(self):
+        return iter(self._wrapped)
+
+
+_PRIMITIVE_PROXIES = (
+    (AbstractPRF, _CountingPRF),
+    ((AbstractPRP, AbstractBitwisePRP), _CountingPRP),
+    (AbstractHash, _CountingHash),
+    (AbstractSymmetricEncryption, _CountingSymmetricEncryption),
+)
+
+
+def iter_slots(obj) -> typing.Iterator[str]:
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        yield from ([slots] if isinstance(slots, str) else slots)
+
+
+@contextlib.contextmanager
+def _counting_edb(edb: SSEEncryptedDatabase, accountant: _Accountant):
+    """ Replace the containers of edb by counting proxies temporarily
+    """
+    replaced = {}
+    for name in iter_slots(edb):
+        value = getattr(edb, name, None)
+        if _is_container(value):
+            replaced[name] = value
+            setattr(edb, name, _CountingContainer(value, accountant))
+    try:
+        yield
+    finally:
+        for name, value in replaced.items():
+            setattr(edb, name, value)
+
+
+class InstrumentedScheme:
+    """ A scheme whose calls are accounted, the report of each call is appended to reports,
+    and the report of a search is attached to the result as result.cost_report
+    """
+
+    def __init__(self, scheme: InvertedIndexSSE):
+        self.scheme = scheme
+        self.reports = []  # type: typing.List[CostReport]
+        self._accountant = _Accountant()
+        self._replaced_primitives = {}
+
+        config = scheme.config
+        for name in iter_slots(config):
+            primitive = getattr(config, name, None)
+            for primitive_types, proxy_class in _PRIMITIVE_PROXIES:
+                if isinstance(primitive, primitive_types):
+                    self._replaced_primitives[name] = primitive
+                    setattr(config, name, proxy_class(primitive, self._accountant))
+                    break
+
+    def uninstall(self):
+        """ Restore the primitives of the config
+        """
+        for name, primitive in self._replaced_primitives.items():
+            setattr(self.scheme.config, name, primitive)
+        self._replaced_primitives = {}
+
+    @contextlib.contextmanager
+    def _accounting(self, operation: str, edb: SSEEncryptedDatabase = None):
+        report = CostReport(operation)
+        self._accountant.current = report
+        begin = time.perf_counter()
+        try:
+            if edb is None:
+                yield report
+            else:
+                with _counting_edb(edb, self._accountant):
+                    yield report
+        finally:
+            report.seconds = time.perf_counter() - begin
+            self._accountant.current = None
+            self.reports.append(report)
+
+    @staticmethod
+    def _attach(result: SSEResult, report: CostReport):
+        report.add("result_bytes", sum(len(identifier) for identifier in result.get_result_list()))
+        result.cost_report = report
+
+    def KeyGen(self):
+        with self._accounting("KeyGen"):
+            return self.scheme.KeyGen()
+
+    def EDBSetup(self, key, database):
+        with self._accounting("EDBSetup"):
+            return self.scheme.EDBSetup(key, database)
+
+    def TokenGen(self, key, keyword: bytes):
+        with self._accounting("TokenGen"):
+            return self.scheme.TokenGen(key, keyword)
+
+    def TokenGenMany(self, key, keywords: typing.Iterable[bytes]):
+        with self._accounting("TokenGenMany"):
+            return self.scheme.TokenGenMany(key, keywords)
+
+    def Search(self, edb, token):
+        with self._accounting("Search", edb) as report:
+            result = self.scheme.Search(edb, token)
+        self._attach(result, report)
+        return result
+
+    def SearchMany(self, edb, tokens):
+        with self._accounting("SearchMany", edb) as report:
+            result_list = self.scheme.SearchMany(edb, tokens)
+        for result in result_list:
+            report.add("result_bytes", sum(len(identifier) for identifier in result.get_result_list()))
+            result.cost_report = report
+        return result_list
+
+
+@contextlib.contextmanager
+def instrument(scheme: InvertedIndexSSE) -> typing.Iterator[InstrumentedScheme]:
+    """ Account the calls of the scheme in the context, the primitives are restored at exit
+    """
+    instrumented = InstrumentedScheme(scheme)
+    try:
+        yield instrumented
+    finally:
+        instrumented.uninstall()
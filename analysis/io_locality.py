@@ -0,0 +1,310 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: io_locality.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: I/O locality and read efficiency of the searches, on a simulated block device
+
+The components of an encrypted database are placed on a simulated block device, each in its own page-aligned region:
+- A dict (hash table) is laid out as its entries (label || value) in the order of the labels,
+  as an on-disk hash table keyed on uniformly random labels would be. A miss reads the entry where it would be.
+- A level table (e.g. of [CT14]) is laid out as its label buffer followed by its value buffer,
+  and so is a label table (e.g. the dict D of [CJJ14]), whose occupancy bytes are kept in memory.
+- An array is laid out as fixed-size slots of its largest item (page-aligned slots for a PageAlignedBytesArray).
+- A collection of tables (e.g. the levels of [CT14], the bucket arrays of [DP17]) is a directory kept in memory,
+  and each table is placed in its own region.
+
+During a search, the accesses to the components are traced at page granularity, giving for each query:
+- pages touched: the number of distinct pages read
+- contiguous reads: the number of runs of consecutive pages, i.e. the locality of [CT14]
+  (the reads of a query are assumed to be issued together, so they are coalesced regardless of their order)
+- read efficiency: the bytes of the pages read over the bytes of the result, i.e. the read efficiency of [CT14]
+  at page granularity, the smaller the better
+"""
+import bisect
+import contextlib
+import typing
+
+import schemes
+from analysis.advisor import default_config_for_database
+from analysis.instrumentation import iter_slots
+from data_persistence.page_aligned_array import PageAlignedBytesArray
+from schemes.interface.inverted_index_sse import InvertedIndexSSE
+from schemes.interface.structures import SSEEncryptedDatabase
+from toolkit.data_structures.label_table import LabelTable
+from toolkit.data_structures.level_table import LevelTable
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "SimulatedBlockDevice",
+    "IOReport",
+    "IOHarness",
+    "measure_io",
+]
+
+DEFAULT_PAGE_SIZE = 4096
+
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
+class IOReport:
+    """ The accesses of a query to the simulated block device
+    """
+    __slots__ = ["page_size", "pages_touched", "contiguous_reads", "read_calls", "bytes_requested", "result_bytes"]
+
+    def __init__(self, page_size: int, pages: typing.Set[int], read_calls: int, bytes_requested: int):
+        self.page_size = page_size
+        self.pages_touched = len(pages)
+        sorted_pages = sorted(pages)
+        self.contiguous_reads = sum(1 for i, page in enumerate(sorted_pages)
+                                    if i == 0 or sorted_pages[i - 1] != page - 1)
+        self.read_calls = read_calls
+        self.bytes_requested = bytes_requested
+        self.result_bytes = 0
+
+    @property
+    def bytes_read(self) -> int:
+        return self.pages_touched * self.page_size
+
+    @property
+    def read_efficiency(self) -> typing.Optional[float]:
+        """ The bytes of the pages read over the bytes of the result, None if the result is empty
+        """
+        return self.bytes_read / self.result_bytes if self.result_bytes else None
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__} | \
+            {"bytes_read": self.bytes_read, "read_efficiency": self.read_efficiency}
+
+    def __repr__(self):
+        return f"<IOReport {self.pages_touched} pages in {self.contiguous_reads} contiguous reads, " \
+               f"{self.result_bytes} result bytes>"
+
+
+class SimulatedBlockDevice:
+    """ The address space of the placed components, recording the pages read by the current query
+    """
+
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE):
+        if page_size <= 0:
+            raise ValueError("The page size must be positive.")
+        self.page_size = page_size
+        self.size = 0  # the allocated bytes
+        self._pages = None
+        self._read_calls = 0
+        self._bytes_requested = 0
+
+    def allocate(self, size: int) -> int:
+        """ Allocate a page-aligned region, return its offset
+        """
+        offset = self.size
+        self.size += -(-size // self.page_size) * self.page_size
+        return offset
+
+    def read(self, offset: int, length: int):
+        if self._pages is None or length <= 0:
+            return
+        self._pages.update(range(offset // self.page_size, (offset + length - 1) // self.page_size + 1))
+        self._read_calls += 1
+        self._bytes_requested += length
+
+    def begin_query(self):
+        self._pages, self._read_calls, self._bytes_requested = set(), 0, 0
+
+    def end_query(self) -> IOReport:
+        report = IOReport(self.page_size, self._pages, self._read_calls, self._bytes_requested)
+        self._pages = None
+        return report
+
+
+class _TracedBuffer:
+    """ A buffer (e.g. of a level table) placed at offset, whose slices are traced
+    """
+    __slots__ = ["_buffer", "_device", "_offset"]
+
+    def __init__(self, buffer, device: SimulatedBlockDevice):
+        self._buffer = buffer
+        self._device = device
+        self._offset = device.allocate(len(buffer))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            begin, end, _ = key.indices(len(self._buffer))
+            self._device.read(self._offset + begin, end - begin)
+        else:
+            self._device.read(self._offset + key % len(self._buffer), 1)
+        return self._buffer[key]
+
+    def __len__(self):
+        return len(self._buffer)
+
+
+class _TracedHashTable:
+    """ A dict placed as its entries (label || value) in the order of the labels
+    """
+    __slots__ = ["_table", "_device", "_labels", "_offsets", "_widths", "_positions"]
+
+    def __init__(self, table: typing.Mapping, device: SimulatedBlockDevice):
+        self._table = table
+        self._device = device
+        self._labels = sorted(table.keys())
+        self._widths = [len(label) + len(table[label]) for label in self._labels]
+        self._positions = {label: position for position, label in enumerate(self._labels)}
+        self._offsets = []
+        offset = device.allocate(sum(self._widths))
+        for width in self._widths:
+            self._offsets.append(offset)
+            offset += width
+
+    def _probe(self, label):
+        if not self._labels:
+            return
+        position = self._positions.get(label)
+        if position is None:  # the entry where it would be
+            position = min(bisect.bisect_left(self._labels, label), len(self._labels) - 1)
+        self._device.read(self._offsets[position], self._widths[position])
+
+    def get(self, label, default=None):
+        self._probe(label)
+        return self._table.get(label, default)
+
+    def __getitem__(self, label):
+        self._probe(label)
+        return self._table[label]
+
+    def __contains__(self, label) -> bool:
+        self._probe(label)
+        return label in self._table
+
+    def __len__(self):
+        return len(self._table)
+
+
+class _TracedArray:
+    """ A sequence of bytes (or None for an empty slot) placed as fixed-size slots
+    """
+    __slots__ = ["_array", "_device", "_offset", "_slot_size"]
+
+    def __init__(self, array: typing.Sequence[bytes], device: SimulatedBlockDevice):
+        self._array = array
+        self._device = device
+        slot_size = getattr(array, "item_size", None)
+        if slot_size is None:
+            slot_size = max((len(item) for item in array if item is not None), default=0)
+        if isinstance(array, PageAlignedBytesArray):
+            slot_size = -(-slot_size // device.page_size) * device.page_size
+        self._slot_size = slot_size
+        self._offset = device.allocate(slot_size * len(array))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            begin, end, step = index.indices(len(self._array))
+            if step == 1:
+                self._device.read(self._offset + begin * self._slot_size, (end - begin) * self._slot_size)
+            else:
+                for i in range(begin, end, step):
+                    self._device.read(self._offset + i * self._slot_size, self._slot_size)
+            return self._array[index]
+
+        item = self._array[index]
+        self._device.read(self._offset + (index % len(self._array)) * self._slot_size,
+                          self._slot_size if item is None else len(item))
+        return item
+
+    def __len__(self):
+        return len(self._array)
+
+    def __iter__(self):
+        for i in range(len(self._array)):
+            yield self[i]
+
+
+def _is_table_collection(value) -> bool:
+    if isinstance(value, dict):
+        items = value.values()
+    elif isinstance(value, (list, tuple)):
+        items = value
+    else:
+        return False
+    return bool(items) and all(not isinstance(item, _BYTES_TYPES) and hasattr(item, "__len__") for item in items)
+
+
+def _place(value, device: SimulatedBlockDevice):
+    """ Place a component on the device, return its traced counterpart (or itself if it is not placed)
+    """
+    if isinstance(value, LevelTable):
+        return LevelTable(value.label_size, value.value_size,
+                          _TracedBuffer(value._labels, device), _TracedBuffer(value._values, device))
+    if isinstance(value, LabelTable):
+        return LabelTable(value.label_size, value.value_size, value._occupied,
+                          _TracedBuffer(value._labels, device), _TracedBuffer(value._values, device), len(value))
+    if _is_table_collection(value):  # the directory stays in memory
+        if isinstance(value, dict):
+            return {index: _place(table, device) for index, table in value.items()}
+        return [_place(table, device) for table in value]
+    if hasattr(value, "keys") and hasattr(value, "get"):
+        return _TracedHashTable(value, device)
+    if hasattr(value, "__getitem__") and hasattr(value, "__len__") and not isinstance(value, _BYTES_TYPES + (str,)):
+        return _TracedArray(value, device)
+    return value
+
+
+class IOHarness:
+    """ An encrypted database placed on a simulated block device
+    """
+
+    def __init__(self, edb: SSEEncryptedDatabase, page_size: int = DEFAULT_PAGE_SIZE):
+        self.edb = edb
+        self.device = SimulatedBlockDevice(page_size)
+        self._placed = {}
+        for name in iter_slots(edb):
+            if name == "config" or not hasattr(edb, name):
+                continue
+            placed = _place(getattr(edb, name), self.device)
+            if placed is not getattr(edb, name):
+                self._placed[name] = placed
+
+    @contextlib.contextmanager
+    def _placed_edb(self):
+        original = {name: getattr(self.edb, name) for name in self._placed}
+        for name, placed in self._placed.items():
+            setattr(self.edb, name, placed)
+        try:
+            yield
+        finally:
+            for name, value in original.items():
+                setattr(self.edb, name, value)
+
+    def search(self, scheme: InvertedIndexSSE, token) -> IOReport:
+        """ Search with the scheme, tracing the accesses of the search
+        """
+        with self._placed_edb():
+            self.device.begin_query()
+            try:
+                result = scheme.Search(self.edb, token)
+            finally:
+                report = self.device.end_query()
+        report.result_bytes = sum(len(identifier) for identifier in result.get_result_list())
+        return report
+
+
+def measure_io(scheme_name: str,
+               db: dict,
+               queries: typing.Iterable[bytes] = None,
+               *,
+               config_dict: dict = None,
+               page_size: int = DEFAULT_PAGE_SIZE) -> typing.List[IOReport]:
+    """ Build the encrypted database of db, and trace the searches of the queries (all keywords of db if None)
+    :param config_dict: (Optional) The config of the scheme, if None, it is the default one for db
+    """
+    config_dict = default_config_for_database(scheme_name, db) if config_dict is None else config_dict
+    scheme = schemes.load_sse_module(scheme_name).SSEScheme(config_dict)
+    key = scheme.KeyGen()
+    harness = IOHarness(scheme.EDBSetup(key, db), page_size)
+    queries = list(db) if queries is None else list(queries)
+    return [harness.search(scheme, scheme.TokenGen(key, keyword)) for keyword in queries]
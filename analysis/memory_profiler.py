@@ -0,0 +1,252 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: memory_profiler.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Memory footprint profiler of the encrypted databases, with a breakdown into components
+
+The components are the slots of the encrypted database (e.g. D and A of [CJJ14], T of [CGKO06] SSE1),
+and a slot holding a collection of tables (e.g. the levels HT_list of [CT14], the bucket arrays A_dict of [DP17])
+is broken down into one component for each table.
+For each component, the deep size is the sum of sys.getsizeof of all objects reachable from it (each counted once),
+and the raw size is the payload of the bytes-like objects (labels and ciphertexts),
+so that deep - raw is the overhead of the Python objects.
+The memory mapped and file objects (e.g. the levels stored on disk) are not resident, so they are not traversed.
+
+Besides, the memory allocated when building (or loading) the encrypted database is traced by tracemalloc,
+the peak of which is usually much higher than the retained one (e.g. the serialized bytes and the unpickled objects
+coexist when loading).
+"""
+import io
+import mmap
+import sys
+import time
+import tracemalloc
+import typing
+
+import schemes
+from analysis.advisor import default_config_for_database
+from analysis.instrumentation import iter_slots
+from schemes.interface.structures import SSEEncryptedDatabase
+
+__all__ = [
+    "ComponentUsage",
+    "MemoryReport",
+    "deep_size",
+    "component_usages",
+    "profile_memory",
+]
+
+_BYTES_TYPES = (bytes, bytearray)
+_WARM_UP_SIZE = 3  # not a power of two, as [CT14] cannot be built on a database of such a size
+_NOT_RESIDENT_TYPES = (mmap.mmap, io.IOBase)
+
+
+class ComponentUsage:
+    __slots__ = ["name", "deep_bytes", "raw_bytes", "object_count"]
+
+    def __init__(self, name: str, deep_bytes: int = 0, raw_bytes: int = 0, object_count: int = 0):
+        self.name = name
+        self.deep_bytes = deep_bytes
+        self.raw_bytes = raw_bytes
+        self.object_count = object_count
+
+    @property
+    def overhead_bytes(self) -> int:
+        return self.deep_bytes - self.raw_bytes
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "deep_bytes": self.deep_bytes, "raw_bytes": self.raw_bytes,
+                "overhead_bytes": self.overhead_bytes, "object_count": self.object_count}
+
+    def __repr__(self):
+        return f"<ComponentUsage {self.name} {self.deep_bytes} bytes ({self.raw_bytes} raw)>"
+
+
+def _referents(obj) -> typing.Iterable:
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield key
+            yield value
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        yield from obj
+    elif isinstance(obj, memoryview):
+        yield obj.obj
+    else:
+        for name in iter_slots(obj):
+            if hasattr(obj, name):
+                yield getattr(obj, name)
+        if hasattr(obj, "__dict__"):
+            yield obj.__dict__
+
+
+def deep_size(obj, seen: typing.Set[int] = None, name: str = "") -> ComponentUsage:
+    """ The deep size of obj, the objects whose ids are in seen are skipped, and the visited ones are added to seen
+    """
+    seen = set() if seen is None else seen
+    usage = ComponentUsage(name)
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, type):
+            continue
+        seen.add(id(current))
+        usage.object_count += 1
+        usage.deep_bytes += sys.getsizeof(current)
+        if isinstance(current, _BYTES_TYPES):
+            usage.raw_bytes += len(current)
+        elif isinstance(current, memoryview):
+            if not isinstance(current.obj, _NOT_RESIDENT_TYPES):
+                stack.append(current.obj)
+        elif not isinstance(current, (str, int, float, bool, type(None)) + _NOT_RESIDENT_TYPES):
+            stack.extend(_referents(current))
+    return usage
+
+
+def _is_table_collection(value) -> bool:
+    """ Whether value is a list or dict of tables (non-bytes containers), e.g. the levels of [CT14]
+    """
+    items = value.values() if isinstance(value, dict) else value if isinstance(value, (list, tuple)) else None
+    if not items:
+        return False
+    return all(not isinstance(item, _BYTES_TYPES) and hasattr(item, "__len__") for item in items)
+
+
+def component_usages(edb: SSEEncryptedDatabase) -> typing.List[ComponentUsage]:
+    """ The deep sizes of the components of edb, in the order of the slots.
+    A collection of tables is reported as the collection itself (without the tables), then the tables one by one.
+    """
+    seen = set()
+    usages = []
+    for slot in iter_slots(edb):
+        if slot == "config" or not hasattr(edb, slot):
+            continue
+        value = getattr(edb, slot)
+        if not _is_table_collection(value):
+            usages.append(deep_size(value, seen, slot))
+            continue
+
+        table_items = list(value.items() if isinstance(value, dict) else enumerate(value))
+        seen.update(id(table) for _, table in table_items)
+        usages.append(deep_size(value, seen, slot))
+        for index, table in table_items:
+            seen.discard(id(table))
+            usages.append(deep_size(table, seen, f"{slot}[{index}]"))
+    return usages
+
+
+def _warm_up_database(db: dict) -> dict:
+    """ The first few postings of db, to build a throwaway encrypted database before tracing
+    """
+    warm_up_db, size = {}, 0
+    for keyword, id_list in db.items():
+        warm_up_db[keyword] = id_list[:_WARM_UP_SIZE - size]
+        size += len(warm_up_db[keyword])
+        if size == _WARM_UP_SIZE:
+            break
+    return warm_up_db
+
+
+class MemoryReport:
+    """ The memory footprint of an encrypted database
+    :ivar traced_peak_bytes: The peak of the memory traced by tracemalloc when building (or loading)
+    :ivar traced_retained_bytes: The memory traced by tracemalloc retained after building (or loading)
+    """
+    __slots__ = ["scheme", "total_size", "components", "build_seconds", "traced_peak_bytes", "traced_retained_bytes"]
+
+    def __init__(self, scheme: str, total_size: typing.Optional[int], components: typing.List[ComponentUsage]):
+        self.scheme = scheme
+        self.total_size = total_size
+        self.components = components
+        self.build_seconds = None
+        self.traced_peak_bytes = None
+        self.traced_retained_bytes = None
+
+    @property
+    def deep_bytes(self) -> int:
+        return sum(component.deep_bytes for component in self.components)
+
+    @property
+    def raw_bytes(self) -> int:
+        return sum(component.raw_bytes for component in self.components)
+
+    @property
+    def bytes_per_posting(self) -> typing.Optional[float]:
+        return self.deep_bytes / self.total_size if self.total_size else None
+
+    @property
+    def overhead_ratio(self) -> float:
+        """ The deep size over the raw size
+        """
+        return self.deep_bytes / self.raw_bytes if self.raw_bytes else float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "scheme": self.scheme,
+            "total_size": self.total_size,
+            "deep_bytes": self.deep_bytes,
+            "raw_bytes": self.raw_bytes,
+            "bytes_per_posting": self.bytes_per_posting,
+            "overhead_ratio": self.overhead_ratio,
+            "build_seconds": self.build_seconds,
+            "traced_peak_bytes": self.traced_peak_bytes,
+            "traced_retained_bytes": self.traced_retained_bytes,
+            "components": [component.to_dict() for component in self.components],
+        }
+
+
+def profile_memory(scheme_name: str,
+                   db: dict = None,
+                   *,
+                   config_dict: dict = None,
+                   edb_bytes: bytes = None,
+                   total_size: int = None) -> MemoryReport:
+    """ Build the encrypted database of db (or load the serialized one edb_bytes) and profile its memory footprint.
+    :param config_dict: (Optional) The config of the scheme, required when loading.
+    If None, it is the default one with the parameters determined by db.
+    :param edb_bytes: (Optional) If given, the encrypted database is loaded from it instead of built from db
+    :param total_size: (Optional) The number of postings, for bytes per posting. If None, it is the total size of db.
+    """
+    if db is None and edb_bytes is None:
+        raise ValueError("Either the database or the serialized encrypted database must be given.")
+    if config_dict is None:
+        if db is None:
+            raise ValueError("The config is required to load an encrypted database.")
+        config_dict = default_config_for_database(scheme_name, db)
+    if total_size is None and db is not None:
+        total_size = sum(len(id_list) for id_list in db.values())
+
+    sse_module = schemes.load_sse_module(scheme_name)
+    scheme = sse_module.SSEScheme(config_dict)
+    key = None
+    if edb_bytes is None:
+        key = scheme.KeyGen()
+        scheme.EDBSetup(key, _warm_up_database(db))  # warm up, so that the lazy imports are not traced
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        traced_before, _ = tracemalloc.get_traced_memory()
+        begin = time.perf_counter()
+        if edb_bytes is None:
+            edb = scheme.EDBSetup(key, db)
+        else:
+            edb = sse_module.SSEEncryptedDatabase.deserialize(edb_bytes, scheme.config)
+        build_seconds = time.perf_counter() - begin
+        traced_after, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    report = MemoryReport(scheme_name, total_size, component_usages(edb))
+    report.build_seconds = build_seconds
+    report.traced_peak_bytes = traced_peak - traced_before
+    report.traced_retained_bytes = traced_after - traced_before
+    return report
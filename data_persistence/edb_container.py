@@ -0,0 +1,327 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: edb_container.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Single-file container of an encrypted database, searched in place through a memory map
+"""
+import collections.abc
+import io
+import mmap
+import pickle
+import typing
+
+from data_persistence.page_aligned_array import PAGE_SIZE
+from toolkit.data_structures.label_table import LabelTable
+from toolkit.data_structures.level_table import LevelTable
+
+__all__ = ["EDBContainer", "HeapDict", "HeapArray", "write_container", "is_container", "CONTAINER_MAGIC"]
+
+CONTAINER_MAGIC = b"LIBSSEDB"
+_FORMAT_VERSION = 1
+_HEADER_SIZE = 8 + 4 + 4 + 4  # magic || version || section count || tag length
+_SECTION_NAME_SIZE = 64
+_SECTION_ENTRY_SIZE = _SECTION_NAME_SIZE + 4 + 8 + 8  # name || kind || offset || length
+_OFFSET_SIZE = 8
+
+
+class _SectionKind:
+    PICKLE = 0
+    LABEL_TABLE = 1
+    LEVEL_TABLE = 2
+    HEAP_DICT = 3
+    HEAP_ARRAY = 4
+
+
+class HeapDict(collections.abc.Mapping):
+    """ A read-only dictionary of fixed-size labels and variable-size values,
+    whose index is a label table from the labels to the (offset, length) of the values in the value heap.
+    """
+    __slots__ = ["_index", "_heap"]
+
+    def __init__(self, index: LabelTable, heap):
+        self._index = index
+        self._heap = heap
+
+    @classmethod
+    def from_dict(cls, dict_: typing.Mapping[bytes, bytes]) -> 'HeapDict':
+        heap, index_pairs, offset = [], [], 0
+        for label, value in dict_.items():
+            entry = offset.to_bytes(_OFFSET_SIZE, 'big') + len(value).to_bytes(_OFFSET_SIZE, 'big')
+            index_pairs.append((label, entry))
+            heap.append(value)
+            offset += len(value)
+        return cls(LabelTable.from_pairs(index_pairs, value_size=2 * _OFFSET_SIZE), b''.join(heap))
+
+    def _value_at(self, slot: int) -> bytes:
+        entry = self._index.value_at(slot)
+        offset, length = int.from_bytes(entry[:_OFFSET_SIZE], 'big'), int.from_bytes(entry[_OFFSET_SIZE:], 'big')
+        return bytes(self._heap[offset: offset + length])
+
+    def get(self, label, default=None):
+        slot = self._index.index(label)
+        return default if slot == -1 else self._value_at(slot)
+
+    def __getitem__(self, label) -> bytes:
+        slot = self._index.index(label)
+        if slot == -1:
+            raise KeyError(label)
+        return self._value_at(slot)
+
+    def __contains__(self, label) -> bool:
+        return label in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __reduce__(self):
+        return type(self).from_buffer, (self.to_bytes(),)
+
+    def to_bytes(self) -> bytes:
+        """ Index size || index (a label table) || value heap
+        """
+        index_bytes = self._index.to_bytes()
+        return b''.join([len(index_bytes).to_bytes(8, 'big'), index_bytes, bytes(self._heap)])
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'HeapDict':
+        view = memoryview(buffer)
+        index_size = int.from_bytes(view[:8], 'big')
+        return cls(LabelTable.from_buffer(view[8: 8 + index_size]), view[8 + index_size:])
+
+
+class HeapArray(collections.abc.Sequence):
+    """ A read-only array of variable-size bytes (or None for an empty slot),
+    whose items are located by the offset table of the value heap.
+
+    - Layout:
+        * Count (8 bytes)
+        * Presence: one byte for each item, zero if the item is None
+        * Offsets: (count + 1) offsets of 8 bytes, item i is heap[offsets[i]: offsets[i + 1]]
+        * Value heap
+    """
+    __slots__ = ["_presence", "_offsets", "_heap", "_count"]
+
+    def __init__(self, presence, offsets, heap):
+        self._presence = presence
+        self._offsets = offsets
+        self._heap = heap
+        self._count = len(presence)
+
+    def _offset_at(self, index: int) -> int:
+        return int.from_bytes(self._offsets[index * _OFFSET_SIZE: (index + 1) * _OFFSET_SIZE], 'big')
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("HeapArray index out of range")
+        if not self._presence[index]:
+            return None
+        return bytes(self._heap[self._offset_at(index): self._offset_at(index + 1)])
+
+    def get_batch(self, indices: typing.Iterable[int]) -> typing.List[typing.Optional[bytes]]:
+        return [self[index] for index in indices]
+
+    def __len__(self):
+        return self._count
+
+    def __eq__(self, other):
+        if not isinstance(other, collections.abc.Sequence) or isinstance(other, (bytes, str)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __reduce__(self):
+        return type(self).from_buffer, (self.list_to_bytes(self),)
+
+    @staticmethod
+    def list_to_bytes(list_: typing.Sequence[typing.Optional[bytes]]) -> bytes:
+        presence = bytes(0 if item is None else 1 for item in list_)
+        offsets, offset = [(0).to_bytes(_OFFSET_SIZE, 'big')], 0
+        for item in list_:
+            offset += 0 if item is None else len(item)
+            offsets.append(offset.to_bytes(_OFFSET_SIZE, 'big'))
+        return b''.join([len(list_).to_bytes(8, 'big'), presence, *offsets,
+                         *(item for item in list_ if item is not None)])
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'HeapArray':
+        view = memoryview(buffer)
+        count = int.from_bytes(view[:8], 'big')
+        offsets_begin = 8 + count
+        heap_begin = offsets_begin + (count + 1) * _OFFSET_SIZE
+        return cls(view[8: offsets_begin], view[offsets_begin: heap_begin], view[heap_begin:])
+
+
+def _is_bytes_list(component) -> bool:
+    return isinstance(component, (list, tuple, HeapArray)) and \
+        all(item is None or isinstance(item, (bytes, bytearray)) for item in component)
+
+
+def _is_heap_dict(component) -> bool:
+    if isinstance(component, HeapDict):
+        return True
+    if not isinstance(component, dict) or not component:
+        return False
+    label_size = len(next(iter(component)))
+    return all(isinstance(label, bytes) and len(label) == label_size and isinstance(value, (bytes, bytearray))
+               for label, value in component.items())
+
+
+def _encode_section(component) -> typing.Tuple[int, bytes]:
+    if isinstance(component, LabelTable):
+        return _SectionKind.LABEL_TABLE, component.to_bytes()
+    if isinstance(component, LevelTable):
+        return _SectionKind.LEVEL_TABLE, component.to_bytes()
+    if _is_heap_dict(component):
+        heap_dict = component if isinstance(component, HeapDict) else HeapDict.from_dict(component)
+        return _SectionKind.HEAP_DICT, heap_dict.to_bytes()
+    if _is_bytes_list(component):
+        return _SectionKind.HEAP_ARRAY, HeapArray.list_to_bytes(component)
+    return _SectionKind.PICKLE, pickle.dumps(component)
+
+
+def _decode_section(kind: int, view: memoryview):
+    if kind == _SectionKind.LABEL_TABLE:
+        return LabelTable.from_buffer(view)
+    if kind == _SectionKind.LEVEL_TABLE:
+        return LevelTable.from_buffer(view)
+    if kind == _SectionKind.HEAP_DICT:
+        return HeapDict.from_buffer(view)
+    if kind == _SectionKind.HEAP_ARRAY:
+        return HeapArray.from_buffer(view)
+    if kind == _SectionKind.PICKLE:
+        return pickle.loads(view)
+    raise ValueError(f"Unknown section kind {kind}.")
+
+
+def _round_up_to_page(size: int) -> int:
+    return (size + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+
+def write_container(file: typing.BinaryIO, tag: bytes, sections: typing.Mapping[str, typing.Any]):
+    """ Write the components of an encrypted database into a seekable binary file.
+
+    - File Format:
+        * Header: magic (8 bytes) || version (4 bytes) || section count (4 bytes) || tag length (4 bytes) || tag
+        * Section table: for each section, name (64 bytes, zero-padded) || kind (4 bytes) || offset (8 bytes)
+          || length (8 bytes)
+        * Sections: each begins at a page boundary, a label table, a level table, a heap dict, a heap array,
+          or a pickled object for the components of none of them
+    :param tag: The header of the scheme, checked when loading
+    :param sections: The components of the encrypted database, by names
+    """
+    encoded_names = []
+    for name in sections:
+        encoded_name = name.encode("utf8")
+        if len(encoded_name) > _SECTION_NAME_SIZE:
+            raise ValueError(f"The section name {name} is longer than {_SECTION_NAME_SIZE} bytes.")
+        encoded_names.append(encoded_name)
+
+    begin = file.tell()
+    table_begin = _HEADER_SIZE + len(tag)
+    offset = _round_up_to_page(table_begin + len(sections) * _SECTION_ENTRY_SIZE)
+    end = table_begin + len(sections) * _SECTION_ENTRY_SIZE
+    entries = []
+    for encoded_name, component in zip(encoded_names, sections.values()):
+        kind, section_bytes = _encode_section(component)
+        file.seek(begin + offset)
+        file.write(section_bytes)
+        entries.append(encoded_name.ljust(_SECTION_NAME_SIZE, b"\x00") + kind.to_bytes(4, 'big') +
+                       offset.to_bytes(8, 'big') + len(section_bytes).to_bytes(8, 'big'))
+        end = offset + len(section_bytes)
+        offset = _round_up_to_page(end)
+
+    file.seek(begin)
+    file.write(b''.join([CONTAINER_MAGIC,
+                         _FORMAT_VERSION.to_bytes(4, 'big'),
+                         len(entries).to_bytes(4, 'big'),
+                         len(tag).to_bytes(4, 'big'),
+                         tag,
+                         *entries]))
+    file.seek(begin + end)
+    file.truncate()
+
+
+def is_container(buffer) -> bool:
+    return bytes(buffer[:len(CONTAINER_MAGIC)]) == CONTAINER_MAGIC
+
+
+class EDBContainer:
+    """ A container of an encrypted database loaded from a buffer (e.g. a mmap of the file) without copying,
+    the sections are decoded lazily, so opening a container is independent of the size of the database.
+    """
+
+    def __init__(self, buffer, mmap_object: mmap.mmap = None):
+        view = memoryview(buffer)
+        if len(view) < _HEADER_SIZE or not is_container(view):
+            raise ValueError("The buffer is not an EDB container.")
+        version = int.from_bytes(view[8:12], 'big')
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported EDB container version {version}.")
+        section_count = int.from_bytes(view[12:16], 'big')
+        tag_length = int.from_bytes(view[16:20], 'big')
+
+        self.tag = bytes(view[_HEADER_SIZE: _HEADER_SIZE + tag_length])
+        self._view = view
+        self._mmap = mmap_object
+        self._entries = {}  # name -> (kind, offset, length)
+        table_begin = _HEADER_SIZE + tag_length
+        for i in range(section_count):
+            entry = view[table_begin + i * _SECTION_ENTRY_SIZE: table_begin + (i + 1) * _SECTION_ENTRY_SIZE]
+            name = bytes(entry[:_SECTION_NAME_SIZE]).rstrip(b"\x00").decode("utf8")
+            kind, offset, length = (int.from_bytes(entry[_SECTION_NAME_SIZE: _SECTION_NAME_SIZE + 4], 'big'),
+                                    int.from_bytes(entry[_SECTION_NAME_SIZE + 4: _SECTION_NAME_SIZE + 12], 'big'),
+                                    int.from_bytes(entry[_SECTION_NAME_SIZE + 12:], 'big'))
+            if offset + length > len(view):
+                raise ValueError(f"The section {name} is out of the buffer.")
+            self._entries[name] = kind, offset, length
+
+    @classmethod
+    def open(cls, path) -> 'EDBContainer':
+        """ Map the container file into memory (read-only)
+        """
+        with open(path, "rb") as f:
+            mmap_object = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mmap_object, mmap_object)
+
+    @classmethod
+    def from_sections(cls, tag: bytes, sections: typing.Mapping[str, typing.Any]) -> 'EDBContainer':
+        """ A container in memory, mainly for test
+        """
+        buffer = io.BytesIO()
+        write_container(buffer, tag, sections)
+        return cls(buffer.getvalue())
+
+    def section_names(self) -> typing.List[str]:
+        return list(self._entries)
+
+    def section(self, name: str):
+        kind, offset, length = self._entries[name]
+        return _decode_section(kind, self._view[offset: offset + length])
+
+    def sections(self) -> typing.Dict[str, typing.Any]:
+        return {name: self.section(name) for name in self._entries}
+
+    def close(self):
+        """ Unmap the file, the components loaded from the container must have been released
+        """
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -221,6 +221,12 @@ class PersistentFixedLengthBytesArray(collections.abc.Sequence, metaclass=ABCMet
     def __len__(self) -> int:
         pass
 
+    def get_batch(self, indices: Iterable[int]) -> list[bytes]:
+        """ Get the items corresponding to the given indices, in the order of the indices.
+        The concrete implementation can override this method to coalesce the reads of nearby items.
+        """
+        return [self[index] for index in indices]
+
     def __iter__(self):
         for index in range(len(self)):
             yield self[index]
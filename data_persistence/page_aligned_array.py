@@ -0,0 +1,178 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: page_aligned_array.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: A persistent fixed-length bytes array whose items are aligned to pages, read by positional reads
+"""
+import operator
+import os
+import typing
+
+from data_persistence.interfaces import PersistentFixedLengthBytesArray
+
+__all__ = ["PageAlignedBytesArray", "PAGE_SIZE"]
+
+PAGE_SIZE = 4096
+_MAGIC = b"LIBSSEPA"  # page-aligned array
+
+
+def _round_up_to_page(size: int) -> int:
+    return (size + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+
+class PageAlignedBytesArray(PersistentFixedLengthBytesArray):
+    """ A persistent fixed-length array stored in a single binary file,
+    where each item begins at a page boundary and occupies a whole number of pages,
+    so that an item is read with exactly one `os.pread` of the pages it spans.
+
+    - File Format:
+        * Header Page: magic (8 bytes) || item_size (8 bytes) || array_len (8 bytes), padded to a page
+        * Item i: at offset PAGE_SIZE + i * slot_size, where slot_size is item_size rounded up to pages
+    - An item shorter than item_size is padded with zero bytes at the end,
+      and an item that has never been written is all-zero bytes.
+    """
+
+    @classmethod
+    def open(cls, local_path: str) -> 'PageAlignedBytesArray':
+        return cls(local_path, mode="r")
+
+    @classmethod
+    def create(cls, local_path: str, **kwargs) -> 'PageAlignedBytesArray':
+        missing_params = [param for param in ("item_size", "array_len") if param not in kwargs]
+        if missing_params:
+            raise TypeError(f"Missing parameters: {', '.join(missing_params)}")
+        return cls(local_path, mode="c", item_size=kwargs["item_size"], array_len=kwargs["array_len"])
+
+    @classmethod
+    def from_list(cls,
+                  list_: list[bytes],
+                  local_path: str,
+                  *,
+                  item_size: typing.Optional[int] = None,
+                  list_len: typing.Optional[int] = None) -> 'PageAlignedBytesArray':
+        """
+        Create a page-aligned bytes array from a list.
+        :param list_: List of bytes
+        :param local_path: The local path to store the persistent array
+        :param item_size: (Optional) the fixed size of item, if None, it will be the maximum value of all items in list.
+        :param list_len: (Optional) the fixed length of array to create.
+        If None, it will be the length of parameter `list_`.
+        """
+        if item_size is None:
+            item_size = max(len(item) for item in list_)
+        list_len = len(list_) if list_len is None else max(list_len, len(list_))
+
+        p_array = cls.create(local_path, item_size=item_size, array_len=list_len)
+        p_array[:len(list_)] = list_
+        return p_array
+
+    def __init__(self, local_path: str, mode: str = "r", **kwargs):
+        self.__local_path = local_path
+        self.__fd = None
+        if mode == "r":
+            try:
+                self.__fd = os.open(local_path, os.O_RDWR)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"The file corresponding to the local path {local_path} not exists.")
+            header = os.pread(self.__fd, 24, 0)
+            if len(header) != 24 or header[:8] != _MAGIC:
+                os.close(self.__fd)
+                raise ValueError(f"The file corresponding to the local path {local_path} is broken.")
+            self.__item_size = int.from_bytes(header[8:16], 'big')
+            self.__array_len = int.from_bytes(header[16:24], 'big')
+        elif mode == "c":
+            self.__item_size, self.__array_len = int(kwargs["item_size"]), int(kwargs["array_len"])
+            if self.__item_size <= 0 or self.__array_len < 0:
+                raise ValueError("The item size must be positive and the array length must be non-negative.")
+            try:
+                self.__fd = os.open(local_path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                raise FileExistsError(f"The file {local_path} exists.")
+            os.pwrite(self.__fd, _MAGIC + self.__item_size.to_bytes(8, 'big') + self.__array_len.to_bytes(8, 'big'), 0)
+            # the unwritten items are holes of the file, i.e. zero bytes
+            os.ftruncate(self.__fd, PAGE_SIZE + self.__array_len * _round_up_to_page(self.__item_size))
+        else:  # Unexpected mode
+            raise TypeError(f"Unexpected Mode: {mode}")
+
+        self.__slot_size = _round_up_to_page(self.__item_size)
+
+    def _check_opened(self):
+        if self.__fd is None:
+            raise ValueError('invalid operation on closed array')
+
+    def _to_actual_index(self, item) -> int:
+        index = operator.index(item)
+        if index >= self.__array_len or index < -self.__array_len:
+            raise IndexError("Array index out of range")
+        return index % self.__array_len
+
+    def _read_item(self, index: int) -> bytes:
+        ret = os.pread(self.__fd, self.__item_size, PAGE_SIZE + index * self.__slot_size)
+        return ret + b"\x00" * (self.__item_size - len(ret))
+
+    def __getitem__(self, item: typing.Union[slice, int]) -> typing.Union[list[bytes], bytes]:
+        self._check_opened()
+        if isinstance(item, slice):
+            return [self._read_item(index) for index in range(*item.indices(self.__array_len))]
+        return self._read_item(self._to_actual_index(item))
+
+    def __setitem__(self,
+                    key: typing.Union[slice, int],
+                    value: typing.Union[bytes, typing.Iterable[bytes]]):
+        self._check_opened()
+        if isinstance(key, slice):
+            for index, content in zip(range(*key.indices(self.__array_len)), value):
+                self[index] = content
+            return
+
+        if not isinstance(value, typing.ByteString):
+            raise TypeError("The content should be a byte string.")
+        if len(value) > self.__item_size:
+            raise ValueError(
+                "The length of the data to be written is greater than the item length of the persistent array"
+            )
+        os.pwrite(self.__fd,
+                  bytes(value) + b"\x00" * (self.__item_size - len(value)),
+                  PAGE_SIZE + self._to_actual_index(key) * self.__slot_size)
+
+    def __len__(self):
+        return self.__array_len
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def item_size(self):
+        return self.__item_size
+
+    @property
+    def local_path(self):
+        return self.__local_path
+
+    def sync(self) -> None:
+        self._check_opened()
+        os.fsync(self.__fd)
+
+    def close(self) -> None:
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+
+    def release(self):
+        self.close()
+        try:
+            os.unlink(self.__local_path)
+        except FileNotFoundError:  # release multiple times
+            pass
+
+    def __repr__(self):
+        if self.__fd is None:
+            return "<PageAlignedBytesArray closed>"
+        return f"<PageAlignedBytesArray local_path: {self.local_path}>"
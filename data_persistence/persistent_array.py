@@ -21,6 +21,10 @@ import pickle
 
 __all__ = ["SPFLBArray"]
 
+# When reading a batch of items, two runs of items in the same file are merged into one read
+# if the gap between them is not larger than this size (in bytes)
+COALESCE_GAP_BYTES = 4096
+
 
 class _ClosedDescriptor:
     def __init__(self, error_msg: str):
@@ -39,7 +43,7 @@ class _ClosedFixedLengthBytesArray(collections.abc.Sequence):
     def closed(self, *args):
         raise ValueError('invalid operation on fixed-length bytes closed array')
 
-    __iter__ = __len__ = __getitem__ = __setitem__ = release = close = closed
+    __iter__ = __len__ = __getitem__ = __setitem__ = get_batch = release = close = closed
     item_size = local_path = _ClosedDescriptor('invalid operation on fixed-length bytes closed array')
 
     def __repr__(self):
@@ -161,6 +165,56 @@ class SimpleMultiFilePersistentFixedLengthBytesArray(collections.abc.Sequence):
         ret += b"\x00" * (self.__item_size - len(ret))
         return ret
 
+    def _read_run(self, file_id: int, first_offset: int, last_offset: int) -> bytes:
+        """ Read the items whose offsets are in [first_offset, last_offset] of the given file with one read
+        """
+        file = self._get_file_by_id(file_id)
+        run_size = (last_offset - first_offset + 1) * self.__item_size
+        file.seek(first_offset * self.__item_size, 0)
+        ret = file.read(run_size)
+
+        # The file may be shorter than expected, pad with zero bytes
+        ret += b"\x00" * (run_size - len(ret))
+        return ret
+
+    def get_batch(self, indices: typing.Iterable[int]) -> list[bytes]:
+        """ Get the items corresponding to the given indices, in the order of the indices.
+        The indices are sorted by their physical position firstly,
+        and then nearby items in the same file (see `COALESCE_GAP_BYTES`) are read with a single read.
+        """
+        actual_indices = []
+        for item in indices:
+            index = operator.index(item)
+            if index >= len(self) or index < -len(self):
+                raise IndexError("Array index out of range")
+            actual_indices.append(index % len(self))
+
+        ret: typing.List[typing.Optional[bytes]] = [None] * len(actual_indices)
+        max_gap_items = COALESCE_GAP_BYTES // self.__item_size
+        # positions of the requested items, sorted by physical position
+        sorted_positions = sorted(range(len(actual_indices)), key=actual_indices.__getitem__)
+
+        run_begin = 0
+        while run_begin < len(sorted_positions):
+            file_id, first_offset = divmod(actual_indices[sorted_positions[run_begin]], self.__item_num_in_one_file)
+            last_offset = first_offset
+            run_end = run_begin + 1
+            while run_end < len(sorted_positions):
+                next_file_id, next_offset = divmod(actual_indices[sorted_positions[run_end]],
+                                                   self.__item_num_in_one_file)
+                if next_file_id != file_id or next_offset - last_offset - 1 > max_gap_items:
+                    break
+                last_offset = next_offset
+                run_end += 1
+
+            run_bytes = self._read_run(file_id, first_offset, last_offset)
+            for position in sorted_positions[run_begin:run_end]:
+                begin = (actual_indices[position] % self.__item_num_in_one_file - first_offset) * self.__item_size
+                ret[position] = run_bytes[begin: begin + self.__item_size]
+            run_begin = run_end
+
+        return ret
+
     def _write_bytes_to_file(self, index: int, content: bytes):
         if len(content) > self.__item_size:
             raise ValueError(
@@ -339,6 +393,9 @@ class SPFLBArray(PersistentFixedLengthBytesArray):
     def __len__(self):
         return len(self.__underlying_array)
 
+    def get_batch(self, indices: typing.Iterable[int]) -> list[bytes]:
+        return self.__underlying_array.get_batch(indices)
+
     def __iter__(self):
         # override the __iter__ method of the base class to return the iterator of the underlying array directly,
         # otherwise, getting the iterator after the underlying array is closed will not throw an exception.
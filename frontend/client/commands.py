@@ -17,8 +17,16 @@ import asyncio
 import functools
 import json
 import pickle
+import random
+import typing
 
 import schemes
+from analysis.advisor import ALL_SCHEMES, DEFAULT_SAMPLE_KEYWORD_COUNT, advise, recommend
+from analysis.benchmark import DEFAULT_SIZES, DISTRIBUTIONS, DEFAULT_QUERY_COUNT, DEFAULT_TOLERANCE, run_benchmark, \
+    save_results, load_results, scaling_exponents, compare_results
+from analysis.io_locality import DEFAULT_PAGE_SIZE, measure_io
+from analysis.memory_profiler import profile_memory
+from analysis.cost_model import CostModel, DatabaseStatistics, tune_config, check_prediction
 from frontend.client.services import service_name_handler
 from frontend.client.services.service import Service
 from toolkit.bytes_utils import BytesConverter
@@ -40,6 +48,208 @@ def generate_default_config(scheme_name: str, config_save_path: str):
     print(f">>> Create default config of {scheme_name} successfully.")
 
 
+def generate_tuned_config(scheme_name: str,
+                          config_save_path: str,
+                          db_path: str,
+                          *,
+                          calibrate: bool = False,
+                          check_sample_size: int = 0):
+    """ Generate a config whose parameters are tuned for the database by the cost model.
+    If check_sample_size > 0, the prediction is checked on a sample build of that many keywords.
+    """
+    try:
+        with open(db_path, "r") as f:
+            db = convert_database_keyword_to_bytes(json.load(f))
+        cost_model = CostModel.calibrate() if calibrate else CostModel()
+        config, prediction = tune_config(scheme_name, DatabaseStatistics.from_database(db), cost_model=cost_model)
+    except Exception as e:
+        print(f">>> Tune config error: {e}")
+        return
+
+    write_config(config, config_save_path)
+    print(f">>> Create tuned config of {scheme_name} successfully.")
+    print(f">>> Predicted encrypted database size: {prediction.edb_bytes} bytes")
+    print(f">>> Predicted search time: {cost_model.search_seconds(prediction) * 1000:.3f} ms")
+    if check_sample_size > 0:
+        check_result = check_prediction(config, db, sample_keyword_count=check_sample_size, cost_model=cost_model)
+        print(f">>> Check on a sample of {check_result['sample_keyword_count']} keywords: "
+              f"encrypted database size {check_result['measured_edb_bytes']} bytes "
+              f"(predicted {check_result['predicted_edb_bytes']}), "
+              f"search time {check_result['measured_search_seconds'] * 1000:.3f} ms "
+              f"(predicted {check_result['predicted_search_seconds'] * 1000:.3f})")
+
+
+def advise_scheme(db_path: str,
+                  query_log_path: str = None,
+                  *,
+                  scheme_names: typing.Iterable[str] = ALL_SCHEMES,
+                  sample_keyword_count: int = DEFAULT_SAMPLE_KEYWORD_COUNT,
+                  metric: str = "p99_search_seconds"):
+    """ Benchmark the schemes on a sample of the database (json), and recommend one by the metric.
+    The query log is a text file of one queried keyword per line.
+    """
+    try:
+        with open(db_path, "r") as f:
+            db = convert_database_keyword_to_bytes(json.load(f))
+        query_log = None
+        if query_log_path is not None:
+            with open(query_log_path, "r") as f:
+                query_log = [bytes(line.strip(), encoding="utf-8") for line in f if line.strip()]
+
+        reports = advise(db, query_log, scheme_names=scheme_names, sample_keyword_count=sample_keyword_count)
+        for report in reports:
+            if not report.ok:
+                print(f">>> {report.scheme}: failed, {report.error}")
+                continue
+            print(f">>> {report.scheme}: {report.edb_bytes_per_posting:.1f} bytes/posting "
+                  f"(~{report.full_edb_bytes} bytes in total), "
+                  f"setup {report.setup_postings_per_second:.0f} postings/s (~{report.full_setup_seconds:.1f} s), "
+                  f"token {report.token_bytes:.0f} bytes, "
+                  f"search p50 {report.p50_search_seconds * 1000:.3f} ms, p99 {report.p99_search_seconds * 1000:.3f} ms")
+        print(f">>> Recommended scheme by {metric}: {recommend(reports, metric).scheme}")
+    except Exception as e:
+        print(f">>> Advise error: {e}")
+
+
+def run_benchmark_suite(output_path: str,
+                        *,
+                        scheme_names: typing.Iterable[str] = ALL_SCHEMES,
+                        sizes: typing.Iterable[int] = DEFAULT_SIZES,
+                        distributions: typing.Iterable[str] = DISTRIBUTIONS,
+                        query_count: int = DEFAULT_QUERY_COUNT):
+    """ Benchmark the schemes over the database sizes and list length distributions, and save the results (json)
+    """
+    def print_record(record: dict):
+        case = f"{record['scheme']} ({record['distribution']}, N={record['total_size']})"
+        if record["error"] is not None:
+            print(f">>> {case}: failed, {record['error']}")
+            return
+        print(f">>> {case}: setup {record['setup_seconds']:.3f} s, {record['edb_bytes']} bytes, "
+              f"token {record['token_gen_seconds'] * 1000:.3f} ms, "
+              f"search p50 {record['p50_search_seconds'] * 1000:.3f} ms, "
+              f"p99 {record['p99_search_seconds'] * 1000:.3f} ms, "
+              f"peak RSS {record['peak_rss_bytes'] / 2 ** 20:.1f} MiB")
+
+    try:
+        results = run_benchmark(scheme_names, sizes, distributions, query_count=query_count,
+                                progress_callback=print_record)
+        save_results(results, output_path)
+    except Exception as e:
+        print(f">>> Benchmark error: {e}")
+        return
+
+    print(f">>> Save the results to {output_path} successfully.")
+    for metric in ("setup_seconds", "edb_bytes", "p50_search_seconds"):
+        for (scheme_name, distribution), exponent in scaling_exponents(results, metric).items():
+            print(f">>> Scaling of {metric} of {scheme_name} ({distribution}): N^{exponent:.2f}")
+
+
+def compare_benchmark_results(baseline_path: str, current_path: str, *, tolerance: float = DEFAULT_TOLERANCE) -> bool:
+    """ Compare two saved benchmark runs, and print the regressions
+    :return: Whether there is no regression
+    """
+    try:
+        regressions = compare_results(load_results(baseline_path), load_results(current_path), tolerance=tolerance)
+    except Exception as e:
+        print(f">>> Compare error: {e}")
+        return False
+
+    for regression in regressions:
+        print(f">>> Regression: {regression}")
+    print(f">>> {len(regressions)} regression(s) beyond {tolerance:.0%}.")
+    return not regressions
+
+
+def profile_edb_memory(scheme_name: str,
+                       db_path: str = None,
+                       *,
+                       config_path: str = None,
+                       edb_path: str = None):
+    """ Build the encrypted database of the database (json), or load the serialized one, and print its memory footprint
+    """
+    try:
+        db = None
+        if db_path is not None:
+            with open(db_path, "r") as f:
+                db = convert_database_keyword_to_bytes(json.load(f))
+        config_dict = read_config(config_path) if config_path is not None else None
+        edb_bytes = None
+        if edb_path is not None:
+            with open(edb_path, "rb") as f:
+                edb_bytes = f.read()
+        report = profile_memory(scheme_name, db, config_dict=config_dict, edb_bytes=edb_bytes)
+    except Exception as e:
+        print(f">>> Profile error: {e}")
+        return
+
+    for component in report.components:
+        print(f">>> {component.name}: {component.deep_bytes} bytes, raw {component.raw_bytes} bytes, "
+              f"overhead {component.overhead_bytes} bytes in {component.object_count} objects")
+    print(f">>> Total: {report.deep_bytes} bytes, {report.overhead_ratio:.2f}x of the raw {report.raw_bytes} bytes")
+    if report.bytes_per_posting is not None:
+        print(f">>> {report.bytes_per_posting:.1f} bytes per posting")
+    print(f">>> {'Loading' if edb_path is not None else 'Building'} took {report.build_seconds:.3f} s, "
+          f"traced peak {report.traced_peak_bytes} bytes, retained {report.traced_retained_bytes} bytes")
+
+
+def measure_search_io(db_path: str,
+                      *,
+                      scheme_names: typing.Iterable[str] = ALL_SCHEMES,
+                      query_count: int = 100,
+                      page_size: int = DEFAULT_PAGE_SIZE):
+    """ Place the encrypted database of the database (json) of each scheme on a simulated block device,
+    and print the mean I/O of the searches of query_count random keywords
+    """
+    try:
+        with open(db_path, "r") as f:
+            db = convert_database_keyword_to_bytes(json.load(f))
+        queries = random.sample(list(db), min(query_count, len(db)))
+    except Exception as e:
+        print(f">>> Measure error: {e}")
+        return
+
+    for scheme_name in scheme_names:
+        try:
+            reports = measure_io(scheme_name, db, queries, page_size=page_size)
+        except Exception as e:
+            print(f">>> {scheme_name}: failed, {e}")
+            continue
+        efficiency_list = [report.read_efficiency for report in reports if report.read_efficiency is not None]
+        print(f">>> {scheme_name}: "
+              f"{sum(report.pages_touched for report in reports) / len(reports):.1f} pages, "
+              f"{sum(report.contiguous_reads for report in reports) / len(reports):.1f} contiguous reads, "
+              f"read efficiency {sum(efficiency_list) / max(len(efficiency_list), 1):.1f} per query")
+
+
+def generate_workload(db_path: str,
+                      keyword_count: int,
+                      total_size: int,
+                      *,
+                      exponent: float = 1.0,
+                      identifier_size: int = 8,
+                      identifier_distribution: str = "random",
+                      query_log_path: str = None,
+                      query_count: int = 0,
+                      seed: int = None):
+    """ Generate a synthetic database (json) with Zipfian keyword frequencies, and a Zipfian query log of it
+    """
+    from toolkit.workload import write_zipf_db, write_zipf_query_log
+
+    rng = random.Random(seed)
+    try:
+        written_size = write_zipf_db(db_path, keyword_count, total_size,
+                                     exponent=exponent,
+                                     identifier_size=identifier_size,
+                                     identifier_distribution=identifier_distribution,
+                                     rng=rng)
+        print(f">>> Write a database of {keyword_count} keywords and {written_size} postings to {db_path}.")
+        if query_log_path is not None:
+            write_zipf_query_log(query_log_path, keyword_count, query_count, exponent=exponent, rng=rng)
+            print(f">>> Write a query log of {query_count} queries to {query_log_path}.")
+    except Exception as e:
+        print(f">>> Generate error: {e}")
+
+
 def create_service(config_path: str, sname: str):
     global __client_service
 
@@ -88,6 +298,16 @@ def __search_echo_handler(fut: asyncio.Future, output_format="raw"):
         print(f">>> The result is {output_result_list}.")
 
 
+def __search_many_echo_handler(fut: asyncio.Future, keywords: list, output_format="raw"):
+    global __client_service
+
+    if isinstance(__client_service, Service):
+        for keyword, result in zip(keywords, __client_service.handle_result_batch(fut.result())):
+            output_result_list = [BytesConverter.convert_bytes(identifier_bytes, output_format)
+                                  for identifier_bytes in result.get_result_list()]
+            print(f">>> The result of {keyword} is {output_result_list}.")
+
+
 async def upload_config(*, sid: str = '', sname: str = ''):
     global __client_service
 
@@ -162,7 +382,18 @@ async def upload_encrypted_database(*, sid: str = '', sname: str = ''):
         print(f">>> Upload Encrypted Database error: {e}")
 
 
-async def search(keyword: str, output_format="raw", *, sid: str = '', sname: str = ''):
+async def search(keyword: typing.Union[str, typing.List[str]],
+                 output_format="raw",
+                 *,
+                 sid: str = '',
+                 sname: str = '',
+                 offset: int = 0,
+                 limit: int = None,
+                 operator: str = "and"):
+    """ If offset or limit is given, the result is streamed and printed chunk by chunk.
+    If several keywords are given, the identifiers containing all (operator "and") or any (operator "or")
+    of them are printed, where limit is the maximum number of identifiers.
+    """
     if output_format not in BytesConverter.supported_format:
         print(f">>> Unsupported output format {output_format}.")
         return
@@ -176,7 +407,24 @@ async def search(keyword: str, output_format="raw", *, sid: str = '', sname: str
         __client_service = Service(sid)
 
         try:
+            if not isinstance(keyword, str):
+                keyword_bytes_list = [bytes(each_keyword, encoding="utf-8") for each_keyword in keyword]
+                result = await __client_service.handle_boolean_search(keyword_bytes_list, operator, limit)
+                output_result_list = [BytesConverter.convert_bytes(identifier_bytes, output_format)
+                                      for identifier_bytes in result]
+                print(f">>> {operator.upper()} query result: {output_result_list}")
+                return
+
             keyword_bytes = bytes(keyword, encoding="utf-8")
+            if offset or limit is not None:
+                async for chunk in __client_service.iter_keyword_search_result(keyword_bytes,
+                                                                               offset=offset,
+                                                                               limit=limit):
+                    output_result_list = [BytesConverter.convert_bytes(identifier_bytes, output_format)
+                                          for identifier_bytes in chunk]
+                    print(f">>> {output_result_list}")
+                return
+
             await __client_service.handle_keyword_search(
                 keyword_bytes, wait=True, wait_callback_func=functools.partial(__search_echo_handler,
                                                                                output_format=output_format))
@@ -184,3 +432,30 @@ async def search(keyword: str, output_format="raw", *, sid: str = '', sname: str
             await __client_service.close_service()
     except Exception as e:
         print(f">>> Search error: {e}")
+
+
+async def search_many(keywords: list, output_format="raw", *, sid: str = '', sname: str = ''):
+    """ Search several keywords with one request
+    """
+    if output_format not in BytesConverter.supported_format:
+        print(f">>> Unsupported output format {output_format}.")
+        return
+
+    global __client_service
+
+    try:
+        if not sid:
+            # get sid from sname
+            sid = service_name_handler.get_service_id_by_sname(sname)
+        __client_service = Service(sid)
+
+        try:
+            keyword_bytes_list = [bytes(keyword, encoding="utf-8") for keyword in keywords]
+            await __client_service.handle_keyword_search_many(
+                keyword_bytes_list, wait=True, wait_callback_func=functools.partial(__search_many_echo_handler,
+                                                                                    keywords=keywords,
+                                                                                    output_format=output_format))
+        finally:
+            await __client_service.close_service()
+    except Exception as e:
+        print(f">>> Search error: {e}")
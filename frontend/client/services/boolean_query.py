@@ -0,0 +1,158 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: boolean_query.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Conjunctive (AND) and disjunctive (OR) queries over single-keyword streamed searches
+
+The executors only depend on a function opening the streamed result of a keyword,
+i.e. an async iterator of identifier chunks, which is closed (aclose) when the executor stops early.
+"""
+import asyncio
+import math
+import typing
+
+__all__ = [
+    "QUERY_OPERATORS",
+    "order_keywords_by_size",
+    "conjunctive_query",
+    "disjunctive_query",
+]
+
+QUERY_OPERATORS = ("and", "or")
+
+ChunkStream = typing.AsyncIterator[typing.List[bytes]]
+OpenStream = typing.Callable[[bytes], ChunkStream]
+
+
+def order_keywords_by_size(keywords: typing.Iterable[bytes],
+                           keyword_sizes: typing.Optional[typing.Mapping[bytes, int]] = None,
+                           reverse: bool = False) -> typing.List[bytes]:
+    """ Remove the duplicated keywords and sort them by the sizes of their lists (ascending by default).
+    The keywords whose sizes are unknown are put at the end.
+    """
+    keywords = list(dict.fromkeys(keywords))
+    if keyword_sizes is None:
+        return keywords
+    known = sorted((keyword for keyword in keywords if keyword in keyword_sizes),
+                   key=keyword_sizes.__getitem__, reverse=reverse)
+    return known + [keyword for keyword in keywords if keyword not in keyword_sizes]
+
+
+async def _close_stream(stream: ChunkStream):
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+async def _confirm_candidates(stream: ChunkStream, candidates: typing.FrozenSet[bytes]) -> typing.Set[bytes]:
+    """ Return the candidates appearing in the stream.
+    The stream is stopped as soon as all candidates are confirmed.
+    """
+    confirmed = set()
+    try:
+        async for chunk in stream:
+            confirmed.update(identifier for identifier in chunk if identifier in candidates)
+            if len(confirmed) == len(candidates):
+                break
+    finally:
+        await _close_stream(stream)
+    return confirmed
+
+
+async def conjunctive_query(keywords: typing.Iterable[bytes],
+                            open_stream: OpenStream,
+                            keyword_sizes: typing.Optional[typing.Mapping[bytes, int]] = None) -> typing.List[bytes]:
+    """ The identifiers contained in the lists of all keywords, in the order of the smallest list.
+    The smallest list (by keyword_sizes) is fetched firstly as the candidates,
+    and then the other lists are streamed concurrently, each one stops once all candidates are confirmed,
+    and all of them stop once no candidate is left.
+    :param keyword_sizes: (Optional) The sizes of the keyword lists, e.g. recorded when encrypting the database.
+    A keyword not in it is regarded as not existing, so the result is empty without any search.
+    """
+    keywords = order_keywords_by_size(keywords, keyword_sizes)
+    if not keywords:
+        return []
+    if keyword_sizes is not None and any(keyword_sizes.get(keyword, 0) == 0 for keyword in keywords):
+        return []
+
+    candidate_list = []
+    first_stream = open_stream(keywords[0])
+    try:
+        async for chunk in first_stream:
+            candidate_list.extend(chunk)
+    finally:
+        await _close_stream(first_stream)
+
+    candidates = frozenset(candidate_list)
+    tasks = [asyncio.create_task(_confirm_candidates(open_stream(keyword), candidates)) for keyword in keywords[1:]]
+    try:
+        for finished_task in asyncio.as_completed(tasks):
+            candidates = candidates & await finished_task
+            if not candidates:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [identifier for identifier in dict.fromkeys(candidate_list) if identifier in candidates]
+
+
+async def _pump_stream(stream: ChunkStream, queue: asyncio.Queue):
+    try:
+        async for chunk in stream:
+            await queue.put(chunk)
+    finally:
+        await queue.put(None)  # end of the stream
+        await _close_stream(stream)
+
+
+async def disjunctive_query(keywords: typing.Iterable[bytes],
+                            open_stream: OpenStream,
+                            keyword_sizes: typing.Optional[typing.Mapping[bytes, int]] = None,
+                            limit: typing.Optional[int] = None) -> typing.AsyncIterator[typing.List[bytes]]:
+    """ Yield the identifiers contained in the list of any keyword, chunk by chunk, without duplicates.
+    The lists are streamed concurrently and merged in the order of arrival,
+    and all streams stop once limit identifiers are yielded.
+    The keywords of known empty lists are skipped, and the largest lists are opened firstly.
+    """
+    if limit is not None and limit <= 0:
+        return
+    keywords = [keyword for keyword in order_keywords_by_size(keywords, keyword_sizes, reverse=True)
+                if keyword_sizes is None or keyword_sizes.get(keyword, 0) > 0]
+    if not keywords:
+        return
+
+    queue = asyncio.Queue()
+    tasks = [asyncio.create_task(_pump_stream(open_stream(keyword), queue)) for keyword in keywords]
+    seen = set()
+    remaining = math.inf if limit is None else limit
+    try:
+        running_count = len(tasks)
+        while running_count:
+            chunk = await queue.get()
+            if chunk is None:
+                running_count -= 1
+                continue
+            new_identifiers = []
+            for identifier in chunk:
+                if identifier not in seen:
+                    seen.add(identifier)
+                    new_identifiers.append(identifier)
+                    if len(new_identifiers) == remaining:
+                        break
+            if new_identifiers:
+                remaining -= len(new_identifiers)
+                yield new_identifiers
+            if remaining == 0:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -14,6 +14,7 @@ import json
 import pathlib
 import pickle
 import shutil
+import typing
 
 _PROGRAM_DIR_PATH = pathlib.Path.home().joinpath(".sse/client/")
 _PROGRAM_PATH = pathlib.Path(_PROGRAM_DIR_PATH)
@@ -68,6 +69,20 @@ def delete_encrypted_database(sid: str):
     edb_path.unlink(missing_ok=True)
 
 
+def read_keyword_sizes(sid: str) -> typing.Optional[dict]:
+    """ The sizes of the keyword lists recorded when encrypting the database, or None if not recorded
+    """
+    sizes_path = _PROGRAM_PATH.joinpath(sid).joinpath("keyword_sizes")
+    if not sizes_path.exists():
+        return None
+    return pickle.loads(sizes_path.read_bytes())
+
+
+def write_keyword_sizes(sid: str, keyword_sizes: dict):
+    with open(_PROGRAM_PATH.joinpath(sid).joinpath("keyword_sizes"), "wb") as f:
+        pickle.dump(keyword_sizes, f)
+
+
 def write_key(sid: str, key_bytes: bytes):
     with open(_PROGRAM_PATH.joinpath(sid).joinpath("key"), "wb") as f:
         f.write(key_bytes)
@@ -19,6 +19,7 @@ import hashlib
 import itertools
 import os
 import pickle
+import typing
 
 import websockets
 import websockets.client
@@ -26,7 +27,8 @@ from websockets.exceptions import InvalidURI, InvalidHandshake
 
 import frontend.client.services.file_manager as FileManager
 import schemes
-from frontend.common.constants import MsgType
+from frontend.client.services.boolean_query import conjunctive_query, disjunctive_query, QUERY_OPERATORS
+from frontend.common.constants import MsgType, DEFAULT_RESULT_CHUNK_SIZE
 from frontend.common.utils import shorten_sid
 # bits represents status
 from frontend.constants import KEY_TYPE, KEY_SID, TYPE_INIT
@@ -171,6 +173,8 @@ class Service:
             MsgType.CONFIG: self.handle_upload_config_echo,
             MsgType.UPLOAD_DB: self.handle_upload_encrypted_database_echo,
             MsgType.RESULT: self.handle_result,
+            MsgType.RESULT_BATCH: self.handle_result_batch,
+            MsgType.RESULT_CHUNK: self.handle_result_chunk,
             MsgType.CONTROL: self.handle_control_message,
         }
 
@@ -181,6 +185,8 @@ class Service:
 
         self.echo_futures = {}
         self.result_futures = {}
+        self.stream_result_futures = {}  # token digest -> future of the raw message dict
+        self.result_chunk_queues = {}  # token digest -> queue of the raw RESULT_CHUNK message dicts
         logger.info(f"Create a service {self.short_sid} successfully.")
 
     @property
@@ -288,6 +294,22 @@ class Service:
                     fut.set_result(content_byte)
                 self.result_futures[token_digest] = []
 
+                stream_fut = self.stream_result_futures.pop(token_digest, None)
+                if stream_fut is not None:
+                    stream_fut.set_result(message_dict)
+
+            # result chunk handler
+            if msg_type == MsgType.RESULT_CHUNK:
+                chunk_queue = self.result_chunk_queues.get(message_dict.get("token_digest"))
+                if chunk_queue is not None:
+                    chunk_queue.put_nowait(message_dict)
+
+            # batch result future handler
+            if msg_type == MsgType.RESULT_BATCH:
+                batch_digest = message_dict.get("token_digest")
+                for fut in self.result_futures.pop(batch_digest, []):
+                    fut.set_result(content_byte)
+
     def _load_sse_module(self):
         """load SSE module by service config.
         service config must have scheme attribute
@@ -497,6 +519,8 @@ class Service:
         self._load_sse_key()
         self.edb = self.sse_scheme.EDBSetup(self.key, database)
         FileManager.write_encrypted_database(self.sid, self.edb.serialize())
+        # The sizes are kept on the client only, for ordering the work of boolean queries
+        FileManager.write_keyword_sizes(self.sid, {keyword: len(database[keyword]) for keyword in database})
         self.set_current_service_state(ClientServiceState.set_db_encrypted(self.get_current_service_state(), True))
         self._store_service_meta()
 
@@ -532,7 +556,12 @@ class Service:
             fut.add_done_callback(wait_callback_func)
             self.register_upload_echo_future_once(MsgType.UPLOAD_DB, fut)
 
-        await self._send_message(MsgType.UPLOAD_DB, self.edb.serialize())
+        # The server maps an EDB container and searches it in place, so upload it as a container if supported
+        if self.edb.supports_container():
+            edb_bytes = self.edb.serialize_container()
+        else:
+            edb_bytes = self.edb.serialize()
+        await self._send_message(MsgType.UPLOAD_DB, edb_bytes)
         logger.info(f"[{self.short_sid}] Uploading encrypted database.")
 
         if wait:
@@ -551,6 +580,10 @@ class Service:
         self._load_sse_scheme()
         self._load_sse_key()
 
+        if hasattr(self.sse_scheme, "TokenGenStream"):
+            await self._keyword_search_by_token_stream(keyword, wait, wait_callback_func)
+            return
+
         fut = None
         if wait:
             if wait_callback_func is None:
@@ -574,6 +607,178 @@ class Service:
         if wait:
             await asyncio.wait_for(fut, 60)
 
+    async def _keyword_search_by_token_stream(self, keyword: bytes,
+                                              wait=False,
+                                              wait_callback_func=None):
+        """ Send the token segment by segment,
+        and stop once the server replies that the search is finished.
+        """
+        result_list = []
+        for token in self.sse_scheme.TokenGenStream(self.key, keyword):
+            token_bytes = token.serialize()
+            token_digest = hashlib.sha256(token_bytes).digest()
+
+            fut = asyncio.get_running_loop().create_future()
+            self.stream_result_futures[token_digest] = fut
+            await self._send_message(MsgType.TOKEN,
+                                     token_bytes,
+                                     token_digest=token_digest,
+                                     stream=True)
+            logger.info(f"[{self.short_sid}] Uploading a segment of the search token.")
+
+            message_dict = await asyncio.wait_for(fut, 60)
+            partial_result = self.sse_module_loader.SSEResult.deserialize(message_dict.get("content"),
+                                                                          self.config_object)
+            result_list.extend(partial_result.get_result_list())
+            if message_dict.get("stream_finished", True):
+                break
+
+        result = self.sse_module_loader.SSEResult(result_list, self.config_object)
+        if wait:
+            if wait_callback_func is None:
+                wait_callback_func = self.handle_result_future
+            fut = asyncio.get_running_loop().create_future()
+            fut.set_result(result.serialize())
+            wait_callback_func(fut)
+
+    async def iter_keyword_search_result(self, keyword: bytes,
+                                         *,
+                                         offset: int = 0,
+                                         limit: typing.Optional[int] = None,
+                                         chunk_size: int = DEFAULT_RESULT_CHUNK_SIZE
+                                         ) -> typing.AsyncIterator[typing.List[bytes]]:
+        """Search a keyword and yield the identifiers chunk by chunk as soon as the server sends them.
+        Only the identifiers in [offset, offset + limit) of the result are sent.
+        If the caller stops iterating early, the server is asked to stop sending the remaining chunks.
+        """
+        await self.load_websocket()
+
+        if not ClientServiceState.is_db_uploaded(self.get_current_service_state()):
+            reason = f"The database of service {self.short_sid} has not been uploaded."
+            logger.error(reason)
+            raise ValueError(reason)
+
+        self._load_sse_scheme()
+        self._load_sse_key()
+
+        token_bytes = self.sse_scheme.TokenGen(self.key, keyword).serialize()
+        async for chunk in self._iter_search_result_by_token(token_bytes,
+                                                             offset=offset,
+                                                             limit=limit,
+                                                             chunk_size=chunk_size):
+            yield chunk
+
+    async def _iter_search_result_by_token(self, token_bytes: bytes,
+                                           *,
+                                           offset: int = 0,
+                                           limit: typing.Optional[int] = None,
+                                           chunk_size: int = DEFAULT_RESULT_CHUNK_SIZE
+                                           ) -> typing.AsyncIterator[typing.List[bytes]]:
+        token_digest = hashlib.sha256(token_bytes).digest()
+        chunk_queue = asyncio.Queue()
+        self.result_chunk_queues[token_digest] = chunk_queue
+
+        is_finished = False
+        try:
+            await self._send_message(MsgType.TOKEN,
+                                     token_bytes,
+                                     token_digest=token_digest,
+                                     stream_result=True,
+                                     offset=offset,
+                                     limit=limit,
+                                     chunk_size=chunk_size)
+            logger.info(f"[{self.short_sid}] Uploading search token for a streamed result.")
+
+            while not is_finished:
+                message_dict = await asyncio.wait_for(chunk_queue.get(), 60)
+                is_finished = message_dict.get("last", True)
+                content = pickle.loads(message_dict.get("content"))
+                if isinstance(content, dict):  # error echo
+                    reason = f"[{self.short_sid}] Search error, reason: {content.get('reason', '')}"
+                    logger.error(reason)
+                    raise ValueError(reason)
+                if content:
+                    yield content
+        finally:
+            self.result_chunk_queues.pop(token_digest, None)
+            if not is_finished:
+                await self._send_message(MsgType.STOP_STREAM, b"", token_digest=token_digest)
+
+    async def handle_boolean_search(self, keywords: typing.List[bytes],
+                                    operator: str = "and",
+                                    limit: typing.Optional[int] = None) -> typing.List[bytes]:
+        """Search the identifiers containing all (operator "and") or any (operator "or") of the keywords.
+        The tokens of all keywords are generated at once, and the results are streamed,
+        intersected or united incrementally, and stopped early, see boolean_query.
+        """
+        if operator not in QUERY_OPERATORS:
+            raise ValueError(f"Unsupported operator {operator}, it should be one of {', '.join(QUERY_OPERATORS)}.")
+
+        await self.load_websocket()
+
+        if not ClientServiceState.is_db_uploaded(self.get_current_service_state()):
+            reason = f"The database of service {self.short_sid} has not been uploaded."
+            logger.error(reason)
+            raise ValueError(reason)
+
+        self._load_sse_scheme()
+        self._load_sse_key()
+
+        keywords = list(dict.fromkeys(keywords))
+        token_bytes_map = {keyword: token.serialize()
+                           for keyword, token in zip(keywords, self.sse_scheme.TokenGenMany(self.key, keywords))}
+        keyword_sizes = FileManager.read_keyword_sizes(self.sid)
+
+        def _open_stream(keyword: bytes):
+            return self._iter_search_result_by_token(token_bytes_map[keyword])
+
+        if operator == "and":
+            result = await conjunctive_query(keywords, _open_stream, keyword_sizes)
+            if limit is not None:
+                result = result[:limit]
+        else:
+            result = []
+            async for chunk in disjunctive_query(keywords, _open_stream, keyword_sizes, limit):
+                result.extend(chunk)
+        logger.info(f"[{self.short_sid}] The {operator.upper()} query of {len(keywords)} keywords "
+                    f"returns {len(result)} identifiers.")
+        return result
+
+    async def handle_keyword_search_many(self, keywords: typing.List[bytes],
+                                         wait=False,
+                                         wait_callback_func=None):
+        """Search several keywords with a single TOKEN_BATCH message.
+        The content of the reply is a pickled list of serialized results, in the order of the keywords."""
+        await self.load_websocket()
+
+        if not ClientServiceState.is_db_uploaded(self.get_current_service_state()):
+            reason = f"The database of service {self.short_sid} has not been uploaded."
+            logger.error(reason)
+            raise ValueError(reason)
+
+        self._load_sse_scheme()
+        self._load_sse_key()
+
+        token_bytes_list = [token.serialize() for token in self.sse_scheme.TokenGenMany(self.key, keywords)]
+        batch_digest = hashlib.sha256(b"".join(hashlib.sha256(token_bytes).digest()
+                                               for token_bytes in token_bytes_list)).digest()
+
+        fut = None
+        if wait:
+            if wait_callback_func is None:
+                wait_callback_func = self.handle_result_batch_future
+            fut = asyncio.get_running_loop().create_future()
+            fut.add_done_callback(wait_callback_func)
+            self.register_result_future_once(batch_digest, fut)
+
+        await self._send_message(MsgType.TOKEN_BATCH,
+                                 pickle.dumps(token_bytes_list),
+                                 token_digest=batch_digest)
+        logger.info(f"[{self.short_sid}] Uploading a batch of {len(token_bytes_list)} search tokens.")
+
+        if wait:
+            await asyncio.wait_for(fut, 60)
+
     def handle_result(self, result_bytes: bytes):
         result = self.sse_module_loader.SSEResult.deserialize(result_bytes, self.config_object)
         logger.info(f"[{self.short_sid}] The result is {result}.")
@@ -584,6 +789,24 @@ class Service:
         result = self.sse_module_loader.SSEResult.deserialize(content, self.config_object)
         logger.info(f"[{self.short_sid}] The result is {result}.")
 
+    def handle_result_chunk(self, result_chunk_bytes: bytes):
+        logger.debug(f"[{self.short_sid}] Receive a result chunk of {len(result_chunk_bytes)} bytes.")
+
+    def handle_result_batch(self, result_batch_bytes: bytes):
+        content = pickle.loads(result_batch_bytes)
+        if isinstance(content, dict) and not content.get("ok", False):
+            logger.error(f"[{self.short_sid}] Search error, reason: {content.get('reason', '')}")
+            return []
+
+        ResultClass = self.sse_module_loader.SSEResult
+        result_list = [ResultClass.deserialize(result_bytes, self.config_object) for result_bytes in content]
+        logger.info(f"[{self.short_sid}] Receive a batch of {len(result_list)} results.")
+        return result_list
+
+    def handle_result_batch_future(self, fut: asyncio.Future):
+        for result in self.handle_result_batch(fut.result()):
+            logger.info(f"[{self.short_sid}] The result is {result}.")
+
     def handle_control_message(self, msg_bytes: bytes):
         msg_str = msg_bytes.decode(encoding='utf8')
         logger.warning(f"[{self.short_sid}] Receive control message: {msg_str}.")
@@ -23,5 +23,16 @@ class MsgType:
     # for search request
     TOKEN = "token"
     RESULT = "result"
+    # for a batch of search requests, the content is a pickled list of tokens (results)
+    TOKEN_BATCH = "token_batch"
+    RESULT_BATCH = "result_batch"
+    # for a streamed search, the result is sent in chunks, each chunk is a pickled list of identifiers
+    RESULT_CHUNK = "result_chunk"
+    # the client asks the server to stop sending the chunks of a streamed search
+    STOP_STREAM = "stop_stream"
     # for debug
     CONTROL = "control"
+
+
+# The default number of identifiers in one RESULT_CHUNK message
+DEFAULT_RESULT_CHUNK_SIZE = 1024
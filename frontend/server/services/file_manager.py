@@ -14,6 +14,9 @@ import json
 import pathlib
 import pickle
 import shutil
+import typing
+
+from data_persistence.edb_container import EDBContainer, CONTAINER_MAGIC, is_container
 
 _PROGRAM_DIR_PATH = pathlib.Path.home().joinpath(".sse")
 _PROGRAM_PATH = pathlib.Path(_PROGRAM_DIR_PATH)
@@ -64,6 +67,18 @@ def read_encrypted_database(sid: str) -> bytes:
     return edb_bytes
 
 
+def open_encrypted_database_container(sid: str) -> typing.Optional[EDBContainer]:
+    """ Map the encrypted database into memory if it is stored as an EDB container,
+    return None if it is a serialized one.
+    The caller closes the container after releasing the database loaded from it.
+    """
+    edb_path = _PROGRAM_PATH.joinpath(sid).joinpath("edb")
+    with open(edb_path, "rb") as f:
+        if not is_container(f.read(len(CONTAINER_MAGIC))):
+            return None
+    return EDBContainer.open(edb_path)
+
+
 def write_encrypted_database(sid: str, edb_bytes: bytes):
     service_dir_path = _PROGRAM_PATH.joinpath(sid)
     if not service_dir_path.exists():
@@ -14,9 +14,11 @@ LIB-SSE CODE
 """
 import abc
 import asyncio
+import functools
+import itertools
 import pickle
 
-from frontend.common.constants import MsgType
+from frontend.common.constants import MsgType, DEFAULT_RESULT_CHUNK_SIZE
 from frontend.common.utils import shorten_sid
 from frontend.server.services.comm import send_message
 from toolkit.logger.logger import getSSELogger
@@ -24,6 +26,7 @@ from websockets.legacy.server import WebSocketServerProtocol
 
 import frontend.server.services.file_manager as FileManager
 import schemes
+from global_config import ServerConfig
 
 logger = getSSELogger("sse_server")
 
@@ -76,6 +79,9 @@ class Service:
         self.sse_scheme = None
         self.sse_module_loader = None
         self.edb = None
+        self.edb_container = None  # the memory map of the database, if the database is loaded from an EDB container
+        self.search_pool = None  # the workers of SearchParallel, created once for all the queries of the service
+        self.result_stream_tasks = {}  # token digest -> set of the tasks sending the result chunks
 
         if FileManager.check_sid_folder_exist(sid):
             self.config = FileManager.read_service_config(sid)
@@ -88,7 +94,9 @@ class Service:
         self.recv_msg_handler = {
             MsgType.CONFIG: self.handle_upload_config,
             MsgType.UPLOAD_DB: self.handle_upload_encrypted_database,
-            MsgType.TOKEN: self.handle_search_token
+            MsgType.TOKEN: self.handle_search_token,
+            MsgType.TOKEN_BATCH: self.handle_search_token_batch,
+            MsgType.STOP_STREAM: self.handle_stop_stream
         }
 
         if self.get_current_service_state() == SERVICE_STATE.ALL_READY:
@@ -165,11 +173,45 @@ class Service:
         self._load_sse_module()
         self._load_config_object()
 
-        edb_bytes = FileManager.read_encrypted_database(self.sid)
         EDBClass = self.sse_module_loader.SSEEncryptedDatabase
-        self.edb = EDBClass.deserialize(edb_bytes, self.config_object)
+        self.edb_container = FileManager.open_encrypted_database_container(self.sid)
+        if self.edb_container is not None:  # searched in place through the memory map, without deserializing
+            self.edb = EDBClass.from_container(self.edb_container, self.config_object)
+        else:
+            edb_bytes = FileManager.read_encrypted_database(self.sid)
+            self.edb = EDBClass.deserialize(edb_bytes, self.config_object)
         logger.info(f"Load SSE encrypted database for service {self.short_sid} successfully.")
 
+    def _release_sse_encrypted_database(self):
+        """Release the loaded database and close its EDB container (if any),
+        the components of the database are views of the memory map, so they are released first"""
+        self._terminate_search_pool()
+        self.edb = None
+        if self.edb_container is None:
+            return
+        try:
+            self.edb_container.close()
+        except BufferError:
+            # a search (e.g. a cancelled result stream) still holds a view,
+            # the map is then unmapped when the last view is garbage-collected
+            logger.warning(f"The EDB container of service {self.short_sid} is still in use.")
+        self.edb_container = None
+
+    def _get_search_pool(self):
+        """Lazily create the pool of SearchParallel, whose workers are forked once and inherit the loaded database,
+        instead of forking the workers for each query from the event loop.
+        @note The SSE encrypted database needs to be loaded in advance
+        """
+        if self.search_pool is None:
+            self.search_pool = self.sse_scheme.CreateSearchPool(self.edb, ServerConfig.SEARCH_WORKER_COUNT_PER_QUERY)
+        return self.search_pool
+
+    def _terminate_search_pool(self):
+        if self.search_pool is not None:
+            self.search_pool.terminate()
+            self.search_pool.join()
+            self.search_pool = None
+
     def get_current_service_state(self):
         return self.service_meta["state"]
 
@@ -211,24 +253,25 @@ class Service:
             logger.error(reason)
             raise ValueError(reason)
 
+        self._release_sse_encrypted_database()  # the mapped file cannot be truncated
         FileManager.write_encrypted_database(self.sid, edb_bytes)
         self.service_meta["state"] = SERVICE_STATE.ALL_READY
         FileManager.write_service_meta(self.sid, self.service_meta)
         self.send_message(MsgType.UPLOAD_DB, pickle.dumps({"ok": True}))
         logger.info(f"Store encrypted database for service {self.short_sid} successfully.")
 
-    def handle_search_token(self, token_bytes: bytes, raw_msg_dict: dict):
-        logger.info(f"Receive search token from service {self.short_sid}.")
-
+    def _prepare_for_search(self, reply_msg_type: str, **additional_field):
+        """Check that the service is ready for searching, and lazily load the SSE scheme and database.
+        If not ready, reply the reason with the given message type (and additional fields) and raise ValueError."""
         if self.get_current_service_state() == SERVICE_STATE.NOT_EXISTS:
             reason = f"The config of service {self.short_sid} has not been uploaded."
-            self.send_message(MsgType.RESULT, pickle.dumps({"ok": False, "reason": reason}))
+            self.send_message(reply_msg_type, pickle.dumps({"ok": False, "reason": reason}), **additional_field)
             logger.error(reason)
             raise ValueError(reason)
 
         if self.get_current_service_state() == SERVICE_STATE.CONFIG_UPLOADED_BUT_EDB_NOT_UPLOADED:
             reason = f"The encrypted database of service {self.short_sid} has not been uploaded."
-            self.send_message(MsgType.RESULT, pickle.dumps({"ok": False, "reason": reason}))
+            self.send_message(reply_msg_type, pickle.dumps({"ok": False, "reason": reason}), **additional_field)
             logger.error(reason)
             raise ValueError(reason)
 
@@ -236,13 +279,103 @@ class Service:
         self._load_sse_scheme()
         self._load_sse_encrypted_database()
 
+    def handle_search_token(self, token_bytes: bytes, raw_msg_dict: dict):
+        logger.info(f"Receive search token from service {self.short_sid}.")
         tk_digest = raw_msg_dict.get("token_digest")
+        if raw_msg_dict.get("stream_result"):
+            self._prepare_for_search(MsgType.RESULT_CHUNK, token_digest=tk_digest, last=True)
+        else:
+            self._prepare_for_search(MsgType.RESULT)
+
         tk_object = self.sse_module_loader.SSEToken.deserialize(token_bytes, self.config_object)
-        result = self.sse_scheme.Search(self.edb, tk_object)
-        self.send_message(MsgType.RESULT, content=result.serialize(), token_digest=tk_digest)
+        if raw_msg_dict.get("stream_result"):
+            # The result is sent in chunks by a task, so that the stop message can be handled meanwhile
+            task = asyncio.create_task(self._send_result_chunks(tk_object, tk_digest, raw_msg_dict))
+            self.result_stream_tasks.setdefault(tk_digest, set()).add(task)
+            task.add_done_callback(functools.partial(self._discard_result_stream_task, tk_digest))
+        elif raw_msg_dict.get("stream") and hasattr(self.sse_scheme, "SearchPartial"):
+            # The token is a segment of a token stream,
+            # tell the client whether it can stop sending the remaining segments
+            result, is_finished = self.sse_scheme.SearchPartial(self.edb, tk_object)
+            self.send_message(MsgType.RESULT, content=result.serialize(), token_digest=tk_digest,
+                              stream_finished=is_finished)
+        elif ServerConfig.SEARCH_WORKER_COUNT_PER_QUERY > 1:
+            result = self.sse_scheme.SearchParallel(self.edb, tk_object, ServerConfig.SEARCH_WORKER_COUNT_PER_QUERY,
+                                                    self._get_search_pool())
+            self.send_message(MsgType.RESULT, content=result.serialize(), token_digest=tk_digest)
+        else:
+            result = self.sse_scheme.Search(self.edb, tk_object)
+            self.send_message(MsgType.RESULT, content=result.serialize(), token_digest=tk_digest)
         logger.info(f"Search for service {self.short_sid} successfully.")
 
+    async def _send_result_chunks(self, tk_object, tk_digest, raw_msg_dict: dict):
+        """Send the identifiers in [offset, offset + limit) of the result in RESULT_CHUNK messages,
+        the last message has the field last=True.
+        The identifiers are produced lazily by SearchIter, so the first chunk is sent before the search finishes.
+        """
+        offset = raw_msg_dict.get("offset") or 0
+        limit = raw_msg_dict.get("limit")
+        chunk_size = raw_msg_dict.get("chunk_size") or DEFAULT_RESULT_CHUNK_SIZE
+        result_iter = itertools.islice(self.sse_scheme.SearchIter(self.edb, tk_object),
+                                       offset,
+                                       None if limit is None else offset + limit)
+
+        chunk_count = 0
+        try:
+            while True:
+                chunk = list(itertools.islice(result_iter, chunk_size))
+                is_last = len(chunk) < chunk_size
+                # wait for sending, so that other messages (e.g. STOP_STREAM) can be handled between chunks
+                await send_message(self.websocket, self.sid, MsgType.RESULT_CHUNK, pickle.dumps(chunk),
+                                   token_digest=tk_digest, last=is_last)
+                chunk_count += 1
+                if is_last:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # reply the error as the last chunk, otherwise the client waits for it until timeout
+            reason = f"Search error of service {self.short_sid}: {e}"
+            logger.error(reason)
+            self.send_message(MsgType.RESULT_CHUNK, pickle.dumps({"ok": False, "reason": reason}),
+                              token_digest=tk_digest, last=True)
+            return
+        logger.info(f"Send {chunk_count} result chunks for service {self.short_sid} successfully.")
+
+    def _discard_result_stream_task(self, tk_digest, task: asyncio.Task):
+        tasks = self.result_stream_tasks.get(tk_digest)
+        if tasks is None:
+            return
+        tasks.discard(task)
+        if not tasks:
+            del self.result_stream_tasks[tk_digest]
+
+    def handle_stop_stream(self, content_bytes: bytes, raw_msg_dict: dict):
+        # the streams of the same token cannot be told apart by the client, so all of them are stopped
+        tasks = self.result_stream_tasks.pop(raw_msg_dict.get("token_digest"), set())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            logger.info(f"Stop sending result chunks for service {self.short_sid}.")
+
+    def handle_search_token_batch(self, token_batch_bytes: bytes, raw_msg_dict: dict):
+        """The content is a pickled list of serialized tokens,
+        and the reply is a pickled list of serialized results in the same order."""
+        logger.info(f"Receive a batch of search tokens from service {self.short_sid}.")
+        self._prepare_for_search(MsgType.RESULT_BATCH)
+
+        batch_digest = raw_msg_dict.get("token_digest")
+        TokenClass = self.sse_module_loader.SSEToken
+        tk_object_list = [TokenClass.deserialize(token_bytes, self.config_object)
+                          for token_bytes in pickle.loads(token_batch_bytes)]
+        result_list = self.sse_scheme.SearchMany(self.edb, tk_object_list)
+        self.send_message(MsgType.RESULT_BATCH,
+                          content=pickle.dumps([result.serialize() for result in result_list]),
+                          token_digest=batch_digest)
+        logger.info(f"Search a batch of {len(tk_object_list)} tokens for service {self.short_sid} successfully.")
+
     def close_service(self):
+        self._release_sse_encrypted_database()
         self._store_service_meta()
 
     async def wait_closed(self):
@@ -12,3 +12,5 @@ class ClientConfig:
 class ServerConfig:
     HOST = ""
     PORT = 8001
+    # The maximum number of worker processes a single search can be split across, 1 to search sequentially
+    SEARCH_WORKER_COUNT_PER_QUERY = 1
@@ -24,13 +24,122 @@ async def cli():
 @cli.command()
 @click.option("--scheme", help='name of SSE scheme')
 @click.option("--save-path", help='save file path')
-async def generate_config(scheme, save_path):
+@click.option("--db-path", help='if given, the parameters are tuned for the database (json) by the cost model',
+              default=None)
+@click.option("--calibrate", help='calibrate the cost model on this machine before tuning', is_flag=True)
+@click.option("--check-sample", help='check the prediction on a sample build of CHECK_SAMPLE keywords', default=0,
+              type=int)
+async def generate_config(scheme, save_path, db_path, calibrate, check_sample):
     if scheme is None or save_path is None:
         click.echo(f'Incomplete options')
         return
+    if db_path is not None:
+        client_commands.generate_tuned_config(scheme, save_path, db_path,
+                                              calibrate=calibrate, check_sample_size=check_sample)
+        return
     client_commands.generate_default_config(scheme, save_path)
 
 
+@cli.command()
+@click.option("--db-path", help='file path of the database (json)')
+@click.option("--query-log", help='file path of the query log, one keyword per line', default=None)
+@click.option("--scheme", help='scheme to benchmark, can be given multiple times, all schemes if not given',
+              multiple=True)
+@click.option("--sample-size", help='the number of sampled keywords', default=200, type=int)
+@click.option("--metric", help='the metric to recommend a scheme by', default="p99_search_seconds",
+              type=click.Choice(["p50_search_seconds", "p99_search_seconds",
+                                 "edb_bytes_per_posting", "setup_postings_per_second"]))
+async def advise(db_path, query_log, scheme, sample_size, metric):
+    if db_path is None:
+        click.echo(f'Incomplete options: --db-path')
+        return
+    client_commands.advise_scheme(db_path, query_log, scheme_names=scheme or client_commands.ALL_SCHEMES,
+                                  sample_keyword_count=sample_size, metric=metric)
+
+
+@cli.command()
+@click.option("--output", help='file path to save the results (json)')
+@click.option("--scheme", help='scheme to benchmark, can be given multiple times, all schemes if not given',
+              multiple=True)
+@click.option("--size", help='total size of a database, can be given multiple times', multiple=True, type=int)
+@click.option("--distribution", help='list length distribution, can be given multiple times', multiple=True,
+              type=click.Choice(["uniform", "zipf"]))
+@click.option("--query-count", help='the number of queries of each case', default=100, type=int)
+async def benchmark(output, scheme, size, distribution, query_count):
+    if output is None:
+        click.echo(f'Incomplete options: --output')
+        return
+    client_commands.run_benchmark_suite(output,
+                                        scheme_names=scheme or client_commands.ALL_SCHEMES,
+                                        sizes=size or client_commands.DEFAULT_SIZES,
+                                        distributions=distribution or client_commands.DISTRIBUTIONS,
+                                        query_count=query_count)
+
+
+@cli.command()
+@click.option("--baseline", help='file path of the baseline results')
+@click.option("--current", help='file path of the current results')
+@click.option("--tolerance", help='the tolerated relative slowdown or growth', default=0.2, type=float)
+async def compare_benchmark(baseline, current, tolerance):
+    if baseline is None or current is None:
+        click.echo(f'Incomplete options')
+        return
+    if not client_commands.compare_benchmark_results(baseline, current, tolerance=tolerance):
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.option("--scheme", help='name of SSE scheme')
+@click.option("--db-path", help='file path of the database (json) to build the encrypted database of', default=None)
+@click.option("--config", help='file path of config, the default one for the database if not given', default=None)
+@click.option("--edb-path", help='file path of a serialized encrypted database to load instead of building',
+              default=None)
+async def profile_memory(scheme, db_path, config, edb_path):
+    if scheme is None or (db_path is None and edb_path is None):
+        click.echo(f'Incomplete options')
+        return
+    client_commands.profile_edb_memory(scheme, db_path, config_path=config, edb_path=edb_path)
+
+
+@cli.command()
+@click.option("--db-path", help='file path of the database (json)')
+@click.option("--scheme", help='scheme to measure, can be given multiple times, all schemes if not given',
+              multiple=True)
+@click.option("--query-count", help='the number of random queried keywords', default=100, type=int)
+@click.option("--page-size", help='the page size of the simulated block device', default=4096, type=int)
+async def measure_io(db_path, scheme, query_count, page_size):
+    if db_path is None:
+        click.echo(f'Incomplete options: --db-path')
+        return
+    client_commands.measure_search_io(db_path, scheme_names=scheme or client_commands.ALL_SCHEMES,
+                                      query_count=query_count, page_size=page_size)
+
+
+@cli.command()
+@click.option("--db-path", help='file path to write the database (json)')
+@click.option("--keyword-count", help='the number of distinct keywords', type=int)
+@click.option("--total-size", help='the number of postings', type=int)
+@click.option("--exponent", help='the exponent of the Zipf\'s law', default=1.0, type=float)
+@click.option("--identifier-size", help='the size of file identifier in bytes', default=8, type=int)
+@click.option("--identifier-distribution", help='random identifiers, or numbers of shared documents',
+              default="random", type=click.Choice(["random", "documents"]))
+@click.option("--query-log", help='file path to write a Zipfian query log', default=None)
+@click.option("--query-count", help='the number of queries in the log', default=10000, type=int)
+@click.option("--seed", help='the random seed', default=None, type=int)
+async def generate_workload(db_path, keyword_count, total_size, exponent, identifier_size, identifier_distribution,
+                            query_log, query_count, seed):
+    if db_path is None or keyword_count is None or total_size is None:
+        click.echo(f'Incomplete options')
+        return
+    client_commands.generate_workload(db_path, keyword_count, total_size,
+                                      exponent=exponent,
+                                      identifier_size=identifier_size,
+                                      identifier_distribution=identifier_distribution,
+                                      query_log_path=query_log,
+                                      query_count=query_count,
+                                      seed=seed)
+
+
 @cli.command()
 @click.option("--config", help='file path of config')
 @click.option("--sname", help='service name')
@@ -93,21 +202,54 @@ async def upload_encrypted_database(sid, sname):
 @cli.command()
 @click.option("--sid", help='service id', default='')
 @click.option("--sname", help='service name', default='')
-@click.option("--keyword", help='keyword to search')
+@click.option("--keyword", help='keyword to search, can be given multiple times for an AND/OR query', multiple=True)
+@click.option("--output-format",
+              help='Specify the output format, which currently supports '
+                   'int, hex, raw and utf8, where utf8 format output must require that'
+                   ' the byte string of the file identifier must be converted from a utf8 string',
+              default="raw")
+@click.option("--offset", help='skip the first OFFSET identifiers, the result is streamed if given', default=0, type=int)
+@click.option("--limit", help='return at most LIMIT identifiers, the result is streamed if given', default=None,
+              type=int)
+@click.option("--operator", help='combine multiple keywords by AND or OR', default="and",
+              type=click.Choice(["and", "or"], case_sensitive=False))
+async def search(sid, sname, keyword, output_format, offset, limit, operator):
+    if not keyword:
+        click.echo(f'Incomplete options: --keyword')
+        return
+    if not sid and not sname:
+        click.echo(f'One of the two options --sid or --sname must be assigned')
+        return
+
+    if len(keyword) > 1:
+        if offset:
+            click.echo(f'Option --offset is not supported by a query of multiple keywords')
+            return
+        await client_commands.search(list(keyword), output_format, sid=sid, sname=sname, limit=limit,
+                                     operator=operator.lower())
+        return
+
+    await client_commands.search(keyword[0], output_format, sid=sid, sname=sname, offset=offset, limit=limit)
+
+
+@cli.command()
+@click.option("--sid", help='service id', default='')
+@click.option("--sname", help='service name', default='')
+@click.option("--keyword", help='keyword to search, can be given multiple times', multiple=True)
 @click.option("--output-format",
               help='Specify the output format, which currently supports '
                    'int, hex, raw and utf8, where utf8 format output must require that'
                    ' the byte string of the file identifier must be converted from a utf8 string',
               default="raw")
-async def search(sid, sname, keyword, output_format):
-    if keyword is None:
+async def search_many(sid, sname, keyword, output_format):
+    if not keyword:
         click.echo(f'Incomplete options: --keyword')
         return
     if not sid and not sname:
         click.echo(f'One of the two options --sid or --sname must be assigned')
         return
 
-    await client_commands.search(keyword, output_format, sid=sid, sname=sname)
+    await client_commands.search_many(list(keyword), output_format, sid=sid, sname=sname)
 
 
 if __name__ == '__main__':
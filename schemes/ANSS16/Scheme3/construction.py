@@ -10,16 +10,38 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: Scheme 3 Construction (Construction 5.1) described by Asharov et al. [ANSS16]
 """
-import copy
 import math
+import multiprocessing.pool
 import os
-import random
+import typing
 
 import schemes.interface.inverted_index_sse
 from schemes.ANSS16.Scheme3.config import DEFAULT_CONFIG, PiConfig
 from schemes.ANSS16.Scheme3.structures import PiKey, PiToken, PiEncryptedDatabase, PiResult
 from toolkit.bytes_utils import int_to_bytes, split_bytes_given_slice_len, int_from_bytes
-from toolkit.database_utils import get_total_size, parse_identifiers_from_block_given_entry_count_in_one_block
+from toolkit.database_utils import get_total_size, parse_identifiers_from_block_given_entry_count_in_one_block, \
+    iterate_padded_database, parse_identifiers_from_block_given_identifier_size
+from toolkit.parallel import imap_with_progress, split_into_ranges, create_pool
+
+# The state shared by the worker processes of a parallel search, set by _init_worker
+_worker_config = None
+
+
+def _init_worker(config: PiConfig, HT_L_list: list):
+    global _worker_config
+    _worker_config = (config, HT_L_list)
+
+
+def _decrypt_block_slice(task: tuple) -> list:
+    """ Decrypt the entries [begin, end) of the block di labeled li in the pi-th level, which has 2 ** pi entries
+    """
+    config, HT_L_list = _worker_config
+    Ki, pi, li, begin, end = task
+    di = HT_L_list[pi].get(li)
+    entry_size = len(di) >> pi
+    return [config.ske.Decrypt(Ki, cipher)
+            for cipher in parse_identifiers_from_block_given_identifier_size(
+                di[begin * entry_size: end * entry_size], entry_size)]
 
 
 class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
@@ -43,27 +65,23 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         K = K.K
         N = get_total_size(database)
         t = math.ceil(math.log2(N))
-
-        padded_database = copy.deepcopy(database)  # need to deep copy!! Otherwise, it will affect the original database
-
-        # If N is not a power of two, we need to pad DB to
-        # satisfy this by adding some dummy keyword-identifier pairs.
-        while N < 2 ** t:
-            random_keyword = os.urandom(32)
-            random_id_list_len = random.randint(1, (2 ** t) - N)
-            random_id_list = [os.urandom(self.config.param_identifier_size) for _ in range(random_id_list_len)]
-            padded_database[random_keyword] = random_id_list
-
-            N += random_id_list_len
+        # the size of the encrypted |DB(w)|
+        n_cipher_len = len(self.config.ske.Encrypt(b"\x00" * self.config.param_k_prime, b"\x00" * math.ceil(t / 8)))
 
         T_list = [[] for _ in range(t + 1)]  # t+1 empty lists T0, T1, ... , Tt
         S = []
+        cipher_len = len(self.config.ske.Encrypt(b"\x00" * self.config.param_k_prime,
+                                                 b"\x00" * self.config.param_identifier_size))
 
-        for keyword in padded_database:
-            ni = len(padded_database[keyword])
+        # If N is not a power of two, we need to pad DB to
+        # satisfy this by adding some dummy keyword-identifier pairs.
+        for keyword, identifier_list, ni in iterate_padded_database(database, 2 ** t):
             pi = math.ceil(math.log2(ni))
-            # If necessary, pad DB(wi) with dummy identifiers in order to contain exactly 2^{pi} elements.
-            padded_database[keyword].extend((os.urandom(self.config.param_identifier_size) for _ in range((2 ** pi) - ni)))
+
+            if keyword is None:  # dummy keyword, generate the random block directly
+                T_list[pi].append((os.urandom(self.config.param_l), os.urandom((2 ** pi) * cipher_len)))
+                S.append((os.urandom(self.config.param_l_prime), os.urandom(n_cipher_len)))
+                continue
 
             prf_output = self.config.prf(K, keyword)
             li, Ki, li_prime, Ki_prime = split_bytes_given_slice_len(prf_output, [self.config.param_l,
@@ -71,7 +89,10 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
                                                                                   self.config.param_l_prime,
                                                                                   self.config.param_k_prime])
 
-            cipher_list = [self.config.ske.Encrypt(Ki, identifier) for identifier in padded_database[keyword]]
+            cipher_list = [self.config.ske.Encrypt(Ki, identifier) for identifier in identifier_list]
+            # If necessary, pad DB(wi) with dummy identifiers in order to contain exactly 2^{pi} elements.
+            # The dummy identifiers are never decrypted, so their ciphertexts are generated randomly
+            cipher_list.append(os.urandom(((2 ** pi) - ni) * cipher_len))
             di = b"".join(cipher_list)
 
             # math.ceil(t / 8) --> max_bytes represent |DB(w)|
@@ -81,8 +102,7 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
 
         # padding each list
         for i in range(t + 1):
-            d_len = (2 ** i) * len(self.config.ske.Encrypt(b"\x00" * self.config.param_k_prime,
-                                                           b"\x00" * self.config.param_identifier_size))
+            d_len = (2 ** i) * cipher_len
             T_list[i].extend(
                 ((os.urandom(self.config.param_l), os.urandom(d_len)) for _ in range((2 ** (t - i)) - len(T_list[i]))))
 
@@ -95,7 +115,7 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         # create HT(L0), ..., HT(Lt)
         HT_L_list = []
         for i in range(t + 1):
-            HT_L_list.append(PiEncryptedDatabase.create_hash_table(T_list[i]))
+            HT_L_list.append(PiEncryptedDatabase.create_level_table(T_list[i]))
         # create HT(S)
         HT_S = PiEncryptedDatabase.create_hash_table(S)
 
@@ -111,35 +131,74 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
                                                                               self.config.param_k_prime])
         return PiToken(li, Ki, li_prime, Ki_prime)
 
+    def _TrapMany(self, K: PiKey, keywords: typing.Iterable[bytes]) -> typing.List[PiToken]:
+        """Trapdoor Generation Algorithm for several keywords, the PRF is keyed only once"""
+        slice_len_list = [self.config.param_l, self.config.param_k, self.config.param_l_prime, self.config.param_k_prime]
+        return [PiToken(*split_bytes_given_slice_len(prf_output, slice_len_list))
+                for prf_output in self.config.prf.batch(K.K, keywords)]
+
     def _Search(self, edb: PiEncryptedDatabase, tk: PiToken) -> PiResult:
         """Search Algorithm"""
+        result = []
+        located = self._LocateBlock(edb, tk)
+        if located is None:
+            return PiResult(result)
+        di, pi, ni = located
+
+        # Parse block di
+        cipher_list = parse_identifiers_from_block_given_entry_count_in_one_block(di, 2 ** pi)
+
+        # Decrypt the first ni elements of this block using the key Ki
+        result.extend((self.config.ske.Decrypt(tk.Ki, cipher) for cipher in cipher_list[:ni]))
+
+        return PiResult(result)
+
+    def _LocateBlock(self, edb: PiEncryptedDatabase, tk: PiToken) -> typing.Optional[typing.Tuple[bytes, int, int]]:
+        """Return (di, pi, ni), i.e. the block of the keyword, its level, and the actual size of DB(w),
+        or None if not found"""
         HT_S = edb.HT_S
         HT_L_list = edb.HT_L_list
-        li, Ki, li_prime, Ki_prime = tk.li, tk.Ki, tk.li_prime, tk.Ki_prime
+        li, li_prime, Ki_prime = tk.li, tk.li_prime, tk.Ki_prime
 
-        result = []
         ni_prime = HT_S.get(li_prime)
         if ni_prime is None:
-            return PiResult(result)
+            return None
 
         # the actual size of DB(w)
         ni_bytes = self.config.ske.Decrypt(Ki_prime, ni_prime)
         ni = int_from_bytes(ni_bytes)
         pi = math.ceil(math.log2(ni))
         if pi >= len(HT_L_list):  # size overflow
-            return PiResult(result)
+            return None
 
         # Obtain the block di
         di = HT_L_list[pi].get(li)
         if di is None:
-            return PiResult(result)
-
-        # Parse block di
-        cipher_list = parse_identifiers_from_block_given_entry_count_in_one_block(di, 2 ** pi)
-
-        # Decrypt the first ni elements of this block using the key Ki
-        result.extend((self.config.ske.Decrypt(Ki, cipher) for cipher in cipher_list[:ni]))
+            return None
+        return di, pi, ni
+
+    def _SearchParallel(self,
+                        edb: PiEncryptedDatabase,
+                        tk: PiToken,
+                        worker_count: int,
+                        pool: typing.Optional[multiprocessing.pool.Pool] = None) -> PiResult:
+        """Search Algorithm, the first ni entries of the block are sliced into worker_count parts
+        decrypted by different workers"""
+        if worker_count <= 1:
+            return self._Search(edb, tk)
 
+        result = []
+        located = self._LocateBlock(edb, tk)
+        if located is None:
+            return PiResult(result)
+        _, pi, ni = located
+
+        tasks = [(tk.Ki, pi, tk.li, begin, end) for begin, end in split_into_ranges(ni, worker_count)]
+        for slice_result in imap_with_progress(_decrypt_block_slice, tasks, len(tasks),
+                                               initializer=_init_worker,
+                                               initargs=(self.config, edb.HT_L_list),
+                                               pool=pool):
+            result.extend(slice_result)
         return PiResult(result)
 
     def KeyGen(self) -> PiKey:
@@ -155,7 +214,22 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: PiKey, keyword: bytes) -> PiToken:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: PiKey, keywords: typing.Iterable[bytes]) -> typing.List[PiToken]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: PiEncryptedDatabase,
                token: PiToken) -> PiResult:
         return self._Search(edb, token)
+
+    def SearchParallel(self,
+                       edb: PiEncryptedDatabase,
+                       token: PiToken,
+                       worker_count: int = 1,
+                       pool: typing.Optional[multiprocessing.pool.Pool] = None) -> PiResult:
+        return self._SearchParallel(edb, token, worker_count, pool)
+
+    def CreateSearchPool(self,
+                         edb: PiEncryptedDatabase,
+                         worker_count: int) -> multiprocessing.pool.Pool:
+        return create_pool(worker_count, initializer=_init_worker, initargs=(self.config, edb.HT_L_list))
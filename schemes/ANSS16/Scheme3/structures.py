@@ -15,6 +15,7 @@ import pickle
 from schemes.ANSS16.Scheme3.config import PiConfig, PI_HEADER
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
 from toolkit.bytes_utils import split_bytes_given_slice_len
+from toolkit.data_structures.level_table import LevelTable
 
 
 class PiKey(SSEKey):
@@ -42,6 +43,7 @@ class PiKey(SSEKey):
 
 class PiEncryptedDatabase(SSEEncryptedDatabase):
     __slots__ = ["HT_S", "HT_L_list"]  # dict D
+    container_tag = PI_HEADER
 
     def __init__(self, HT_S: dict, HT_list: list, config: PiConfig = None):
         super(PiEncryptedDatabase, self).__init__(config)
@@ -54,6 +56,13 @@ class PiEncryptedDatabase(SSEEncryptedDatabase):
         D = {key: value for key, value in kv_pairs}
         return D
 
+    @classmethod
+    def create_level_table(cls, kv_pairs: list) -> LevelTable:
+        """ All labels and values of a level are of fixed size,
+        so they are stored in a sorted label buffer and a contiguous value buffer, instead of a dict.
+        """
+        return LevelTable.from_pairs(kv_pairs)
+
     def serialize(self) -> bytes:
         data = PI_HEADER + pickle.dumps((self.HT_S, self.HT_L_list))
         return data
@@ -67,6 +76,13 @@ class PiEncryptedDatabase(SSEEncryptedDatabase):
         HT_S, HT_list = pickle.loads(data_bytes)
         return cls(HT_S, HT_list, config)
 
+    def container_sections(self) -> dict:
+        return {"HT_S": self.HT_S, **{f"HT_L_list[{i}]": table for i, table in enumerate(self.HT_L_list)}}
+
+    @classmethod
+    def from_container_sections(cls, sections: dict, config: PiConfig = None):
+        return cls(sections["HT_S"], [sections[f"HT_L_list[{i}]"] for i in range(len(sections) - 1)], config)
+
     def __eq__(self, other):
         if not isinstance(other, PiEncryptedDatabase):
             return False
@@ -20,6 +20,8 @@ from schemes.interface.config import SSEConfig
 
 SSE1_HEADER = b"\x93\x94Curtomola2006SSE1"
 
+SSE1_ARRAY_ITEM_NUM_IN_ONE_FILE = 2 ** 16  # the number of nodes stored in one chunk file of the persistent array A
+
 # If the param of the specified length is not suffixed, the default is in bytes
 # The length parameter of the bit suffix is the length in bits
 
@@ -36,6 +38,12 @@ DEFAULT_CONFIG = {
     "prp_psi": "BitwiseFPEPRP",
     "ske1": "AES-CBC",
     "ske2": "AES-CBC",
+
+    # If set, array A and look-up table T are stored on disk (at param_storage_path + "_A" and "_T"),
+    # otherwise, they are kept in memory
+    "param_storage_path": None,
+    # The number of worker processes used to encrypt the nodes, 1 means encrypting in the current process
+    "param_worker_count": 1,
 }
 
 
@@ -49,9 +57,12 @@ class SSE1Config(SSEConfig):
         "param_l_bits",
         "param_log2_s",
         "param_log2_s_bytes",
+        "param_node_size",
 
         "param_dictionary_size",
         "param_identifier_size",
+        "param_storage_path",
+        "param_worker_count",
 
         "prp_pi",
         "prp_psi",
@@ -78,11 +89,14 @@ class SSE1Config(SSEConfig):
 
         self.param_identifier_size = config_dict.get("param_identifier_size")
         self.param_dictionary_size = config_dict.get("param_dictionary_size")
+        self.param_storage_path = config_dict.get("param_storage_path")  # optional
+        self.param_worker_count = config_dict.get("param_worker_count", 1)  # optional
 
         self.param_k_bits = self.param_k * 8
         self.param_l_bits = self.param_l * 8
         self.param_log2_s = math.ceil(math.log2(self.param_s))
         self.param_log2_s_bytes = math.ceil(self.param_log2_s / 8)
+        self.param_node_size = self.param_identifier_size + self.param_k + self.param_log2_s_bytes
 
         self.prp_pi = toolkit.prp.get_prp_implementation(config_dict.get("prp_pi", ""))(
             key_bit_length=self.param_k_bits,
@@ -13,22 +13,73 @@ LIB-SSE CODE
 @paper: Searchable symmetric encryption: improved definitions and efficient constructions
 @paper_author: Curtomola et al.
 """
+import array
+import math
 import os
+import typing
 
 import schemes.interface.inverted_index_sse
 from schemes.CGKO06.SSE1.config import DEFAULT_CONFIG, SSE1Config
 from schemes.CGKO06.SSE1.structures import SSE1Key, SSE1EncryptedDatabase, SSE1Token, SSE1Result
 from toolkit.bits import Bitset
-from toolkit.bytes_utils import int_from_bytes, bytes_xor, add_leading_zeros, split_bytes_given_slice_len
+from toolkit.bytes_utils import int_to_bytes, int_from_bytes, bytes_xor, add_leading_zeros, \
+    split_bytes_given_slice_len
+from toolkit.database_utils import get_total_size
+from toolkit.parallel import imap_with_progress, ProgressCallback
+
+ADDR_CHUNK_SIZE = 4096  # the number of counters whose addresses are computed in one task
+CHAIN_TASK_CHUNK_SIZE = 64  # the number of node chains sent to a worker at once
+
+# The config used by the tasks below, it is set by _init_worker in each worker process
+_worker_config: SSE1Config = None
+
+
+def _init_worker(config: SSE1Config):
+    global _worker_config
+    _worker_config = config
+
+
+def _compute_addr_chunk(task) -> array.array:
+    """ Compute ψ(K1, ctr) for each ctr in [ctr_start, ctr_end)
+    """
+    K1, ctr_start, ctr_end = task
+    key = Bitset(K1, length=_worker_config.param_k_bits)
+    return array.array('Q', (int(_worker_config.prp_psi(key, Bitset(ctr, length=_worker_config.param_log2_s)))
+                             for ctr in range(ctr_start, ctr_end)))
+
+
+def _encrypt_node_chain(task) -> list:
+    """ Encrypt the node list of a keyword.
+    The j-th node (j begins from 0) is Enc(K_j, id_j || K_{j+1} || addr_{j+1}),
+    and the last node is Enc(K_{n-1}, id_{n-1} || 0 || 0)
+    """
+    identifiers, chain_keys, addr_list = task
+    k, log2_s_bytes = _worker_config.param_k, _worker_config.param_log2_s_bytes
+    ske1 = _worker_config.ske1
+    node_cipher_list = []
+    for j, identifier in enumerate(identifiers):
+        if j + 1 < len(identifiers):
+            next_pointer = chain_keys[(j + 1) * k: (j + 2) * k] + int_to_bytes(addr_list[j + 1], log2_s_bytes)
+        else:
+            ###
+            # For the last node of Li
+            # Collisions may occur, but with probability N/(2^{param_k} + s)
+            # where N is the total size of db,
+            # and we consider this probability of error negligible
+            ###
+            next_pointer = b"\x00" * k + b"\x00" * log2_s_bytes
+        node_cipher_list.append(ske1.Encrypt(chain_keys[j * k: (j + 1) * k], identifier + next_pointer))
+    return node_cipher_list
 
 
 class SSE1(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     """SSE-1 Construction described by Curtomola et al. [CGKO06]"""
 
-    def __init__(self, config: dict = DEFAULT_CONFIG):
+    def __init__(self, config: dict = DEFAULT_CONFIG, progress_callback: ProgressCallback = None):
         super(SSE1, self).__init__()
         self.config = SSE1Config(config)
-        pass
+        # If not None, it is called as progress_callback(stage, finished_task_num, total_task_num) during EDBSetup
+        self.progress_callback = progress_callback
 
     def _Gen(self) -> SSE1Key:
         """
@@ -41,78 +92,81 @@ class SSE1(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def _Enc(self, K: SSE1Key, database: dict) -> SSE1EncryptedDatabase:
         """Encrypted the given database under the key"""
         K1, K2, K3, K4 = K.K1, K.K2, K.K3, K.K4
-
+        worker_count = self.config.param_worker_count
+
+        # All entries of A have the same size
+        node_cipher_size = len(self.config.ske1.Encrypt(b"\x00" * self.config.param_k,
+                                                        b"\x00" * self.config.param_node_size))
+        A = SSE1EncryptedDatabase.create_array(self.config, node_cipher_size)
+        T = SSE1EncryptedDatabase.create_table(self.config)
+        is_filled = bytearray(math.ceil(self.config.param_s / 8))  # bitmap of the non-empty entries of A
+
+        # Assign the counter range [ctr_start, ctr_start + |DB(w)|) to each keyword, ctr begins from 1
+        total_size = get_total_size(database)
+        counter_range_list = []
         ctr = 1
-        A = [b'\x00'] * self.config.param_s
-        T = {}
-
         for keyword in database:
-            first_node_addr = None
-            # Sample a key Ki,0 <-$- {0, 1}k
-            K_i = [os.urandom(self.config.param_k)]
-
-            for j, identifier in enumerate(database[keyword], start=1):  # j begins from 1
-                if j == len(database[keyword]):  # not process last node here
-                    break
-
-                # Generate a key Ki,j ← SKE1.Gen(1^k)
-                K_i.append(self.config.ske1.KeyGen())
-
-                # Create a node
-                N_i_j = identifier + K_i[j] + bytes(self.config.prp_psi(
-                    Bitset(K1, length=self.config.param_k_bits),
-                    Bitset(ctr + 1, length=self.config.param_log2_s)
-                ))
-
-                # Encrypt node N_i_j under key Ki,j-1
-                addr_in_A = self.config.prp_psi(Bitset(K1, length=self.config.param_k_bits),
-                                                Bitset(ctr, length=self.config.param_log2_s))
-                A[int(addr_in_A)] = self.config.ske1.Encrypt(K_i[j - 1], N_i_j)
-
-                # Record first node address
-                if j == 1:
-                    first_node_addr = addr_in_A
-
-                ctr += 1
-
-            ###
-            # For the last node of Li
-            # Collisions may occur, but with probability N/(2^{param_k} + s)
-            # where N is the total size of db,
-            # and we consider this probability of error negligible
-            ###
-            last_node = database[keyword][
-                            -1] + b"\x00" * self.config.param_k + b"\x00" * self.config.param_log2_s_bytes
-            last_node_addr_in_A = self.config.prp_psi(Bitset(K1, length=self.config.param_k_bits),
-                                                      Bitset(ctr, length=self.config.param_log2_s))
-
-            A[int(last_node_addr_in_A)] = self.config.ske1.Encrypt(K_i[-1], last_node)
-            if first_node_addr is None:  # only one entry
-                first_node_addr = last_node_addr_in_A
-            ctr += 1
+            counter_range_list.append((keyword, ctr, len(database[keyword])))
+            ctr += len(database[keyword])
+
+        # Compute ψ(K1, ctr) only once for each counter
+        addr_list = array.array('Q')
+        for addr_chunk in imap_with_progress(_compute_addr_chunk,
+                                             ((K1, chunk_start, min(chunk_start + ADDR_CHUNK_SIZE, total_size + 1))
+                                              for chunk_start in range(1, total_size + 1, ADDR_CHUNK_SIZE)),
+                                             worker_count,
+                                             initializer=_init_worker,
+                                             initargs=(self.config,),
+                                             stage="address",
+                                             total=math.ceil(total_size / ADDR_CHUNK_SIZE),
+                                             progress_callback=self.progress_callback):
+            addr_list.extend(addr_chunk)
+
+        # Sample the keys Ki,0, Ki,1, ..., Ki,|DB(w)|-1 of all lists at once
+        chain_keys = os.urandom(self.config.param_k * total_size)
+
+        # The node chains of different keywords are independent
+        chain_task_iter = ((database[keyword],
+                            chain_keys[(ctr_start - 1) * self.config.param_k:
+                                       (ctr_start - 1 + count) * self.config.param_k],
+                            addr_list[ctr_start - 1: ctr_start - 1 + count])
+                           for keyword, ctr_start, count in counter_range_list)
+        chain_cipher_iter = imap_with_progress(_encrypt_node_chain,
+                                               chain_task_iter,
+                                               worker_count,
+                                               initializer=_init_worker,
+                                               initargs=(self.config,),
+                                               chunk_size=CHAIN_TASK_CHUNK_SIZE,
+                                               stage="node",
+                                               total=len(counter_range_list),
+                                               progress_callback=self.progress_callback)
+
+        for (keyword, ctr_start, count), node_cipher_list in zip(counter_range_list, chain_cipher_iter):
+            for addr_in_A, node_cipher in zip(addr_list[ctr_start - 1: ctr_start - 1 + count], node_cipher_list):
+                A[addr_in_A] = node_cipher
+                is_filled[addr_in_A >> 3] |= 1 << (addr_in_A & 7)
+
+            first_node_addr = int_to_bytes(addr_list[ctr_start - 1], self.config.param_log2_s_bytes)
+            K_i_0 = chain_keys[(ctr_start - 1) * self.config.param_k: ctr_start * self.config.param_k]
 
             # Add item to Look-up Table T
             T[bytes(self.config.prp_pi(Bitset(K3, length=self.config.param_k_bits),
                                        Bitset(keyword, length=self.config.param_l_bits)))] = \
-                bytes_xor(bytes(first_node_addr) + K_i[0],
+                bytes_xor(first_node_addr + K_i_0,
                           self.config.prf_f(K2, add_leading_zeros(keyword, self.config.param_l)))
 
         # Fill random values for empty entry in A
-        existing_entry_size = len(self.config.ske1.Encrypt(b"\x00" * self.config.param_k,
-                                                           b"\x00" * (self.config.param_identifier_size +
-                                                                      self.config.param_k +
-                                                                      self.config.param_log2_s_bytes))
-                                  )
-
         for i in range(len(A)):
-            if A[i] == b'\x00':
-                A[i] = os.urandom(existing_entry_size)  # the same size as the existing s' entries of A
+            if not (is_filled[i >> 3] >> (i & 7)) & 1:
+                A[i] = os.urandom(node_cipher_size)  # the same size as the existing s' entries of A
 
         # Fill random values to T so that |T| = |∆|
         for _ in range(self.config.param_dictionary_size - len(T)):
             T[os.urandom(self.config.param_l)] = os.urandom(self.config.prf_f.output_length)
 
-        return SSE1EncryptedDatabase(A, T)
+        edb = SSE1EncryptedDatabase(A, T)
+        edb.sync()
+        return edb
 
     def _Trap(self, K: SSE1Key, keyword: bytes) -> SSE1Token:
         """Trapdoor Generation Algorithm"""
@@ -121,19 +175,33 @@ class SSE1(schemes.interface.inverted_index_sse.InvertedIndexSSE):
                                                   Bitset(keyword, length=self.config.param_l_bits))),
                          self.config.prf_f(K2, add_leading_zeros(keyword, self.config.param_l)))
 
+    def _TrapMany(self, K: SSE1Key, keywords: typing.Iterable[bytes]) -> typing.List[SSE1Token]:
+        """Trapdoor Generation Algorithm for several keywords, the PRP and PRF are keyed only once"""
+        K2, K3 = K.K2, K.K3
+        keywords = list(keywords)
+        gamma_list = self.config.prp_pi.batch(Bitset(K3, length=self.config.param_k_bits),
+                                              [Bitset(keyword, length=self.config.param_l_bits)
+                                               for keyword in keywords])
+        eta_list = self.config.prf_f.batch(K2, [add_leading_zeros(keyword, self.config.param_l)
+                                                for keyword in keywords])
+        return [SSE1Token(bytes(gamma), eta) for gamma, eta in zip(gamma_list, eta_list)]
+
     def _Search(self, I: SSE1EncryptedDatabase, t: SSE1Token) -> SSE1Result:
         """Search Algorithm"""
+        return SSE1Result(list(self._SearchIter(I, t)))
+
+    def _SearchIter(self, I: SSE1EncryptedDatabase, t: SSE1Token) -> typing.Iterator[bytes]:
+        """Search Algorithm, yielding the identifiers node by node"""
         A, T = I.A, I.T  # Parse encrypted index
         gamma, eta = t.gamma, t.eta  # Parse token(trapdoor)
         theta = T.get(gamma)
         if theta is None:
-            return SSE1Result([])
+            return
         xor_result = bytes_xor(theta, eta)  # θ ⊕ η
 
         # parse θ ⊕ η as α||K', α is the first node address, K' is the key to decrypt
         node_addr, K_prime = split_bytes_given_slice_len(xor_result, [self.config.param_log2_s_bytes,
                                                                       self.config.param_k])
-        result = []
         while True:
             node_cipher = A[int_from_bytes(node_addr)]
             node = self.config.ske1.Decrypt(K_prime, node_cipher)
@@ -142,12 +210,11 @@ class SSE1(schemes.interface.inverted_index_sse.InvertedIndexSSE):
                                                                                     [self.config.param_identifier_size,
                                                                                      self.config.param_k,
                                                                                      self.config.param_log2_s_bytes])
-            result.append(file_identifier)
+            yield file_identifier
             node_addr, K_prime = next_node_addr, next_key
             # current node is the last node
             if K_prime == b'\x00' * len(K_prime) and node_addr == b'\x00' * len(node_addr):
                 break
-        return SSE1Result(result)
 
     def KeyGen(self) -> SSE1Key:
         key = self._Gen()
@@ -162,7 +229,15 @@ class SSE1(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: SSE1Key, keyword: bytes) -> SSE1Token:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: SSE1Key, keywords: typing.Iterable[bytes]) -> typing.List[SSE1Token]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: SSE1EncryptedDatabase,
                token: SSE1Token) -> SSE1Result:
         return self._Search(edb, token)
+
+    def SearchIter(self,
+                   edb: SSE1EncryptedDatabase,
+                   token: SSE1Token) -> typing.Iterator[bytes]:
+        return self._SearchIter(edb, token)
@@ -11,9 +11,14 @@ LIB-SSE CODE
 @description: 
 """
 import pickle
+import typing
 
-from schemes.CGKO06.SSE1.config import SSE1Config, SSE1_HEADER
+from data_persistence.interfaces import PersistentFixedLengthBytesArray, PersistentBytesDict
+from data_persistence.persistent_array import SPFLBArray
+from data_persistence.persistent_dict import PickledDict
+from schemes.CGKO06.SSE1.config import SSE1Config, SSE1_HEADER, SSE1_ARRAY_ITEM_NUM_IN_ONE_FILE
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
+from toolkit.bytes_utils import int_to_bytes, int_from_bytes
 
 
 class SSE1Key(SSEKey):
@@ -41,29 +46,83 @@ class SSE1Key(SSEKey):
 
 
 class SSE1EncryptedDatabase(SSEEncryptedDatabase):
+    """ The array A and look-up table T are kept in memory (list and dict) by default,
+    or stored on disk (SPFLBArray and PickledDict) if the parameter param_storage_path is set.
+
+    - Serialization Format:
+        * Header
+        * Node cipher size (4 bytes) || Length of A (8 bytes)
+        * All nodes of A, one by one
+        * Pickled T
+    """
     __slots__ = ["A", "T"]  # array A and look-up table T
 
-    def __init__(self, A: list, T: dict, config: SSE1Config = None):
+    def __init__(self, A: typing.Sequence[bytes], T: typing.Mapping, config: SSE1Config = None):
         super(SSE1EncryptedDatabase, self).__init__(config)
         self.A, self.T = A, T
 
+    @staticmethod
+    def create_array(config: SSE1Config, node_cipher_size: int) -> typing.MutableSequence[bytes]:
+        """ Create an array A of param_s entries, the entries are all-zero bytes.
+        """
+        if config.param_storage_path is None:
+            return [b'\x00' * node_cipher_size] * config.param_s
+        return SPFLBArray.create(config.param_storage_path + "_A",
+                                 item_size=node_cipher_size,
+                                 array_len=config.param_s,
+                                 item_num_in_one_file=SSE1_ARRAY_ITEM_NUM_IN_ONE_FILE)
+
+    @staticmethod
+    def create_table(config: SSE1Config) -> typing.MutableMapping:
+        """ Create an empty look-up table T.
+        """
+        if config.param_storage_path is None:
+            return {}
+        return PickledDict.create(config.param_storage_path + "_T")
+
+    def sync(self):
+        """ Flush A and T to disk if they are persistent.
+        """
+        for container in (self.A, self.T):
+            if isinstance(container, (PersistentFixedLengthBytesArray, PersistentBytesDict)):
+                container.sync()
+
     def serialize(self) -> bytes:
-        data = SSE1_HEADER + pickle.dumps((self.A, self.T))
-        return data
+        node_cipher_size = len(self.A[0]) if len(self.A) else 0
+        return b''.join([SSE1_HEADER,
+                         int_to_bytes(node_cipher_size, 4),
+                         int_to_bytes(len(self.A), 8),
+                         *self.A,
+                         pickle.dumps({gamma: self.T[gamma] for gamma in self.T})])
 
     @classmethod
     def deserialize(cls, xbytes: bytes, config: SSE1Config = None):
         if xbytes[:len(SSE1_HEADER)] != SSE1_HEADER:
             raise ValueError("Parse header error.")
 
-        data_bytes = xbytes[len(SSE1_HEADER):]
-        A, T = pickle.loads(data_bytes)
+        data_bytes = memoryview(xbytes)[len(SSE1_HEADER):]
+        node_cipher_size, A_len = int_from_bytes(data_bytes[:4]), int_from_bytes(data_bytes[4:12])
+        A_end = 12 + node_cipher_size * A_len
+        if len(data_bytes) < A_end:
+            raise ValueError("The length of xbytes is wrong.")
+
+        if config is None or config.param_storage_path is None:
+            A = [bytes(data_bytes[i: i + node_cipher_size]) for i in range(12, A_end, node_cipher_size)]
+            T = pickle.loads(data_bytes[A_end:])
+        else:
+            A = cls.create_array(config, node_cipher_size)
+            for index, offset in enumerate(range(12, A_end, node_cipher_size)):
+                A[index] = bytes(data_bytes[offset: offset + node_cipher_size])
+            T = PickledDict.from_dict(pickle.loads(data_bytes[A_end:]), config.param_storage_path + "_T")
         return cls(A, T)
 
     def __eq__(self, other):
         if not isinstance(other, SSE1EncryptedDatabase):
             return False
-        return self.A == other.A and self.T == other.T
+        if len(self.A) != len(other.A) or len(self.T) != len(other.T):
+            return False
+        return all(node == other_node for node, other_node in zip(self.A, other.A)) and \
+            all(self.T[gamma] == other.T.get(gamma) for gamma in self.T)
 
 
 class SSE1Token(SSEToken):
@@ -61,7 +61,10 @@ DEFAULT_CONFIG = {
     "param_max_file_size": 1024 * 1024,
 
     "prp_pi": "BitwiseFPEPRP",
-    "ske": "AES-CBC"
+    "ske": "AES-CBC",
+
+    # The number of PRP values in the first token of a token stream, each subsequent token doubles it
+    "param_token_batch_size": 16,
 }
 
 
@@ -81,6 +84,8 @@ class SSE2Config(SSEConfig):
         "param_dictionary_size",
         "param_identifier_size",
         "param_max_file_size",  # todo need to scan
+        "param_token_size",
+        "param_token_batch_size",
         "prp_pi",
         "ske"
     ]
@@ -115,6 +120,10 @@ class SSE2Config(SSEConfig):
 
         self.param_s = self.param_max * self.param_n
 
+        # the size of a packed PRP value in the token (bytes)
+        self.param_token_size = math.ceil((self.param_l_bits + self.param_log2_n_plus_max) / 8)
+        self.param_token_batch_size = config_dict.get("param_token_batch_size", 16)  # optional
+
         self.prp_pi = toolkit.prp.get_prp_implementation(config_dict.get("prp_pi", ""))(
             key_bit_length=self.param_k_bits,
             message_bit_length=self.param_l_bits + self.param_log2_n_plus_max
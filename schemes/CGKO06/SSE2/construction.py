@@ -12,6 +12,7 @@ LIB-SSE CODE
 @note: Here PRP is bitwise PRP
 """
 import os
+import typing
 
 import schemes.interface.inverted_index_sse
 from schemes.CGKO06.SSE2.config import DEFAULT_CONFIG, SSE2Config
@@ -36,70 +37,100 @@ class SSE2(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         key_tuple = tuple(os.urandom(self.config.param_k) for _ in range(2))
         return SSE2Key(*key_tuple)
 
+    def _prp_pi_batch(self, K1: bytes, keyword: bytes, i_range: range) -> list:
+        """ Compute π(K1, w||i) for each i in i_range, the results are integers
+        """
+        key = Bitset(K1, length=self.config.param_k_bits)
+        keyword_bits = Bitset(keyword, length=self.config.param_l_bits)
+        return [int(output) for output in self.config.prp_pi.batch(
+            key,
+            (keyword_bits + Bitset(int_to_bytes(i, self.config.param_log2_n_plus_max_bytes),
+                                   length=self.config.param_log2_n_plus_max)
+             for i in i_range))]
+
     def _Enc(self, K: SSE2Key, database: dict) -> SSE2EncryptedDatabase:
         """Encrypted the given database under the key"""
         K1, K2 = K.K1, K.K2
-        I = {}
+        L = []
 
         s_prime = 0  # total_size
         document_count_dict = {}  # the number of entries in I that already contain id(Di)
 
         for keyword in database:
             s_prime += len(database[keyword])
-            for j, identifier in enumerate(database[keyword], start=1):
-                I[int(
-                    self.config.prp_pi(Bitset(K1,
-                                              length=self.config.param_k_bits),
-                                       Bitset(keyword, length=self.config.param_l_bits) +
-                                       Bitset(int_to_bytes(j, self.config.param_log2_n_plus_max_bytes),
-                                              length=self.config.param_log2_n_plus_max),
-                                       )
-                )] = identifier
-
+            addr_list = self._prp_pi_batch(K1, keyword, range(1, len(database[keyword]) + 1))  # j begins from 1
+            for addr, identifier in zip(addr_list, database[keyword]):
+                L.append((addr, identifier))
                 document_count_dict[identifier] = document_count_dict.get(identifier, 0) + 1
 
         n = self.config.param_n
 
         if s_prime < self.config.param_s:
             for identifier in document_count_dict:
-                for l in range(document_count_dict[identifier] - self.config.param_max):
-                    I[int(
-                        self.config.prp_pi(Bitset(K1,
-                                                  length=self.config.param_k_bits),
-                                           Bitset(b"\x00" * self.config.param_l,
-                                                  length=self.config.param_l_bits) +
-                                           Bitset(int_to_bytes(n + l, self.config.param_log2_n_plus_max_bytes),
-                                                  length=self.config.param_log2_n_plus_max)
-                                           ))] = identifier
-                n += document_count_dict[identifier] - self.config.param_max
-        return SSE2EncryptedDatabase(I)
-
-    def _Trap(self, K: SSE2Key, keyword: bytes) -> SSE2Token:
-        """Trapdoor Generation Algorithm"""
+                padding_count = document_count_dict[identifier] - self.config.param_max
+                for addr in self._prp_pi_batch(K1, b"\x00" * self.config.param_l, range(n, n + padding_count)):
+                    L.append((addr, identifier))
+                n += padding_count
+        return SSE2EncryptedDatabase.build_from_list(L, self.config)
+
+    def _Trap(self, K: SSE2Key, keyword: bytes, start: int = 1, count: int = None) -> SSE2Token:
+        """Trapdoor Generation Algorithm
+        By default, the token contains π(K1, w||i) for i = 1, ..., n.
+        If start and count are given, only π(K1, w||i) for i = start, ..., start + count - 1 are computed.
+        """
         K1 = K.K1
-        t = []
-        for i in range(1, self.config.param_n + 1):
-            t.append(int(self.config.prp_pi(Bitset(K1,
-                                                   length=self.config.param_k_bits),
-                                            Bitset(keyword, length=self.config.param_l_bits) +
-                                            Bitset(int_to_bytes(i, self.config.param_log2_n_plus_max_bytes),
-                                                   length=self.config.param_log2_n_plus_max))
-                         ))
-        return SSE2Token(t)
+        if count is None:
+            count = self.config.param_n - start + 1
+        t = self._prp_pi_batch(K1, keyword, range(start, start + count))
+        return SSE2Token(t, self.config, start)
+
+    def _TrapMany(self, K: SSE2Key, keywords: typing.Iterable[bytes]) -> typing.List[SSE2Token]:
+        """Trapdoor Generation Algorithm for several keywords,
+        π(K1, w||i) of all keywords are computed in one batch, so that the keyed PRP state is shared"""
+        keywords, n = list(keywords), self.config.param_n
+        key = Bitset(K.K1, length=self.config.param_k_bits)
+        t_all = [int(output) for output in self.config.prp_pi.batch(
+            key,
+            (Bitset(keyword, length=self.config.param_l_bits) +
+             Bitset(int_to_bytes(i, self.config.param_log2_n_plus_max_bytes), length=self.config.param_log2_n_plus_max)
+             for keyword in keywords
+             for i in range(1, n + 1)))]
+        return [SSE2Token(t_all[j * n: (j + 1) * n], self.config) for j in range(len(keywords))]
 
     def _Search(self, edb: SSE2EncryptedDatabase, tk: SSE2Token) -> SSE2Result:
         """Search Algorithm"""
-        I = edb.I
-        t_list = tk.t
-        result = []
+        return SSE2Result(list(self._SearchIter(edb, tk)))
 
-        for ti in t_list:
+    def _SearchIter(self, edb: SSE2EncryptedDatabase, tk: SSE2Token) -> typing.Iterator[bytes]:
+        """Search Algorithm, yielding the identifiers one by one"""
+        I = edb.I
+        for ti in tk.t:
             identifier = I.get(ti)
             if identifier is None:
                 break
-            result.append(identifier)
+            yield identifier
 
-        return SSE2Result(result)
+    def TokenGenStream(self, key: SSE2Key, keyword: bytes) -> typing.Iterator[SSE2Token]:
+        """ Generate the token lazily, segment by segment.
+        The first segment contains param_token_batch_size values, and each subsequent segment doubles it,
+        so that the number of PRP evaluations is O(|DB(w)|) if the stream is stopped once the search is finished.
+        """
+        start, batch_size = 1, self.config.param_token_batch_size
+        while start <= self.config.param_n:
+            count = min(batch_size, self.config.param_n - start + 1)
+            yield self._Trap(key, keyword, start, count)
+            start += count
+            batch_size *= 2
+
+    def SearchPartial(self,
+                      edb: SSE2EncryptedDatabase,
+                      token: SSE2Token) -> typing.Tuple[SSE2Result, bool]:
+        """ Search with a segment of the token stream.
+        :return: The partial result, and whether the search is finished,
+        i.e., an entry is missing, and the client should stop sending the remaining segments.
+        """
+        result = self._Search(edb, token)
+        return result, len(result.result) < len(token.t)
 
     def KeyGen(self) -> SSE2Key:
         key = self._Gen()
@@ -114,7 +145,15 @@ class SSE2(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: SSE2Key, keyword: bytes) -> SSE2Token:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: SSE2Key, keywords: typing.Iterable[bytes]) -> typing.List[SSE2Token]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: SSE2EncryptedDatabase,
                token: SSE2Token) -> SSE2Result:
         return self._Search(edb, token)
+
+    def SearchIter(self,
+                   edb: SSE2EncryptedDatabase,
+                   token: SSE2Token) -> typing.Iterator[bytes]:
+        return self._SearchIter(edb, token)
@@ -11,9 +11,12 @@ LIB-SSE CODE
 @description: 
 """
 import pickle
+import typing
 
 from schemes.CGKO06.SSE2.config import SSE2_HEADER, SSE2Config
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
+from toolkit.bytes_utils import int_to_bytes, int_from_bytes
+from toolkit.data_structures.label_table import LabelTable
 
 
 class SSE2Key(SSEKey):
@@ -41,12 +44,20 @@ class SSE2Key(SSEKey):
 
 
 class SSE2EncryptedDatabase(SSEEncryptedDatabase):
-    __slots__ = ["I"]  # dict I
+    __slots__ = ["I"]  # dict I, a LabelTable
+    container_tag = SSE2_HEADER
 
-    def __init__(self, I: dict, config: SSE2Config = None):
+    def __init__(self, I: typing.Mapping[int, bytes], config: SSE2Config = None):
         super(SSE2EncryptedDatabase, self).__init__(config)
         self.I = I
 
+    @classmethod
+    def build_from_list(cls, kv_pairs: list, config: SSE2Config = None):
+        """ The addresses (integers) are the labels of param_token_size bytes
+        """
+        I = LabelTable.from_pairs(kv_pairs, label_size=None if config is None else config.param_token_size)
+        return cls(I, config)
+
     def serialize(self) -> bytes:
         data = SSE2_HEADER + pickle.dumps(self.I)
         return data
@@ -60,6 +71,13 @@ class SSE2EncryptedDatabase(SSEEncryptedDatabase):
         I = pickle.loads(data_bytes)
         return cls(I)
 
+    def container_sections(self) -> dict:
+        return {"I": self.I}
+
+    @classmethod
+    def from_container_sections(cls, sections: dict, config: SSE2Config = None):
+        return cls(sections["I"], config)
+
     def __eq__(self, other):
         if not isinstance(other, SSE2EncryptedDatabase):
             return False
@@ -67,26 +85,49 @@ class SSE2EncryptedDatabase(SSEEncryptedDatabase):
 
 
 class SSE2Token(SSEToken):
-    __slots__ = ["t"]  # array t
+    """ The token t = (π(w||start), π(w||start+1), ...)
+    A complete token starts from 1 and contains n values,
+    while a token in a token stream only contains a segment of them.
+
+    - Serialization Format (packed, fixed-width):
+        * Width of each value (1 byte) || start (4 bytes)
+        * All values, each of them is `width` bytes (big-endian)
+    """
+    __slots__ = ["t", "start", "width"]  # array t
 
-    def __init__(self, t: list, config: SSE2Config = None):
+    def __init__(self, t: list, config: SSE2Config = None, start: int = 1):
         super(SSE2Token, self).__init__(config)
         self.t = t
+        self.start = start
+        if config is not None:
+            self.width = config.param_token_size
+        else:
+            self.width = max(1, (max(t, default=0).bit_length() + 7) // 8)
 
     def serialize(self) -> bytes:
-        return pickle.dumps(self.t)
+        return b''.join([int_to_bytes(self.width, 1),
+                         int_to_bytes(self.start, 4),
+                         *(int_to_bytes(ti, self.width) for ti in self.t)])
 
     @classmethod
     def deserialize(cls, xbytes: bytes, config: SSE2Config = None):
-        t = pickle.loads(xbytes)
-        if not isinstance(t, list):
-            return ValueError("The data contained in xbytes is not a list.")
-        return cls(t, config)
+        if len(xbytes) < 5:
+            raise ValueError("The length of xbytes is wrong.")
+        width, start = xbytes[0], int_from_bytes(xbytes[1:5])
+        if width == 0 or (config is not None and width != config.param_token_size):
+            raise ValueError("The width of token values is wrong.")
+        if (len(xbytes) - 5) % width:
+            raise ValueError("The length of xbytes is wrong.")
+
+        t = [int_from_bytes(xbytes[i: i + width]) for i in range(5, len(xbytes), width)]
+        token = cls(t, config, start)
+        token.width = width
+        return token
 
     def __eq__(self, other):
         if not isinstance(other, SSE2Token):
             return False
-        return self.t == other.t
+        return self.t == other.t and self.start == other.start
 
 
 class SSE2Result(SSEResult):
@@ -16,7 +16,7 @@ to eliminate the misunderstanding of the de-padding algorithm due to the misunde
 """
 import math
 import os
-import random
+import typing
 
 import schemes.interface.inverted_index_sse
 from schemes.CJJ14.Pi2Lev.config import DEFAULT_CONFIG, Pi2LevConfig, LEVEL_POINTER_OF_ARRAY, LEVEL_FILE_IDENTIFIER
@@ -24,6 +24,7 @@ from schemes.CJJ14.Pi2Lev.structures import Pi2LevKey, Pi2LevToken, Pi2LevEncryp
 from toolkit.bytes_utils import int_to_bytes, int_from_bytes
 from toolkit.database_utils import partition_identifiers_to_blocks, \
     parse_identifiers_from_block_given_entry_count_in_one_block
+from toolkit.slot_allocator import PRPSlotAllocator
 
 
 class Pi2Lev(schemes.interface.inverted_index_sse.InvertedIndexSSE):
@@ -65,7 +66,8 @@ class Pi2Lev(schemes.interface.inverted_index_sse.InvertedIndexSSE):
                              "please make sure the parameters param_b_prime and param_B_prime are set correctly")
 
         A = [None] * A_len
-        available_pos_list = random.sample(range(1, A_len), A_len - 1)  # index of A start at 1 !!
+        # index of A start at 1 !!
+        slot_allocator = PRPSlotAllocator(A_len - 1, first_slot=1, key=os.urandom(self.config.param_lambda))
 
         for keyword in database:
             K1 = self.config.prf_f(K, b'\x01' + keyword)
@@ -91,7 +93,7 @@ class Pi2Lev(schemes.interface.inverted_index_sse.InvertedIndexSSE):
 
                 for j, file_id_block in enumerate(file_id_block_list):
                     # store id blocks in array A
-                    index_in_A = available_pos_list.pop()  # Choose random empty index
+                    index_in_A = slot_allocator.allocate()  # Choose random empty index
                     index_list_in_A.append(int_to_bytes(index_in_A, output_len=index_size_in_A))
 
                     d = self.config.ske.Encrypt(K2, LEVEL_FILE_IDENTIFIER + file_id_block)
@@ -121,7 +123,7 @@ class Pi2Lev(schemes.interface.inverted_index_sse.InvertedIndexSSE):
                 for j, file_id_block in enumerate(file_id_block_list):
                     # store id blocks in array A
 
-                    index_in_A = available_pos_list.pop()  # Choose random empty index
+                    index_in_A = slot_allocator.allocate()  # Choose random empty index
                     first_level_index_list_in_A.append(int_to_bytes(index_in_A, output_len=index_size_in_A))
 
                     d = self.config.ske.Encrypt(K2, LEVEL_FILE_IDENTIFIER + file_id_block)
@@ -139,7 +141,7 @@ class Pi2Lev(schemes.interface.inverted_index_sse.InvertedIndexSSE):
                 for j, first_index_id_block in enumerate(first_level_index_block_list):
                     # store first level index blocks in array A
 
-                    index_in_A = available_pos_list.pop()  # Choose random empty index
+                    index_in_A = slot_allocator.allocate()  # Choose random empty index
                     second_level_index_list_in_A.append(int_to_bytes(index_in_A, output_len=index_size_in_A))
 
                     d = self.config.ske.Encrypt(K2, LEVEL_POINTER_OF_ARRAY + first_index_id_block)
@@ -166,6 +168,14 @@ class Pi2Lev(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         K2 = self.config.prf_f(K, b'\x02' + keyword)
         return Pi2LevToken(K1, K2)
 
+    def _TrapMany(self, K: Pi2LevKey, keywords: typing.Iterable[bytes]) -> typing.List[Pi2LevToken]:
+        """Trapdoor Generation Algorithm for several keywords, the PRF is keyed only once"""
+        K = K.K
+        keywords = list(keywords)
+        K1_list = self.config.prf_f.batch(K, [b'\x01' + keyword for keyword in keywords])
+        K2_list = self.config.prf_f.batch(K, [b'\x02' + keyword for keyword in keywords])
+        return [Pi2LevToken(K1, K2) for K1, K2 in zip(K1_list, K2_list)]
+
     def _Search(self, edb: Pi2LevEncryptedDatabase, tk: Pi2LevToken) -> Pi2LevResult:
         """Search Algorithm"""
         D = edb.D
@@ -187,14 +197,18 @@ class Pi2Lev(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         while not is_in_file_id_level:
             curr_level_result = []
             if curr_process_level == 0:
-                block_cipher_list = (D[block_addr]
-                                     for block_addr in prev_level_result)
+                block_cipher_list = [D[block_addr]
+                                     for block_addr in prev_level_result]
             else:
-                block_cipher_list = (A[int_from_bytes(block_addr)]
-                                     for block_addr in prev_level_result)
-
-            block_plaintext_list = [self.config.ske.Decrypt(K2, block_cipher)
-                                    for block_cipher in block_cipher_list]
+                # fetch all blocks of the current level together,
+                # a persistent A can then sort and coalesce the reads
+                block_index_list = [int_from_bytes(block_addr) for block_addr in prev_level_result]
+                if hasattr(A, "get_batch"):
+                    block_cipher_list = A.get_batch(block_index_list)
+                else:
+                    block_cipher_list = [A[block_index] for block_index in block_index_list]
+
+            block_plaintext_list = self.config.ske.DecryptMany(K2, block_cipher_list)
             level_mark = block_plaintext_list[0][:1]
             is_in_file_id_level = (level_mark == LEVEL_FILE_IDENTIFIER)
 
@@ -228,6 +242,9 @@ class Pi2Lev(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: Pi2LevKey, keyword: bytes) -> Pi2LevToken:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: Pi2LevKey, keywords: typing.Iterable[bytes]) -> typing.List[Pi2LevToken]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: Pi2LevEncryptedDatabase,
                token: Pi2LevToken) -> Pi2LevResult:
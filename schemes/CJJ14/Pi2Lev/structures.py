@@ -11,9 +11,11 @@ LIB-SSE CODE
 @description: 
 """
 import pickle
+import typing
 
 from schemes.CJJ14.Pi2Lev.config import Pi2LevConfig, PI_2LEV_HEADER
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
+from toolkit.data_structures.label_table import LabelTable
 
 
 class Pi2LevKey(SSEKey):
@@ -42,18 +44,17 @@ class Pi2LevKey(SSEKey):
 
 
 class Pi2LevEncryptedDatabase(SSEEncryptedDatabase):
-    __slots__ = ["D", "A"]  # dict D, array A
+    __slots__ = ["D", "A"]  # dict D (a LabelTable), array A
+    container_tag = PI_2LEV_HEADER
 
-    def __init__(self, D: dict, A: list, config: Pi2LevConfig = None):
+    def __init__(self, D: typing.Mapping[bytes, bytes], A: list, config: Pi2LevConfig = None):
         super(Pi2LevEncryptedDatabase, self).__init__(config)
         self.D = D
         self.A = A
 
     @staticmethod
-    def create_dictionary_from_list(kv_pairs: list) -> dict:
-        kv_pairs.sort(key=lambda pair: pair[0])
-        D = {key: value for key, value in kv_pairs}
-        return D
+    def create_dictionary_from_list(kv_pairs: list) -> LabelTable:
+        return LabelTable.from_pairs(kv_pairs)
 
     def serialize(self) -> bytes:
         data = PI_2LEV_HEADER + pickle.dumps((self.D, self.A))
@@ -68,6 +69,13 @@ class Pi2LevEncryptedDatabase(SSEEncryptedDatabase):
         D, A = pickle.loads(data_bytes)
         return cls(D, A)
 
+    def container_sections(self) -> dict:
+        return {"D": self.D, "A": self.A}
+
+    @classmethod
+    def from_container_sections(cls, sections: dict, config: Pi2LevConfig = None):
+        return cls(sections["D"], sections["A"], config)
+
     def __eq__(self, other):
         if not isinstance(other, Pi2LevEncryptedDatabase):
             return False
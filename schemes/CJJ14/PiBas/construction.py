@@ -10,12 +10,40 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: ΠBas Construction described by Cash et al. [CJJ+14]
 """
+import multiprocessing.pool
 import os
+import typing
 
 import schemes.interface.inverted_index_sse
 from schemes.CJJ14.PiBas.config import DEFAULT_CONFIG, PiBasConfig
 from schemes.CJJ14.PiBas.structures import PiBasKey, PiBasToken, PiBasEncryptedDatabase, PiBasResult
 from toolkit.bytes_utils import int_to_bytes
+from toolkit.parallel import imap_with_progress, create_pool
+
+# The state shared by the worker processes of a parallel search, set by _init_worker
+_worker_config = None
+
+
+def _init_worker(config: PiBasConfig, D: dict):
+    global _worker_config
+    _worker_config = (config, D)
+
+
+def _search_stride(task: tuple) -> list:
+    """ Walk the counters start, start + stride, start + 2 * stride, ...
+    Since the counters of a keyword are contiguous, the walk terminates at the first missing counter.
+    """
+    config, D = _worker_config
+    K1, K2, start, stride = task
+    result = []
+    c = start
+    while True:
+        cipher = D.get(config.prf_f(K1, int_to_bytes(c)))
+        if cipher is None:
+            break
+        result.append(config.ske.Decrypt(K2, cipher))
+        c += stride
+    return result
 
 
 class PiBas(schemes.interface.inverted_index_sse.InvertedIndexSSE):
@@ -55,20 +83,49 @@ class PiBas(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         K2 = self.config.prf_f(K, b'\x02' + keyword)
         return PiBasToken(K1, K2)
 
+    def _TrapMany(self, K: PiBasKey, keywords: typing.Iterable[bytes]) -> typing.List[PiBasToken]:
+        """Trapdoor Generation Algorithm for several keywords, the PRF is keyed only once"""
+        K = K.K
+        keywords = list(keywords)
+        K1_list = self.config.prf_f.batch(K, [b'\x01' + keyword for keyword in keywords])
+        K2_list = self.config.prf_f.batch(K, [b'\x02' + keyword for keyword in keywords])
+        return [PiBasToken(K1, K2) for K1, K2 in zip(K1_list, K2_list)]
+
     def _Search(self, edb: PiBasEncryptedDatabase, tk: PiBasToken) -> PiBasResult:
         """Search Algorithm"""
+        return PiBasResult(list(self._SearchIter(edb, tk)))
+
+    def _SearchIter(self, edb: PiBasEncryptedDatabase, tk: PiBasToken) -> typing.Iterator[bytes]:
+        """Search Algorithm, yielding the identifiers one by one"""
         D = edb.D
         K1, K2 = tk.K1, tk.K2
-        result = []
         c = 0
         while True:
             addr = self.config.prf_f(K1, int_to_bytes(c))
             cipher = D.get(addr)
             if cipher is None:
                 break
-            result.append(self.config.ske.Decrypt(K2, cipher))
+            yield self.config.ske.Decrypt(K2, cipher)
             c += 1
 
+    def _SearchParallel(self,
+                        edb: PiBasEncryptedDatabase,
+                        tk: PiBasToken,
+                        worker_count: int,
+                        pool: typing.Optional[multiprocessing.pool.Pool] = None) -> PiBasResult:
+        """Search Algorithm, the counters are partitioned into worker_count strides walked by different workers"""
+        if worker_count <= 1:
+            return self._Search(edb, tk)
+
+        tasks = [(tk.K1, tk.K2, start, worker_count) for start in range(worker_count)]
+        stride_results = list(imap_with_progress(_search_stride, tasks, worker_count,
+                                                 initializer=_init_worker,
+                                                 initargs=(self.config, edb.D),
+                                                 pool=pool))
+        # the c-th identifier is the (c // worker_count)-th one of stride c % worker_count
+        result = [b''] * sum(map(len, stride_results))
+        for start, stride_result in enumerate(stride_results):
+            result[start::worker_count] = stride_result
         return PiBasResult(result)
 
     def KeyGen(self) -> PiBasKey:
@@ -84,7 +141,27 @@ class PiBas(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: PiBasKey, keyword: bytes) -> PiBasToken:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: PiBasKey, keywords: typing.Iterable[bytes]) -> typing.List[PiBasToken]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: PiBasEncryptedDatabase,
                token: PiBasToken) -> PiBasResult:
         return self._Search(edb, token)
+
+    def SearchIter(self,
+                   edb: PiBasEncryptedDatabase,
+                   token: PiBasToken) -> typing.Iterator[bytes]:
+        return self._SearchIter(edb, token)
+
+    def SearchParallel(self,
+                       edb: PiBasEncryptedDatabase,
+                       token: PiBasToken,
+                       worker_count: int = 1,
+                       pool: typing.Optional[multiprocessing.pool.Pool] = None) -> PiBasResult:
+        return self._SearchParallel(edb, token, worker_count, pool)
+
+    def CreateSearchPool(self,
+                         edb: PiBasEncryptedDatabase,
+                         worker_count: int) -> multiprocessing.pool.Pool:
+        return create_pool(worker_count, initializer=_init_worker, initargs=(self.config, edb.D))
@@ -11,9 +11,11 @@ LIB-SSE CODE
 @description: 
 """
 import pickle
+import typing
 
 from schemes.CJJ14.PiBas.config import PiBasConfig, PI_BAS_HEADER
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
+from toolkit.data_structures.label_table import LabelTable
 
 
 class PiBasKey(SSEKey):
@@ -40,16 +42,16 @@ class PiBasKey(SSEKey):
 
 
 class PiBasEncryptedDatabase(SSEEncryptedDatabase):
-    __slots__ = ["D"]  # dict D
+    __slots__ = ["D"]  # dict D, a LabelTable
+    container_tag = PI_BAS_HEADER
 
-    def __init__(self, D: dict, config: PiBasConfig = None):
+    def __init__(self, D: typing.Mapping[bytes, bytes], config: PiBasConfig = None):
         super(PiBasEncryptedDatabase, self).__init__(config)
         self.D = D
 
     @classmethod
     def build_from_list(cls, kv_pairs: list, config: PiBasConfig = None):
-        kv_pairs.sort(key=lambda pair: pair[0])
-        D = {key: value for key, value in kv_pairs}
+        D = LabelTable.from_pairs(kv_pairs)
         return cls(D, config)
 
     def serialize(self) -> bytes:
@@ -65,6 +67,13 @@ class PiBasEncryptedDatabase(SSEEncryptedDatabase):
         D = pickle.loads(data_bytes)
         return cls(D)
 
+    def container_sections(self) -> dict:
+        return {"D": self.D}
+
+    @classmethod
+    def from_container_sections(cls, sections: dict, config: PiBasConfig = None):
+        return cls(sections["D"], config)
+
     def __eq__(self, other):
         if not isinstance(other, PiBasEncryptedDatabase):
             return False
@@ -14,13 +14,42 @@ LIB-SSE CODE
 Here, we define the file identifier to start from 1,
 to eliminate the misunderstanding of the de-padding algorithm due to the misunderstanding of 0 as the padding value !!!
 """
+import multiprocessing.pool
 import os
+import typing
 
 import schemes.interface.inverted_index_sse
 from schemes.CJJ14.PiPack.config import DEFAULT_CONFIG, PiPackConfig
 from schemes.CJJ14.PiPack.structures import PiPackKey, PiPackToken, PiPackEncryptedDatabase, PiPackResult
 from toolkit.bytes_utils import int_to_bytes
 from toolkit.database_utils import partition_identifiers_to_blocks, parse_identifiers_from_block_given_identifier_size
+from toolkit.parallel import imap_with_progress, create_pool
+
+# The state shared by the worker processes of a parallel search, set by _init_worker
+_worker_config = None
+
+
+def _init_worker(config: PiPackConfig, D: dict):
+    global _worker_config
+    _worker_config = (config, D)
+
+
+def _search_stride(task: tuple) -> list:
+    """ Walk the counters start, start + stride, start + 2 * stride, ..., and return the identifier list of each block.
+    Since the counters of a keyword are contiguous, the walk terminates at the first missing counter.
+    """
+    config, D = _worker_config
+    K1, K2, start, stride = task
+    result = []
+    c = start
+    while True:
+        cipher = D.get(config.prf_f(K1, int_to_bytes(c)))
+        if cipher is None:
+            break
+        result.append(parse_identifiers_from_block_given_identifier_size(config.ske.Decrypt(K2, cipher),
+                                                                         config.param_identifier_size))
+        c += stride
+    return result
 
 
 class PiPack(schemes.interface.inverted_index_sse.InvertedIndexSSE):
@@ -63,22 +92,51 @@ class PiPack(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         K2 = self.config.prf_f(K, b'\x02' + keyword)
         return PiPackToken(K1, K2)
 
+    def _TrapMany(self, K: PiPackKey, keywords: typing.Iterable[bytes]) -> typing.List[PiPackToken]:
+        """Trapdoor Generation Algorithm for several keywords, the PRF is keyed only once"""
+        K = K.K
+        keywords = list(keywords)
+        K1_list = self.config.prf_f.batch(K, [b'\x01' + keyword for keyword in keywords])
+        K2_list = self.config.prf_f.batch(K, [b'\x02' + keyword for keyword in keywords])
+        return [PiPackToken(K1, K2) for K1, K2 in zip(K1_list, K2_list)]
+
     def _Search(self, edb: PiPackEncryptedDatabase, tk: PiPackToken) -> PiPackResult:
         """Search Algorithm"""
+        return PiPackResult(list(self._SearchIter(edb, tk)))
+
+    def _SearchIter(self, edb: PiPackEncryptedDatabase, tk: PiPackToken) -> typing.Iterator[bytes]:
+        """Search Algorithm, yielding the identifiers block by block"""
         D = edb.D
         K1, K2 = tk.K1, tk.K2
-        result = []
         c = 0
         while True:
             addr = self.config.prf_f(K1, int_to_bytes(c))
             cipher = D.get(addr)
             if cipher is None:
                 break
-            result.extend(parse_identifiers_from_block_given_identifier_size(self.config.ske.Decrypt(K2, cipher),
-                                                                             self.config.param_identifier_size))
+            yield from parse_identifiers_from_block_given_identifier_size(self.config.ske.Decrypt(K2, cipher),
+                                                                          self.config.param_identifier_size)
             c += 1
 
-        return PiPackResult(result)
+    def _SearchParallel(self,
+                        edb: PiPackEncryptedDatabase,
+                        tk: PiPackToken,
+                        worker_count: int,
+                        pool: typing.Optional[multiprocessing.pool.Pool] = None) -> PiPackResult:
+        """Search Algorithm, the counters are partitioned into worker_count strides walked by different workers"""
+        if worker_count <= 1:
+            return self._Search(edb, tk)
+
+        tasks = [(tk.K1, tk.K2, start, worker_count) for start in range(worker_count)]
+        stride_results = list(imap_with_progress(_search_stride, tasks, worker_count,
+                                                 initializer=_init_worker,
+                                                 initargs=(self.config, edb.D),
+                                                 pool=pool))
+        # the c-th block is the (c // worker_count)-th one of stride c % worker_count
+        block_list = [[]] * sum(map(len, stride_results))
+        for start, stride_result in enumerate(stride_results):
+            block_list[start::worker_count] = stride_result
+        return PiPackResult([identifier for block in block_list for identifier in block])
 
     def KeyGen(self) -> PiPackKey:
         key = self._Gen()
@@ -93,7 +151,27 @@ class PiPack(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: PiPackKey, keyword: bytes) -> PiPackToken:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: PiPackKey, keywords: typing.Iterable[bytes]) -> typing.List[PiPackToken]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: PiPackEncryptedDatabase,
                token: PiPackToken) -> PiPackResult:
         return self._Search(edb, token)
+
+    def SearchIter(self,
+                   edb: PiPackEncryptedDatabase,
+                   token: PiPackToken) -> typing.Iterator[bytes]:
+        return self._SearchIter(edb, token)
+
+    def SearchParallel(self,
+                       edb: PiPackEncryptedDatabase,
+                       token: PiPackToken,
+                       worker_count: int = 1,
+                       pool: typing.Optional[multiprocessing.pool.Pool] = None) -> PiPackResult:
+        return self._SearchParallel(edb, token, worker_count, pool)
+
+    def CreateSearchPool(self,
+                         edb: PiPackEncryptedDatabase,
+                         worker_count: int) -> multiprocessing.pool.Pool:
+        return create_pool(worker_count, initializer=_init_worker, initargs=(self.config, edb.D))
@@ -11,9 +11,11 @@ LIB-SSE CODE
 @description: 
 """
 import pickle
+import typing
 
 from schemes.CJJ14.PiPack.config import PiPackConfig, PI_PACK_HEADER
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
+from toolkit.data_structures.label_table import LabelTable
 
 
 class PiPackKey(SSEKey):
@@ -42,16 +44,16 @@ class PiPackKey(SSEKey):
 
 
 class PiPackEncryptedDatabase(SSEEncryptedDatabase):
-    __slots__ = ["D"]  # dict D
+    __slots__ = ["D"]  # dict D, a LabelTable
+    container_tag = PI_PACK_HEADER
 
-    def __init__(self, D: dict, config: PiPackConfig = None):
+    def __init__(self, D: typing.Mapping[bytes, bytes], config: PiPackConfig = None):
         super(PiPackEncryptedDatabase, self).__init__(config)
         self.D = D
 
     @classmethod
     def build_from_list(cls, kv_pairs: list, config: PiPackConfig = None):
-        kv_pairs.sort(key=lambda pair: pair[0])
-        D = {key: value for key, value in kv_pairs}
+        D = LabelTable.from_pairs(kv_pairs)
         return cls(D, config)
 
     def serialize(self) -> bytes:
@@ -67,6 +69,13 @@ class PiPackEncryptedDatabase(SSEEncryptedDatabase):
         D = pickle.loads(data_bytes)
         return cls(D)
 
+    def container_sections(self) -> dict:
+        return {"D": self.D}
+
+    @classmethod
+    def from_container_sections(cls, sections: dict, config: PiPackConfig = None):
+        return cls(sections["D"], config)
+
     def __eq__(self, other):
         if not isinstance(other, PiPackEncryptedDatabase):
             return False
@@ -16,7 +16,7 @@ to eliminate the misunderstanding of the de-padding algorithm due to the misunde
 """
 import math
 import os
-import random
+import typing
 
 import schemes.interface.inverted_index_sse
 from schemes.CJJ14.PiPtr.config import DEFAULT_CONFIG, PiPtrConfig
@@ -24,6 +24,7 @@ from schemes.CJJ14.PiPtr.structures import PiPtrKey, PiPtrToken, PiPtrEncryptedD
 from toolkit.bytes_utils import int_to_bytes, int_from_bytes
 from toolkit.database_utils import partition_identifiers_to_blocks, parse_identifiers_from_block_given_entry_count_in_one_block, \
     parse_identifiers_from_block_given_identifier_size
+from toolkit.slot_allocator import PRPSlotAllocator
 
 
 class PiPtr(schemes.interface.inverted_index_sse.InvertedIndexSSE):
@@ -49,7 +50,8 @@ class PiPtr(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         A_len = sum(math.ceil(len(database[keyword]) / self.config.param_B) for keyword in database) + 1
         A = [None] * A_len
         index_size_in_A = math.ceil(math.log2(A_len) / 8)  # Fixed size of the index of A
-        available_pos_list = random.sample(range(1, A_len), A_len - 1)  # index of A start at 1 !!
+        # index of A start at 1 !!
+        slot_allocator = PRPSlotAllocator(A_len - 1, first_slot=1, key=os.urandom(self.config.param_lambda))
 
         for keyword in database:
             K1 = self.config.prf_f(K, b'\x01' + keyword)
@@ -61,7 +63,7 @@ class PiPtr(schemes.interface.inverted_index_sse.InvertedIndexSSE):
             for j, file_id_block in enumerate(file_id_block_list):
                 # store id blocks in array A
 
-                index_in_A = available_pos_list.pop()  # Choose random empty index
+                index_in_A = slot_allocator.allocate()  # Choose random empty index
                 index_list_in_A.append(int_to_bytes(index_in_A, output_len=index_size_in_A))
 
                 d = self.config.ske.Encrypt(K2, file_id_block)
@@ -84,13 +86,24 @@ class PiPtr(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         K2 = self.config.prf_f(K, b'\x02' + keyword)
         return PiPtrToken(K1, K2)
 
+    def _TrapMany(self, K: PiPtrKey, keywords: typing.Iterable[bytes]) -> typing.List[PiPtrToken]:
+        """Trapdoor Generation Algorithm for several keywords, the PRF is keyed only once"""
+        K = K.K
+        keywords = list(keywords)
+        K1_list = self.config.prf_f.batch(K, [b'\x01' + keyword for keyword in keywords])
+        K2_list = self.config.prf_f.batch(K, [b'\x02' + keyword for keyword in keywords])
+        return [PiPtrToken(K1, K2) for K1, K2 in zip(K1_list, K2_list)]
+
     def _Search(self, edb: PiPtrEncryptedDatabase, tk: PiPtrToken) -> PiPtrResult:
         """Search Algorithm"""
+        return PiPtrResult(list(self._SearchIter(edb, tk)))
+
+    def _SearchIter(self, edb: PiPtrEncryptedDatabase, tk: PiPtrToken) -> typing.Iterator[bytes]:
+        """Search Algorithm, yielding the identifiers block by block"""
         D = edb.D
         A = edb.A
         K1, K2 = tk.K1, tk.K2
         index_list = []
-        result = []
 
         c = 0
         while True:
@@ -106,11 +119,8 @@ class PiPtr(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         for index_in_A in index_list:
             file_id_block_cipher = A[int_from_bytes(index_in_A)]  # need to convert bytes to int
             file_id_block = self.config.ske.Decrypt(K2, file_id_block_cipher)
-            result.extend(parse_identifiers_from_block_given_identifier_size(file_id_block,
-                                                                             self.config.param_identifier_size))
-            pass
-
-        return PiPtrResult(result)
+            yield from parse_identifiers_from_block_given_identifier_size(file_id_block,
+                                                                          self.config.param_identifier_size)
 
     def KeyGen(self) -> PiPtrKey:
         key = self._Gen()
@@ -125,7 +135,15 @@ class PiPtr(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: PiPtrKey, keyword: bytes) -> PiPtrToken:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: PiPtrKey, keywords: typing.Iterable[bytes]) -> typing.List[PiPtrToken]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: PiPtrEncryptedDatabase,
                token: PiPtrToken) -> PiPtrResult:
         return self._Search(edb, token)
+
+    def SearchIter(self,
+                   edb: PiPtrEncryptedDatabase,
+                   token: PiPtrToken) -> typing.Iterator[bytes]:
+        return self._SearchIter(edb, token)
@@ -11,9 +11,11 @@ LIB-SSE CODE
 @description: 
 """
 import pickle
+import typing
 
 from schemes.CJJ14.PiPtr.config import PiPtrConfig, PI_PTR_HEADER
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
+from toolkit.data_structures.label_table import LabelTable
 
 
 class PiPtrKey(SSEKey):
@@ -42,18 +44,17 @@ class PiPtrKey(SSEKey):
 
 
 class PiPtrEncryptedDatabase(SSEEncryptedDatabase):
-    __slots__ = ["D", "A"]  # dict D, array A
+    __slots__ = ["D", "A"]  # dict D (a LabelTable), array A
+    container_tag = PI_PTR_HEADER
 
-    def __init__(self, D: dict, A: list, config: PiPtrConfig = None):
+    def __init__(self, D: typing.Mapping[bytes, bytes], A: list, config: PiPtrConfig = None):
         super(PiPtrEncryptedDatabase, self).__init__(config)
         self.D = D
         self.A = A
 
     @staticmethod
-    def create_dictionary_from_list(kv_pairs: list) -> dict:
-        kv_pairs.sort(key=lambda pair: pair[0])
-        D = {key: value for key, value in kv_pairs}
-        return D
+    def create_dictionary_from_list(kv_pairs: list) -> LabelTable:
+        return LabelTable.from_pairs(kv_pairs)
 
     def serialize(self) -> bytes:
         data = PI_PTR_HEADER + pickle.dumps((self.D, self.A))
@@ -68,6 +69,13 @@ class PiPtrEncryptedDatabase(SSEEncryptedDatabase):
         D, A = pickle.loads(data_bytes)
         return cls(D, A)
 
+    def container_sections(self) -> dict:
+        return {"D": self.D, "A": self.A}
+
+    @classmethod
+    def from_container_sections(cls, sections: dict, config: PiPtrConfig = None):
+        return cls(sections["D"], sections["A"], config)
+
     def __eq__(self, other):
         if not isinstance(other, PiPtrEncryptedDatabase):
             return False
@@ -10,16 +10,38 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: Π Construction described by Cash et al. [CT14]
 """
-import copy
 import math
+import multiprocessing.pool
 import os
-import random
+import typing
 
 import schemes.interface.inverted_index_sse
 from schemes.CT14.Pi.config import DEFAULT_CONFIG, PiConfig
 from schemes.CT14.Pi.structures import PiKey, PiToken, PiEncryptedDatabase, PiResult
 from toolkit.bytes_utils import int_to_bytes
-from toolkit.database_utils import get_total_size, parse_identifiers_from_block_given_entry_count_in_one_block
+from toolkit.database_utils import get_total_size, parse_identifiers_from_block_given_entry_count_in_one_block, \
+    iterate_padded_database, parse_identifiers_from_block_given_identifier_size
+from toolkit.parallel import imap_with_progress, split_into_ranges, create_pool
+
+# The state shared by the worker processes of a parallel search, set by _init_worker
+_worker_config = None
+
+
+def _init_worker(config: PiConfig, HT_list: list):
+    global _worker_config
+    _worker_config = (config, HT_list)
+
+
+def _decrypt_block_slice(task: tuple) -> list:
+    """ Decrypt the entries [begin, end) of the block labeled l in the i-th level, which has 2 ** i entries
+    """
+    config, HT_list = _worker_config
+    K1, i, l, begin, end = task
+    block = HT_list[i].get(l)
+    entry_size = len(block) >> i
+    return [config.ske.Decrypt(K1, cipher)
+            for cipher in parse_identifiers_from_block_given_identifier_size(
+                block[begin * entry_size: end * entry_size], entry_size)]
 
 
 class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
@@ -44,45 +66,40 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         N = get_total_size(database)
         t = math.ceil(math.log2(N))
 
-        padded_database = copy.deepcopy(database)  # need to deep copy!! Otherwise, it will affect the original database
+        L_list = [[] for _ in range(t)]  # t empty lists L0, L1, ... , Lt−1
+        cipher_len = len(self.config.ske.Encrypt(b"\x00" * self.config.param_k_prime,
+                                                 b"\x00" * self.config.param_identifier_size))
 
         # If N is not a power of two, we need to pad DB to
         # satisfy this by adding some dummy keyword-identifier pairs.
-        while N < 2 ** t:
-            random_keyword = os.urandom(32)
-            random_id_list_len = random.randint(1, (2 ** t) - N)
-            random_id_list = [os.urandom(self.config.param_identifier_size) for _ in range(random_id_list_len)]
-            padded_database[random_keyword] = random_id_list
-
-            N += random_id_list_len
-
-        L_list = [[] for _ in range(t)]  # t empty lists L0, L1, ... , Lt−1
-
-        for keyword in padded_database:
-            Kw0_concat_Kw1 = self.config.prf_f(K, keyword)
-            Kw0, Kw1 = Kw0_concat_Kw1[:self.config.param_k], Kw0_concat_Kw1[self.config.param_k:]
+        for keyword, identifier_list, list_len in iterate_padded_database(database, 2 ** t):
+            if keyword is not None:
+                Kw0_concat_Kw1 = self.config.prf_f(K, keyword)
+                Kw0, Kw1 = Kw0_concat_Kw1[:self.config.param_k], Kw0_concat_Kw1[self.config.param_k:]
 
             c = 0
-            for j in range(int(math.log2(len(padded_database[keyword]))), -1, -1):
-                if 2 ** j > len(padded_database[keyword]) - c:
+            for j in range(int(math.log2(list_len)), -1, -1):
+                if 2 ** j > list_len - c:
                     continue
-                cipher_list = [self.config.ske.Encrypt(Kw1, padded_database[keyword][i]) for i in
-                               range(c, c + 2 ** j)]
-                d = b''.join(cipher_list)
-                l = self.config.prf_f_prime(Kw0, int_to_bytes(j))
+                if keyword is not None:
+                    cipher_list = [self.config.ske.Encrypt(Kw1, identifier_list[i]) for i in range(c, c + 2 ** j)]
+                    d = b''.join(cipher_list)
+                    l = self.config.prf_f_prime(Kw0, int_to_bytes(j))
+                else:  # dummy keyword, generate the random block directly
+                    d = os.urandom((2 ** j) * cipher_len)
+                    l = os.urandom(self.config.param_l)
                 L_list[j].append((l, d))
                 c += 2 ** j
 
         # padding each list
         for i in range(t):
-            d_len = (2 ** i) * len(self.config.ske.Encrypt(b"\x00" * self.config.param_k_prime,
-                                                           b"\x00" * self.config.param_identifier_size))
+            d_len = (2 ** i) * cipher_len
             L_list[i].extend(
                 ((os.urandom(self.config.param_l), os.urandom(d_len)) for _ in range((2 ** (t - i)) - len(L_list[i]))))
         # create HT_0, ..., HT_{t-1}
         HT_list = []
         for i in range(t):
-            HT_list.append(PiEncryptedDatabase.create_hash_table(L_list[i]))
+            HT_list.append(PiEncryptedDatabase.create_level_table(L_list[i]))
 
         return PiEncryptedDatabase(HT_list, self.config)
 
@@ -93,6 +110,11 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         K0, K1 = K0_concat_K1[:self.config.param_k], K0_concat_K1[self.config.param_k:]
         return PiToken(K0, K1)
 
+    def _TrapMany(self, K: PiKey, keywords: typing.Iterable[bytes]) -> typing.List[PiToken]:
+        """Trapdoor Generation Algorithm for several keywords, the PRF is keyed only once"""
+        return [PiToken(K0_concat_K1[:self.config.param_k], K0_concat_K1[self.config.param_k:])
+                for K0_concat_K1 in self.config.prf_f.batch(K.K, keywords)]
+
     def _Search(self, edb: PiEncryptedDatabase, tk: PiToken) -> PiResult:
         """Search Algorithm"""
         HT_list = edb.HT_list
@@ -108,6 +130,29 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
 
         return PiResult(result)
 
+    def _SearchParallel(self,
+                        edb: PiEncryptedDatabase,
+                        tk: PiToken,
+                        worker_count: int,
+                        pool: typing.Optional[multiprocessing.pool.Pool] = None) -> PiResult:
+        """Search Algorithm, each block found is sliced into worker_count parts decrypted by different workers"""
+        if worker_count <= 1:
+            return self._Search(edb, tk)
+
+        HT_list = edb.HT_list
+        tasks = []
+        for i in range(len(HT_list) - 1, -1, -1):
+            l = self.config.prf_f_prime(tk.K0, int_to_bytes(i))
+            if l in HT_list[i]:
+                tasks.extend((tk.K1, i, l, begin, end) for begin, end in split_into_ranges(2 ** i, worker_count))
+        result = []
+        for slice_result in imap_with_progress(_decrypt_block_slice, tasks, min(worker_count, len(tasks)),
+                                               initializer=_init_worker,
+                                               initargs=(self.config, HT_list),
+                                               pool=pool):
+            result.extend(slice_result)
+        return PiResult(result)
+
     def KeyGen(self) -> PiKey:
         key = self._Gen()
         return key
@@ -121,7 +166,22 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: PiKey, keyword: bytes) -> PiToken:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: PiKey, keywords: typing.Iterable[bytes]) -> typing.List[PiToken]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: PiEncryptedDatabase,
                token: PiToken) -> PiResult:
         return self._Search(edb, token)
+
+    def SearchParallel(self,
+                       edb: PiEncryptedDatabase,
+                       token: PiToken,
+                       worker_count: int = 1,
+                       pool: typing.Optional[multiprocessing.pool.Pool] = None) -> PiResult:
+        return self._SearchParallel(edb, token, worker_count, pool)
+
+    def CreateSearchPool(self,
+                         edb: PiEncryptedDatabase,
+                         worker_count: int) -> multiprocessing.pool.Pool:
+        return create_pool(worker_count, initializer=_init_worker, initargs=(self.config, edb.HT_list))
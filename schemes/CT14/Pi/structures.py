@@ -14,6 +14,7 @@ import pickle
 
 from schemes.CT14.Pi.config import PiConfig, PI_HEADER
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
+from toolkit.data_structures.level_table import LevelTable
 
 
 class PiKey(SSEKey):
@@ -41,6 +42,7 @@ class PiKey(SSEKey):
 
 class PiEncryptedDatabase(SSEEncryptedDatabase):
     __slots__ = ["HT_list"]  # dict D
+    container_tag = PI_HEADER
 
     def __init__(self, HT_list: list, config: PiConfig = None):
         super(PiEncryptedDatabase, self).__init__(config)
@@ -52,6 +54,13 @@ class PiEncryptedDatabase(SSEEncryptedDatabase):
         D = {key: value for key, value in kv_pairs}
         return D
 
+    @classmethod
+    def create_level_table(cls, kv_pairs: list) -> LevelTable:
+        """ All labels and values of a level are of fixed size,
+        so they are stored in a sorted label buffer and a contiguous value buffer, instead of a dict.
+        """
+        return LevelTable.from_pairs(kv_pairs)
+
     def serialize(self) -> bytes:
         data = PI_HEADER + pickle.dumps(self.HT_list)
         return data
@@ -65,6 +74,13 @@ class PiEncryptedDatabase(SSEEncryptedDatabase):
         HT_list = pickle.loads(data_bytes)
         return cls(HT_list, config)
 
+    def container_sections(self) -> dict:
+        return {f"HT_list[{i}]": table for i, table in enumerate(self.HT_list)}
+
+    @classmethod
+    def from_container_sections(cls, sections: dict, config: PiConfig = None):
+        return cls([sections[f"HT_list[{i}]"] for i in range(len(sections))], config)
+
     def __eq__(self, other):
         if not isinstance(other, PiEncryptedDatabase):
             return False
@@ -36,7 +36,13 @@ DEFAULT_CONFIG = {
     "param_identifier_size": 8,
     "rnd": "AES-CBC",
     "prf_f": "HmacPRF",
-    "hash_h": "SHA1"
+    "hash_h": "SHA1",
+
+    # If set, each level Ai is stored on disk at param_storage_path + "_A_" + i, with page-aligned buckets,
+    # otherwise, the levels are kept in memory
+    "param_storage_path": None,
+    # The number of worker processes used to encrypt the buckets, 1 means encrypting in the current process
+    "param_worker_count": 1,
 }
 
 
@@ -44,7 +50,7 @@ class PiConfig(SSEConfig):
     __slots__ = [
         "param_lambda", "param_s", "param_L", "param_identifier_size", "rnd",
         "prf_f", "hash_h", "param_identifier_cipher_len",
-        "param_hash_h_digest_size"
+        "param_hash_h_digest_size", "param_storage_path", "param_worker_count"
     ]
 
     DEFAULT_CONFIG = DEFAULT_CONFIG
@@ -64,6 +70,8 @@ class PiConfig(SSEConfig):
             "param_actual_storage_level_ratio")
         self.param_L = config_dict.get("param_L")
         self.param_identifier_size = config_dict.get("param_identifier_size")
+        self.param_storage_path = config_dict.get("param_storage_path")  # optional
+        self.param_worker_count = config_dict.get("param_worker_count", 1)  # optional
 
         self.rnd = toolkit.symmetric_encryption.get_symmetric_encryption_implementation(
             config_dict.get("rnd", ""))(key_length=self.param_lambda)
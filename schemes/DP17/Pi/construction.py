@@ -20,7 +20,32 @@ import toolkit.list_utils
 from schemes.DP17.Pi.config import DEFAULT_CONFIG, PiConfig
 from schemes.DP17.Pi.structures import PiKey, PiToken, PiEncryptedDatabase, PiResult
 from toolkit.bytes_utils import int_to_bytes, bytes_xor, int_from_bytes
+from toolkit.data_structures.random_access_set import RandomAccessSet
 from toolkit.database_utils import get_total_size
+from toolkit.parallel import imap_with_progress, ProgressCallback
+
+BUCKET_TASK_CHUNK_SIZE = 64  # the number of buckets sent to a worker at once
+
+# The config used by the tasks below, it is set by _init_worker in each worker process
+_worker_config: PiConfig = None
+
+
+def _init_worker(config: PiConfig):
+    global _worker_config
+    _worker_config = config
+
+
+def _materialize_bucket(task) -> bytes:
+    """ Pad a bucket with dummy entries, permute it randomly,
+    and replace each entry (w, id) with RND.Enc(key, id||0^λ) where key = F(k3, w).
+    :param task: (the (F(k3, w), id) pairs stored in the bucket, the number of dummy entries)
+    """
+    etag_id_pair_list, dummy_count = task
+    cipher_len, zeros = _worker_config.param_identifier_cipher_len, b"\x00" * _worker_config.param_lambda
+    entries = etag_id_pair_list + [None] * dummy_count
+    random.shuffle(entries)
+    return b"".join(os.urandom(cipher_len) if entry is None else _worker_config.rnd.Encrypt(entry[0], entry[1] + zeros)
+                    for entry in entries)
 
 
 def _divide_to_buckets(array_size: int, bucket_size: int) -> (typing.List[int],
@@ -39,10 +64,11 @@ def _divide_to_buckets(array_size: int, bucket_size: int) -> (typing.List[int],
 class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     """Pi Construction described by Demertzis et al. [DP17]"""
 
-    def __init__(self, config: dict = DEFAULT_CONFIG):
+    def __init__(self, config: dict = DEFAULT_CONFIG, progress_callback: ProgressCallback = None):
         super(Pi, self).__init__()
         self.config = PiConfig(config)
-        pass
+        # If not None, it is called as progress_callback(stage, finished_task_num, total_task_num) during EDBSetup
+        self.progress_callback = progress_callback
 
     def _find_adjacent_i(self, db_w_len: int, levels_list: typing.List[int]) -> int:
         """
@@ -61,15 +87,16 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
 
     def _get_remaining_enough_space_buckets(self,
                                             chunk_size: int,
-                                            remaining_list: typing.List[int]) -> typing.List[int]:
+                                            remaining_list: typing.List[int]) -> RandomAccessSet:
         """
-        returns the set of buckets in Ai that have enough space for chunk c
+        returns the set of buckets in Ai that have enough space for chunk c.
+        The caller keeps it updated when the remaining space of a bucket changes,
+        so that the set is built only once for each level.
         :param: chunk_size the size of chunk c
         :param: remaining_list space remaining for each element of the array Ai
         """
-        for bucket_index, bucket_remaining in enumerate(remaining_list):
-            if bucket_remaining >= chunk_size:
-                yield bucket_index
+        return RandomAccessSet(bucket_index for bucket_index, bucket_remaining in enumerate(remaining_list)
+                               if bucket_remaining >= chunk_size)
 
     def _Gen(self) -> PiKey:
         """
@@ -94,16 +121,21 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         HT = {}
 
         level_to_remaining_count_list_map = {}  # level -> remaining count in each bucket
-        level_to_w_id_pair_list_map = {}  # level -> (w, id) pairs in each bucket
+        level_to_w_id_pair_list_map = {}  # level -> (F(k3, w), id) pairs in each bucket
+
+        level_to_enough_space_buckets_map = {}  # level -> buckets having enough space for a chunk of size 2^i
 
         for i in levels:  # each evenly distributed level i ∈ L
             level_to_remaining_count_list_map[i], level_to_w_id_pair_list_map[i] = _divide_to_buckets(
                 2 * N + 2 ** (i + 1), 2 ** (i + 1))
+            level_to_enough_space_buckets_map[i] = self._get_remaining_enough_space_buckets(
+                2 ** i, level_to_remaining_count_list_map[i])
 
         for keyword in database:
             # Find adjacent j and i in L such that L· 2j < |D(w)| ≤ L· 2i
             # (if i is the smallest level, we ignore the lower bound)
             i = self._find_adjacent_i(len(database[keyword]), levels)
+            etag = self.config.prf_f(k3, keyword)  # the key to encrypt the entries of w
 
             # Split D(w) into a set C_w of chunks containing q_w chunks of size 2i and one chunk of size r_w < 2^i.
             Cw = toolkit.list_utils.chunks(database[keyword], 2 ** i)
@@ -111,13 +143,12 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
             for c in Cw:
                 count += 1
                 # A is the set of buckets in Ai that have enough space for chunk
-                A = list(self._get_remaining_enough_space_buckets(2 ** i,
-                                                                  level_to_remaining_count_list_map[i]))
+                A = level_to_enough_space_buckets_map[i]
                 # Pick one bucket a ∈ A (say Ai[x]) uniformly at random
-                x = random.choice(A)
+                x = A.choice()
                 for identifier in c:
                     # store c in a at the first available position.
-                    level_to_w_id_pair_list_map[i][x].append((keyword, identifier))
+                    level_to_w_id_pair_list_map[i][x].append((etag, identifier))
 
                     # HT.add(H(Fk1(w)||count), [i||x] ⊕ H(Fk2(w)||count))
                     key = self.config.hash_h(self.config.prf_f(k1, keyword) + int_to_bytes(count))
@@ -129,33 +160,45 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
                     HT[key] = bytes_xor(i_concat_x,
                                         self.config.hash_h(self.config.prf_f(k2, keyword) + int_to_bytes(count)))
                 level_to_remaining_count_list_map[i][x] -= len(c)
+                if level_to_remaining_count_list_map[i][x] < 2 ** i:
+                    A.discard(x)
 
         # Add random (key, value) pairs to HT so that the total number of elements it stores is N.
         for _ in range(N - len(HT)):
             HT[os.urandom(self.config.param_hash_h_digest_size)] = os.urandom(self.config.param_hash_h_digest_size)
 
-        A_dict = {}
-        for i in levels:
-            Ai = []
-            for bucket_index, w_id_pair_list in enumerate(level_to_w_id_pair_list_map[i]):
-                for _ in range(level_to_remaining_count_list_map[i][bucket_index]):
-                    w_id_pair_list.append((None, None))
-
-                # Randomly permute all entries (w, id) within b
-                random.shuffle(w_id_pair_list)
-                cipher_list = []
-                # Replace each entry (w, id) of b with RND.Enckey(id||0λ) where key = Fk3 (w).
-                for keyword, identifier in w_id_pair_list:
-                    if keyword is None and identifier is None:
-                        cipher_list.append(os.urandom(self.config.param_identifier_cipher_len))
-                    else:
-                        cipher_list.append(self.config.rnd.Encrypt(self.config.prf_f(k3, keyword),
-                                                                   identifier + b"\x00" * self.config.param_lambda))
-                chunk_bytes = b"".join(cipher_list)
-                Ai.append(chunk_bytes)
-            A_dict[i] = Ai
-
-        return PiEncryptedDatabase(HT, A_dict)
+        # The placement is fixed now, so the buckets can be materialized independently
+        bucket_location_list = [(i, bucket_index) for i in levels
+                                for bucket_index in range(len(level_to_w_id_pair_list_map[i]))]
+        bucket_task_iter = ((level_to_w_id_pair_list_map[i][bucket_index],
+                             level_to_remaining_count_list_map[i][bucket_index])
+                            for i, bucket_index in bucket_location_list)
+        bucket_cipher_iter = imap_with_progress(_materialize_bucket,
+                                                bucket_task_iter,
+                                                self.config.param_worker_count,
+                                                initializer=_init_worker,
+                                                initargs=(self.config,),
+                                                chunk_size=BUCKET_TASK_CHUNK_SIZE,
+                                                stage="bucket",
+                                                total=len(bucket_location_list),
+                                                progress_callback=self.progress_callback)
+
+        bucket_size_map = {i: 2 ** (i + 1) * self.config.param_identifier_cipher_len for i in levels}
+        A_dict = {i: PiEncryptedDatabase.create_level_array(self.config,
+                                                            i,
+                                                            len(level_to_w_id_pair_list_map[i]),
+                                                            bucket_size_map[i])
+                  for i in levels}
+        is_persistent = self.config.param_storage_path is not None
+        for (i, bucket_index), bucket_bytes in zip(bucket_location_list, bucket_cipher_iter):
+            if is_persistent and len(bucket_bytes) < bucket_size_map[i]:
+                # All buckets of a level have the same size on disk, so the last bucket is filled with dummy entries
+                bucket_bytes += os.urandom(bucket_size_map[i] - len(bucket_bytes))
+            A_dict[i][bucket_index] = bucket_bytes
+
+        edb = PiEncryptedDatabase(HT, A_dict)
+        edb.sync()
+        return edb
 
     def _Trap(self, K: PiKey, keyword: bytes) -> PiToken:
         """Trapdoor Generation Algorithm"""
@@ -166,11 +209,19 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
         etag = self.config.prf_f(k3, keyword)
         return PiToken(tag, vtag, etag)
 
+    def _TrapMany(self, K: PiKey, keywords: typing.Iterable[bytes]) -> typing.List[PiToken]:
+        """Trapdoor Generation Algorithm for several keywords, each PRF is keyed only once"""
+        keywords = list(keywords)
+        tag_list = self.config.prf_f.batch(K.k1, keywords)
+        vtag_list = self.config.prf_f.batch(K.k2, keywords)
+        etag_list = self.config.prf_f.batch(K.k3, keywords)
+        return [PiToken(tag, vtag, etag) for tag, vtag, etag in zip(tag_list, vtag_list, etag_list)]
+
     def _Search(self, edb: PiEncryptedDatabase, tk: PiToken) -> PiResult:
         """Search Algorithm"""
         HT, A_dict = edb.HT, edb.A_dict
         tag, vtag, etag = tk.tag, tk.vtag, tk.etag
-        result = set()
+        bucket_location_set = set()  # (i, offset) of the buckets to be decrypted
 
         for count in range(1, self.config.param_L + 1):  # for count = 1 to L do
             # evalue ← HT.get(H(tag||count))
@@ -183,15 +234,18 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
 
                 i = int_from_bytes(i_bytes)
                 offset = int_from_bytes(offset_bytes)
+                bucket_location_set.add((i, offset))
 
-                for e in toolkit.list_utils.chunks(A_dict[i][offset], self.config.param_identifier_cipher_len):
-                    try:
-                        plaintext = self.config.rnd.Decrypt(etag, e)
-                        if plaintext[-self.config.param_lambda:] == b"\x00" * self.config.param_lambda:
-                            identifier = plaintext[:-self.config.param_lambda]
-                            result.add(identifier)
-                    except ValueError:
-                        continue
+        # Decrypt all entries of the buckets under etag at once,
+        # the entries of other keywords give None or a plaintext without the zero tag
+        zero_tag = b"\x00" * self.config.param_lambda
+        plaintext_list = self.config.rnd.DecryptConcatenated(
+            etag,
+            b"".join(A_dict[i][offset] for i, offset in bucket_location_set),
+            self.config.param_identifier_cipher_len)
+        result = {plaintext[:-self.config.param_lambda] for plaintext in plaintext_list
+                  if plaintext is not None and plaintext.endswith(zero_tag)
+                  and len(plaintext) == self.config.param_identifier_size + self.config.param_lambda}
 
         return PiResult(result)
 
@@ -208,6 +262,9 @@ class Pi(schemes.interface.inverted_index_sse.InvertedIndexSSE):
     def TokenGen(self, key: PiKey, keyword: bytes) -> PiToken:
         return self._Trap(key, keyword)
 
+    def TokenGenMany(self, key: PiKey, keywords: typing.Iterable[bytes]) -> typing.List[PiToken]:
+        return self._TrapMany(key, keywords)
+
     def Search(self,
                edb: PiEncryptedDatabase,
                token: PiToken) -> PiResult:
@@ -13,6 +13,8 @@ LIB-SSE CODE
 import pickle
 import typing
 
+from data_persistence.interfaces import PersistentFixedLengthBytesArray
+from data_persistence.page_aligned_array import PageAlignedBytesArray
 from schemes.DP17.Pi.config import PiConfig, PI_HEADER
 from schemes.interface.structures import SSEKey, SSEEncryptedDatabase, SSEToken, SSEResult
 from toolkit.bytes_utils import split_bytes_given_slice_len
@@ -50,18 +52,43 @@ class PiKey(SSEKey):
 
 
 class PiEncryptedDatabase(SSEEncryptedDatabase):
+    """ The levels Ai are lists of buckets kept in memory by default,
+    or stored on disk if the parameter param_storage_path is set.
+    On disk, each level is a file (PageAlignedBytesArray) whose buckets begin at page boundaries,
+    so that reading a bucket is one positional read.
+    """
     __slots__ = ["HT", "A_dict"]
 
     def __init__(self,
                  HT: dict,
-                 A_dict: typing.Dict[int, typing.List[bytes]],
+                 A_dict: typing.Dict[int, typing.Sequence[bytes]],
                  config: PiConfig = None):
         super(PiEncryptedDatabase, self).__init__(config)
         self.HT = HT
         self.A_dict = A_dict
 
+    @staticmethod
+    def create_level_array(config: PiConfig,
+                           level: int,
+                           bucket_count: int,
+                           bucket_size: int) -> typing.MutableSequence[bytes]:
+        """ Create the array of buckets of the given level, where a bucket has at most bucket_size bytes.
+        """
+        if config is None or config.param_storage_path is None:
+            return [b""] * bucket_count
+        return PageAlignedBytesArray.create(f"{config.param_storage_path}_A_{level}",
+                                            item_size=bucket_size,
+                                            array_len=bucket_count)
+
+    def sync(self):
+        """ Flush the levels to disk if they are persistent.
+        """
+        for Ai in self.A_dict.values():
+            if isinstance(Ai, PersistentFixedLengthBytesArray):
+                Ai.sync()
+
     def serialize(self) -> bytes:
-        data = PI_HEADER + pickle.dumps((self.HT, self.A_dict))
+        data = PI_HEADER + pickle.dumps((self.HT, {i: list(Ai) for i, Ai in self.A_dict.items()}))
         return data
 
     @classmethod
@@ -70,12 +97,19 @@ class PiEncryptedDatabase(SSEEncryptedDatabase):
             raise ValueError("Parse header error.")
 
         HT, A_dict = pickle.loads(xbytes[len(PI_HEADER):])
+        if config is not None and config.param_storage_path is not None:
+            for i, Ai in A_dict.items():
+                A_dict[i] = PageAlignedBytesArray.from_list(Ai, f"{config.param_storage_path}_A_{i}")
         return cls(HT, A_dict, config=config)
 
     def __eq__(self, other):
         if not isinstance(other, PiEncryptedDatabase):
             return False
-        return self.HT == other.HT and self.A_dict == other.A_dict
+        if self.HT != other.HT or self.A_dict.keys() != other.A_dict.keys():
+            return False
+        return all(len(self.A_dict[i]) == len(other.A_dict[i]) and
+                   all(bucket == other_bucket for bucket, other_bucket in zip(self.A_dict[i], other.A_dict[i]))
+                   for i in self.A_dict)
 
 
 class PiToken(SSEToken):
@@ -12,6 +12,8 @@ LIB-SSE CODE
 """
 
 import abc
+import multiprocessing.pool
+import typing
 
 from schemes.interface.structures import SSEKey, SSEToken, SSEEncryptedDatabase, SSEResult
 
@@ -45,8 +47,48 @@ class InvertedIndexSSE(metaclass=abc.ABCMeta):
                  keyword: bytes) -> SSEToken:  # todo keyword abstraction, now is single-keyword
         pass
 
+    def TokenGenMany(self,
+                     key: SSEKey,
+                     keywords: typing.Iterable[bytes]) -> typing.List[SSEToken]:
+        """Generate the tokens of several keywords, the tokens are in the order of the keywords.
+        The concrete scheme can override this method to share the setup work, e.g. the keyed PRF state."""
+        return [self.TokenGen(key, keyword) for keyword in keywords]
+
     @abc.abstractmethod
     def Search(self,
                edb: SSEEncryptedDatabase,
                token: SSEToken) -> SSEResult:
         pass
+
+    def SearchIter(self,
+                   edb: SSEEncryptedDatabase,
+                   token: SSEToken) -> typing.Iterator[bytes]:
+        """Search and yield the identifiers one by one, so that the caller can consume the result lazily
+        and stop early. The concrete scheme can override this method with a generator walking the index."""
+        yield from self.Search(edb, token).get_result_list()
+
+    def SearchParallel(self,
+                       edb: SSEEncryptedDatabase,
+                       token: SSEToken,
+                       worker_count: int = 1,
+                       pool: typing.Optional[multiprocessing.pool.Pool] = None) -> SSEResult:
+        """Search with at most worker_count worker processes, the result is the same as Search.
+        If pool is given, it must be created by CreateSearchPool(edb, worker_count) and is reused,
+        otherwise the workers are created for this search only.
+        The concrete scheme can override this method to split a single heavy search across the workers."""
+        return self.Search(edb, token)
+
+    def CreateSearchPool(self,
+                         edb: SSEEncryptedDatabase,
+                         worker_count: int) -> typing.Optional[multiprocessing.pool.Pool]:
+        """Create a long-lived pool of worker_count workers holding edb, which can be passed to SearchParallel
+        for all the searches on edb. The caller terminates it when it is no longer used.
+        Return None if the scheme does not search in parallel."""
+        return None
+
+    def SearchMany(self,
+                   edb: SSEEncryptedDatabase,
+                   tokens: typing.Iterable[SSEToken]) -> typing.List[SSEResult]:
+        """Search for several tokens, the results are in the order of the tokens.
+        The concrete scheme can override this method to share work between the searches."""
+        return [self.Search(edb, token) for token in tokens]
@@ -11,6 +11,11 @@ LIB-SSE CODE
 @description: 
 """
 import abc
+import tempfile
+import typing
+
+from data_persistence.edb_container import EDBContainer, write_container
+from schemes.interface.config import SSEConfig
 from schemes.interface.objects import SSEObject
 
 
@@ -19,7 +24,42 @@ class SSEKey(SSEObject, metaclass=abc.ABCMeta):
 
 
 class SSEEncryptedDatabase(SSEObject, metaclass=abc.ABCMeta):
-    pass
+    # The header of the scheme if the encrypted database can be stored in an EDB container (see
+    # data_persistence.edb_container), whose components are then searched in place instead of deserialized
+    container_tag = None
+
+    @classmethod
+    def supports_container(cls) -> bool:
+        return cls.container_tag is not None
+
+    def container_sections(self) -> typing.Dict[str, typing.Any]:
+        """ The components to store in an EDB container, by section names
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be stored in an EDB container.")
+
+    @classmethod
+    def from_container_sections(cls, sections: typing.Dict[str, typing.Any], config: SSEConfig = None):
+        raise NotImplementedError(f"{cls.__name__} cannot be loaded from an EDB container.")
+
+    def write_container(self, file: typing.BinaryIO):
+        write_container(file, self.container_tag, self.container_sections())
+
+    def serialize_container(self) -> bytes:
+        """ The container is written to a temporary file and read back at once,
+        so that the memory peak is a single copy of the container instead of an in-memory buffer and its copy
+        """
+        with tempfile.TemporaryFile() as f:
+            self.write_container(f)
+            f.seek(0)
+            return f.read()
+
+    @classmethod
+    def from_container(cls, container: EDBContainer, config: SSEConfig = None):
+        """ Load the encrypted database from a container without copying its components
+        """
+        if container.tag != cls.container_tag:
+            raise ValueError("Parse header error.")
+        return cls.from_container_sections(container.sections(), config)
 
 
 class SSEToken(SSEObject, metaclass=abc.ABCMeta):
@@ -27,6 +67,8 @@ class SSEToken(SSEObject, metaclass=abc.ABCMeta):
 
 
 class SSEResult(SSEObject, metaclass=abc.ABCMeta):
+    cost_report = None  # the operation counts of the search, attached by analysis.instrumentation (not serialized)
+
     @abc.abstractmethod
     def get_result_list(self) -> list:
         pass
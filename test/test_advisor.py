@@ -0,0 +1,62 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_advisor.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import random
+import unittest
+
+from analysis.advisor import stratified_sample, advise, recommend, SchemeReport
+from test.tools.faker import fake_db_for_inverted_index_based_sse
+
+
+class TestAdvisor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = fake_db_for_inverted_index_based_sse(16, 8, 200, db_w_size_range=(1, 100))
+
+    def test_stratified_sample(self):
+        required_keywords = list(self.db)[:5] + [b"not in db"]
+        sample_db = stratified_sample(self.db, 40, required_keywords=required_keywords, rng=random.Random(1))
+        self.assertEqual(len(sample_db), 40)
+        self.assertTrue(all(sample_db[keyword] is self.db[keyword] for keyword in sample_db))
+        self.assertTrue(all(keyword in sample_db for keyword in required_keywords[:5]))
+
+        # every quarter of the keywords ordered by list length is sampled
+        sorted_keywords = sorted(self.db, key=lambda keyword: len(self.db[keyword]))
+        for i in range(4):
+            stratum = set(sorted_keywords[50 * i: 50 * (i + 1)])
+            self.assertTrue(any(keyword in stratum for keyword in sample_db))
+
+        self.assertEqual(stratified_sample(self.db, 1000), self.db)
+
+    def test_advise(self):
+        query_log = [random.choice(list(self.db)) for _ in range(100)]
+        reports = advise(self.db, query_log,
+                         scheme_names=["CJJ14.PiBas", "CJJ14.PiPack", "CT14.Pi", "DP17.Pi"],
+                         sample_keyword_count=30)
+        self.assertEqual([report.scheme for report in reports], ["CJJ14.PiBas", "CJJ14.PiPack", "CT14.Pi", "DP17.Pi"])
+        for report in reports:
+            self.assertTrue(report.ok, report.error)
+            self.assertGreater(report.edb_bytes_per_posting, 0)
+            self.assertGreater(report.full_edb_bytes, report.edb_bytes)
+            self.assertLessEqual(report.p50_search_seconds, report.p99_search_seconds)
+
+        best = recommend(reports, "edb_bytes_per_posting")
+        self.assertEqual(best.edb_bytes_per_posting, min(report.edb_bytes_per_posting for report in reports))
+
+    def test_recommend(self):
+        with self.assertRaises(ValueError):
+            recommend([SchemeReport("CJJ14.PiBas", error="failed")])
+        with self.assertRaises(ValueError):
+            recommend([], "unknown metric")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_benchmark.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import copy
+import os
+import random
+import tempfile
+import unittest
+
+from analysis.benchmark import generate_database, run_benchmark, save_results, load_results, scaling_exponents, \
+    compare_results, COMPARED_METRICS
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_generate_database(self):
+        for distribution in ("uniform", "zipf"):
+            db = generate_database(1000, distribution, mean_list_length=10, identifier_size=4, rng=random.Random(1))
+            self.assertEqual(len(db), 100)
+            self.assertEqual(sum(len(id_list) for id_list in db.values()), 1000)
+            self.assertTrue(all(len(set(id_list)) == len(id_list) for id_list in db.values()))
+            self.assertTrue(all(len(identifier) == 4 for id_list in db.values() for identifier in id_list))
+
+        zipf_lengths = [len(id_list) for id_list in generate_database(1000, "zipf").values()]
+        self.assertEqual(zipf_lengths, sorted(zipf_lengths, reverse=True))
+        self.assertGreater(zipf_lengths[0], 100)
+
+        self.assertEqual(generate_database(500, rng=random.Random(2)), generate_database(500, rng=random.Random(2)))
+        with self.assertRaises(ValueError):
+            generate_database(1000, "normal")
+
+    def test_run_and_compare(self):
+        results = run_benchmark(["CJJ14.PiBas", "CJJ14.PiPack"], [200, 800], ["zipf"], query_count=5)
+        self.assertEqual(len(results["records"]), 4)
+        for record in results["records"]:
+            self.assertIsNone(record["error"])
+            self.assertEqual(record["query_count"], 5)
+            self.assertTrue(all(record[metric] > 0 for metric in COMPARED_METRICS))
+
+        # the encrypted database grows linearly
+        exponents = scaling_exponents(results, "edb_bytes")
+        self.assertAlmostEqual(exponents["CJJ14.PiBas", "zipf"], 1, delta=0.1)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "results.json")
+            save_results(results, path)
+            self.assertEqual(load_results(path), results)
+
+        self.assertEqual(compare_results(results, results), [])
+        current = copy.deepcopy(results)
+        current["records"][0]["edb_bytes"] *= 2
+        current["records"][1]["error"] = "RuntimeError: failed"
+        regressions = compare_results(results, current)
+        self.assertEqual([(regression.scheme, regression.metric) for regression in regressions],
+                         [("CJJ14.PiBas", "edb_bytes"), ("CJJ14.PiPack", "error")])
+        self.assertAlmostEqual(regressions[0].ratio, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
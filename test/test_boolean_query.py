@@ -0,0 +1,120 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_boolean_query.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import asyncio
+import unittest
+
+from frontend.client.services.boolean_query import order_keywords_by_size, conjunctive_query, disjunctive_query
+
+
+class _FakeStreams:
+    """ Open the streams of an in-memory database, recording how many chunks each stream yields
+    """
+
+    def __init__(self, db: dict, chunk_size: int = 2):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.opened = []
+        self.yielded_chunk_count = {}
+        self.closed = set()
+
+    def open(self, keyword: bytes):
+        self.opened.append(keyword)
+        self.yielded_chunk_count[keyword] = 0
+        return self._stream(keyword)
+
+    async def _stream(self, keyword: bytes):
+        id_list = self.db.get(keyword, [])
+        try:
+            for begin in range(0, len(id_list), self.chunk_size):
+                await asyncio.sleep(0)
+                self.yielded_chunk_count[keyword] += 1
+                yield id_list[begin: begin + self.chunk_size]
+        finally:
+            self.closed.add(keyword)
+
+
+def _collect(async_iter):
+    async def _run():
+        result = []
+        async for chunk in async_iter:
+            result.extend(chunk)
+        return result
+
+    return asyncio.run(_run())
+
+
+class TestBooleanQuery(unittest.TestCase):
+    db = {
+        b"a": [b"1", b"2", b"3", b"4", b"5", b"6", b"7", b"8"],
+        b"b": [b"2", b"4", b"6", b"8", b"10"],
+        b"c": [b"6", b"2"],
+        b"d": [b"100", b"101", b"102", b"103", b"104", b"105", b"106", b"107", b"108", b"109"],
+    }
+    sizes = {keyword: len(id_list) for keyword, id_list in db.items()}
+
+    def test_order_keywords_by_size(self):
+        self.assertEqual(order_keywords_by_size([b"a", b"c", b"x", b"b", b"c"], self.sizes), [b"c", b"b", b"a", b"x"])
+        self.assertEqual(order_keywords_by_size([b"a", b"c", b"b"], self.sizes, reverse=True), [b"a", b"b", b"c"])
+        self.assertEqual(order_keywords_by_size([b"a", b"c", b"a"]), [b"a", b"c"])
+
+    def test_conjunctive_query(self):
+        for keyword_sizes in (self.sizes, None):
+            streams = _FakeStreams(self.db)
+            result = asyncio.run(conjunctive_query([b"a", b"b", b"c"], streams.open, keyword_sizes))
+            self.assertEqual(result, [b"6", b"2"] if keyword_sizes else [b"2", b"6"])
+            self.assertEqual(set(streams.opened), {b"a", b"b", b"c"})
+            self.assertEqual(streams.closed, {b"a", b"b", b"c"})
+
+        # the smallest list is fetched firstly, and the others stop once all candidates are confirmed
+        streams = _FakeStreams(self.db)
+        asyncio.run(conjunctive_query([b"a", b"b", b"c"], streams.open, self.sizes))
+        self.assertEqual(streams.opened[0], b"c")
+        self.assertEqual(streams.yielded_chunk_count[b"a"], 3)
+
+        # empty intersection
+        streams = _FakeStreams(self.db)
+        self.assertEqual(asyncio.run(conjunctive_query([b"c", b"d"], streams.open, self.sizes)), [])
+        self.assertEqual(asyncio.run(conjunctive_query([b"d", b"x"], streams.open)), [])
+
+    def test_conjunctive_query_with_unknown_keyword(self):
+        streams = _FakeStreams(self.db)
+        self.assertEqual(asyncio.run(conjunctive_query([b"a", b"x"], streams.open, self.sizes)), [])
+        self.assertEqual(streams.opened, [])
+        self.assertEqual(asyncio.run(conjunctive_query([], streams.open, self.sizes)), [])
+
+    def test_disjunctive_query(self):
+        expected = set(self.db[b"a"]) | set(self.db[b"b"]) | set(self.db[b"c"])
+        for keyword_sizes in (self.sizes, None):
+            streams = _FakeStreams(self.db)
+            result = _collect(disjunctive_query([b"a", b"b", b"c", b"x"], streams.open, keyword_sizes))
+            self.assertEqual(len(result), len(expected))
+            self.assertEqual(set(result), expected)
+
+        # the known empty lists are skipped
+        streams = _FakeStreams(self.db)
+        _collect(disjunctive_query([b"c", b"x"], streams.open, self.sizes))
+        self.assertEqual(streams.opened, [b"c"])
+
+    def test_disjunctive_query_with_limit(self):
+        streams = _FakeStreams(self.db)
+        result = _collect(disjunctive_query([b"a", b"d"], streams.open, self.sizes, limit=5))
+        self.assertEqual(len(result), 5)
+        self.assertLessEqual(set(result), set(self.db[b"a"]) | set(self.db[b"d"]))
+        self.assertEqual(streams.closed, {b"a", b"d"})
+        self.assertLess(streams.yielded_chunk_count[b"d"], 5)
+
+        self.assertEqual(_collect(disjunctive_query([b"a"], streams.open, self.sizes, limit=0)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
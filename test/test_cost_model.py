@@ -0,0 +1,82 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_cost_model.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import unittest
+
+import schemes
+from analysis.cost_model import DatabaseStatistics, CostModel, CostPrediction, TUNABLE_SCHEMES, predict_cost, \
+    tune_config, check_prediction
+from test.tools.faker import fake_db_for_inverted_index_based_sse
+
+
+class TestCostModel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = fake_db_for_inverted_index_based_sse(16, 8, 30, db_w_size_range=(1, 60))
+        self.stats = DatabaseStatistics.from_database(self.db)
+
+    def test_database_statistics(self):
+        self.assertEqual(self.stats.keyword_count, 30)
+        self.assertEqual(self.stats.total_size, sum(len(id_list) for id_list in self.db.values()))
+        self.assertEqual(sum(self.stats.length_histogram.values()), 30)
+        self.assertEqual(self.stats.identifier_size, 8)
+        with self.assertRaises(ValueError):
+            DatabaseStatistics.from_database({})
+
+    def test_cost_model(self):
+        model = CostModel(prf_call=1, hash_call=2, lookup=3, ske_call=4, ske_byte=5)
+        prediction = CostPrediction(prf_calls=1, hash_calls=1, lookups=1, ske_calls=1, ske_bytes=1)
+        self.assertEqual(model.search_seconds(prediction), 15)
+        with self.assertRaises(ValueError):
+            CostModel(unknown=1)
+        self.assertGreater(CostModel.calibrate(repeat=10).prf_call, 0)
+
+    def test_predict_pi_pack(self):
+        config_dict = dict(schemes.CJJ14.PiPack.config.DEFAULT_CONFIG, param_B=1)
+        prediction = predict_cost(config_dict, self.stats)
+        # one block for each identifier, and one more lookup for the missing counter
+        self.assertEqual(prediction.ske_calls, self.stats.total_size / self.stats.keyword_count)
+        self.assertEqual(prediction.prf_calls, prediction.ske_calls + 1)
+
+    def test_tune_config(self):
+        for scheme_name in TUNABLE_SCHEMES:
+            config_dict, prediction = tune_config(scheme_name, self.stats)
+            self.assertEqual(config_dict["scheme"], scheme_name)
+
+            scheme = schemes.load_sse_module(scheme_name).SSEScheme(config_dict)
+            key = scheme.KeyGen()
+            edb = scheme.EDBSetup(key, self.db)
+            for keyword in list(self.db)[:5]:
+                self.assertEqual(set(self.db[keyword]),
+                                 set(scheme.Search(edb, scheme.TokenGen(key, keyword)).get_result_list()))
+
+            # the size of the encrypted database is predicted up to the serialization overhead
+            self.assertAlmostEqual(prediction.edb_bytes / len(edb.serialize()), 1, delta=0.1)
+
+        with self.assertRaises(ValueError):
+            tune_config("CJJ14.PiBas", self.stats)
+
+    def test_space_ratio(self):
+        fastest_config, fastest_prediction = tune_config("CJJ14.PiPack", self.stats, max_space_ratio=100)
+        smallest_config, smallest_prediction = tune_config("CJJ14.PiPack", self.stats, max_space_ratio=1)
+        self.assertLessEqual(smallest_prediction.edb_bytes, fastest_prediction.edb_bytes)
+        self.assertGreaterEqual(fastest_config["param_B"], smallest_config["param_B"])
+
+    def test_check_prediction(self):
+        config_dict, _ = tune_config("CJJ14.PiPack", self.stats)
+        check_result = check_prediction(config_dict, self.db, sample_keyword_count=10)
+        self.assertEqual(check_result["sample_keyword_count"], 10)
+        self.assertGreater(check_result["measured_search_seconds"], 0)
+        self.assertAlmostEqual(check_result["predicted_edb_bytes"] / check_result["measured_edb_bytes"], 1, delta=0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,7 +13,8 @@ LIB-SSE CODE
 import os
 import unittest
 
-from toolkit.database_utils import parse_identifiers_from_block_given_identifier_size, partition_identifiers_to_blocks
+from toolkit.database_utils import parse_identifiers_from_block_given_identifier_size, partition_identifiers_to_blocks, \
+    iterate_padded_database, get_list_length_histogram
 
 
 def fake_identifiers(identifier_size: int, identifier_count: int) -> list:
@@ -50,3 +51,25 @@ class TestDatabaseUtils(unittest.TestCase):
         for block in block_list:
             parse_result.extend(parse_identifiers_from_block_given_identifier_size(block, identifier_size))
         self.assertListEqual(identifier_list, parse_result)
+
+    def test_list_length_histogram(self):
+        db = {b"a": fake_identifiers(8, 3), b"b": fake_identifiers(8, 10), b"c": fake_identifiers(8, 3)}
+        self.assertEqual(get_list_length_histogram(db), {3: 2, 10: 1})
+        self.assertEqual(get_list_length_histogram({}), {})
+
+    def test_iterate_padded_database(self):
+        db = {b"a": fake_identifiers(8, 3), b"b": fake_identifiers(8, 10)}
+        for padded_total_size in (13, 16, 1024):
+            real_items, dummy_len_list = [], []
+            for keyword, identifier_list, list_len in iterate_padded_database(db, padded_total_size):
+                if keyword is None:
+                    self.assertIsNone(identifier_list)
+                    dummy_len_list.append(list_len)
+                else:
+                    self.assertIs(identifier_list, db[keyword])  # not copied
+                    self.assertEqual(list_len, len(identifier_list))
+                    real_items.append(keyword)
+
+            self.assertListEqual(real_items, list(db))
+            self.assertTrue(all(list_len > 0 for list_len in dummy_len_list))
+            self.assertEqual(13 + sum(dummy_len_list), padded_total_size)
@@ -0,0 +1,106 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_edb_container.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import io
+import os
+import pickle
+import tempfile
+import unittest
+
+import schemes
+from data_persistence.edb_container import EDBContainer, HeapArray, HeapDict, write_container, is_container
+from data_persistence.page_aligned_array import PAGE_SIZE
+from test.tools.faker import fake_db_for_inverted_index_based_sse
+from toolkit.data_structures.label_table import LabelTable
+from toolkit.data_structures.level_table import LevelTable
+
+
+class TestEDBContainer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = fake_db_for_inverted_index_based_sse(16, 8, 20, db_w_size_range=(1, 50))
+
+    def test_sections(self):
+        label_table = LabelTable.from_pairs([(os.urandom(32), os.urandom(16)) for _ in range(100)])
+        level_table = LevelTable.from_pairs([(os.urandom(32), os.urandom(16)) for _ in range(100)])
+        heap_dict = {os.urandom(16): os.urandom(size) for size in range(50)}
+        heap_array = [None, b"", os.urandom(10), None, os.urandom(3000)]
+        sections = {"label": label_table, "level": level_table, "dict": heap_dict, "array": heap_array,
+                    "other": {"count": 1}}
+
+        buffer = io.BytesIO()
+        write_container(buffer, b"tag", sections)
+        data = buffer.getvalue()
+        self.assertTrue(is_container(data))
+        self.assertGreater(len(data), 4 * PAGE_SIZE)  # each section begins at a page boundary
+
+        container = EDBContainer(data)
+        self.assertEqual(container.tag, b"tag")
+        self.assertEqual(container.section_names(), list(sections))
+        loaded = container.sections()
+        self.assertIsInstance(loaded["label"], LabelTable)
+        self.assertIsInstance(loaded["level"], LevelTable)
+        self.assertIsInstance(loaded["dict"], HeapDict)
+        self.assertIsInstance(loaded["array"], HeapArray)
+        self.assertEqual(loaded, sections)
+        for label, value in heap_dict.items():
+            self.assertEqual(loaded["dict"].get(label), value)
+        self.assertIsNone(loaded["dict"].get(os.urandom(16)))
+        self.assertEqual(loaded["array"][-1], heap_array[-1])
+        self.assertEqual(loaded["array"].get_batch([2, 0]), [heap_array[2], None])
+        with self.assertRaises(IndexError):
+            _ = loaded["array"][len(heap_array)]
+
+        # the loaded sections can be pickled (copied)
+        self.assertEqual(pickle.loads(pickle.dumps(loaded["dict"])), heap_dict)
+        self.assertEqual(pickle.loads(pickle.dumps(loaded["array"])), heap_array)
+
+        with self.assertRaises(ValueError):
+            EDBContainer(b"not a container" * 10)
+        with self.assertRaises(ValueError):
+            write_container(io.BytesIO(), b"tag", {"x" * 65: b""})
+
+    def test_schemes(self):
+        for scheme_name in ("CJJ14.PiBas", "CJJ14.Pi2Lev", "CT14.Pi", "ANSS16.Scheme3"):
+            sse_module = schemes.load_sse_module(scheme_name)
+            scheme = sse_module.SSEScheme(sse_module.SSEConfig.get_default_config())
+            key = scheme.KeyGen()
+            edb = scheme.EDBSetup(key, self.db)
+            self.assertTrue(edb.supports_container())
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, "edb")
+                with open(path, "wb") as f:
+                    edb.write_container(f)
+                container = EDBContainer.open(path)
+                mapped_edb = sse_module.SSEEncryptedDatabase.from_container(container, scheme.config)
+                self.assertEqual(mapped_edb, edb, scheme_name)
+                for keyword, id_list in self.db.items():
+                    result = scheme.Search(mapped_edb, scheme.TokenGen(key, keyword))
+                    self.assertEqual(set(result.get_result_list()), set(id_list), scheme_name)
+                del mapped_edb
+                container.close()
+
+            with self.assertRaises(ValueError):  # the container of another scheme
+                schemes.load_sse_module("CJJ14.PiPack").SSEEncryptedDatabase.from_container(
+                    EDBContainer(edb.serialize_container()))
+
+    def test_unsupported(self):
+        sse_module = schemes.load_sse_module("DP17.Pi")
+        scheme = sse_module.SSEScheme(sse_module.SSEConfig.get_default_config())
+        edb = scheme.EDBSetup(scheme.KeyGen(), self.db)
+        self.assertFalse(edb.supports_container())
+        with self.assertRaises(NotImplementedError):
+            edb.serialize_container()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_faker.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import collections
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from test.tools.faker import fake_db_for_inverted_index_based_sse, zipf_list_lengths, fake_zipf_db, write_zipf_db, \
+    iter_zipf_queries, write_zipf_query_log
+from toolkit.database_utils import convert_database_keyword_to_bytes
+
+
+class TestFaker(unittest.TestCase):
+    def test_fake_db(self):
+        db = fake_db_for_inverted_index_based_sse(16, 8, 20, db_w_size_range=(3, 5))
+        self.assertEqual(len(db), 20)
+        self.assertTrue(all(3 <= len(id_list) <= 5 for id_list in db.values()))
+        self.assertTrue(all(len(identifier) == 8 for id_list in db.values() for identifier in id_list))
+
+    def test_zipf_list_lengths(self):
+        lengths = zipf_list_lengths(100, 10000, exponent=1.0)
+        self.assertEqual(sum(lengths), 10000)
+        self.assertEqual(lengths, sorted(lengths, reverse=True))
+        self.assertAlmostEqual(lengths[0] / lengths[9], 10, delta=0.5)
+        self.assertEqual(zipf_list_lengths(3, 3), [1, 1, 1])
+        with self.assertRaises(ValueError):
+            zipf_list_lengths(10, 5)
+
+    def test_write_zipf_db(self):
+        for identifier_distribution in ("random", "documents"):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, "db.json")
+                written_size = write_zipf_db(path, 50, 2000, identifier_size=4,
+                                             identifier_distribution=identifier_distribution,
+                                             rng=random.Random(1))
+                with open(path, "r") as f:
+                    db = convert_database_keyword_to_bytes(json.load(f))
+
+            self.assertEqual(written_size, 2000)
+            self.assertEqual([len(id_list) for id_list in db.values()], zipf_list_lengths(50, 2000))
+            self.assertTrue(all(len(identifier) == 4 for id_list in db.values() for identifier in id_list))
+            # the same database is generated in memory
+            self.assertEqual(db, fake_zipf_db(50, 2000, identifier_size=4,
+                                              identifier_distribution=identifier_distribution,
+                                              rng=random.Random(1)))
+
+        db = fake_zipf_db(50, 2000, identifier_distribution="documents", document_count=600)
+        self.assertTrue(all(len(set(id_list)) == len(id_list) for id_list in db.values()))
+        self.assertLessEqual(len({identifier for id_list in db.values() for identifier in id_list}), 600)
+        with self.assertRaises(ValueError):
+            fake_zipf_db(50, 2000, identifier_distribution="documents", document_count=10)
+        with self.assertRaises(ValueError):
+            fake_zipf_db(50, 2000, length_distribution="normal")
+
+    def test_zipf_queries(self):
+        frequency = collections.Counter(iter_zipf_queries(100, 20000, rng=random.Random(1)))
+        self.assertEqual(frequency.most_common(1)[0][0], "w001")
+        self.assertAlmostEqual(frequency["w001"] / frequency["w002"], 2, delta=0.3)
+
+        uncorrelated = collections.Counter(iter_zipf_queries(100, 20000, correlated=False, rng=random.Random(1)))
+        self.assertNotEqual(uncorrelated.most_common(1)[0][0], "w001")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "queries.txt")
+            write_zipf_query_log(path, 100, 1000, rng=random.Random(2))
+            with open(path, "r") as f:
+                self.assertEqual(f.read().split(), list(iter_zipf_queries(100, 1000, rng=random.Random(2))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_instrumentation.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import unittest
+
+import schemes.CJJ14.PiBas.config
+import schemes.CJJ14.PiPack.config
+from analysis.instrumentation import instrument, OPERATION_COUNT_FIELDS
+from schemes.CJJ14.PiBas.construction import PiBas
+from schemes.CJJ14.PiPack.construction import PiPack
+from test.tools.faker import fake_db_for_inverted_index_based_sse
+from toolkit.data_structures.label_table import LabelTable
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = fake_db_for_inverted_index_based_sse(16, 8, 20, db_w_size_range=(1, 50))
+        self.keyword = max(self.db, key=lambda keyword: len(self.db[keyword]))
+
+    def test_pi_bas(self):
+        config_dict = dict(schemes.CJJ14.PiBas.config.DEFAULT_CONFIG, param_identifier_size=8)
+        scheme = PiBas(config_dict)
+        prf = scheme.config.prf_f
+        with instrument(scheme) as instrumented:
+            key = instrumented.KeyGen()
+            edb = instrumented.EDBSetup(key, self.db)
+            token = instrumented.TokenGen(key, self.keyword)
+            result = instrumented.Search(edb, token)
+        self.assertEqual(set(result.get_result_list()), set(self.db[self.keyword]))
+        self.assertEqual([report.operation for report in instrumented.reports],
+                         ["KeyGen", "EDBSetup", "TokenGen", "Search"])
+
+        length = len(self.db[self.keyword])
+        report = result.cost_report
+        # one label and one probe for each identifier, and one more for the missing counter
+        self.assertEqual(report["prf_calls"], length + 1)
+        self.assertEqual(report["probes"], length + 1)
+        self.assertEqual(report["ske_decrypt_calls"], length)
+        self.assertEqual(report["result_bytes"], 8 * length)
+        self.assertEqual(instrumented.reports[1]["ske_encrypt_calls"],
+                         sum(len(id_list) for id_list in self.db.values()))
+        self.assertEqual(set(report.to_dict()), {"operation", "seconds", *OPERATION_COUNT_FIELDS})
+
+        # the primitives and the containers are restored
+        self.assertIs(scheme.config.prf_f, prf)
+        self.assertIs(type(edb.D), LabelTable)
+        self.assertEqual(instrumented.reports[-1]["prf_calls"], length + 1)
+
+    def test_search_many(self):
+        config_dict = dict(schemes.CJJ14.PiPack.config.DEFAULT_CONFIG, param_identifier_size=8, param_B=4)
+        scheme = PiPack(config_dict)
+        key = scheme.KeyGen()
+        edb = scheme.EDBSetup(key, self.db)
+        keywords = list(self.db)[:3]
+        tokens = scheme.TokenGenMany(key, keywords)
+        with instrument(scheme) as instrumented:
+            result_list = instrumented.SearchMany(edb, tokens)
+        report = instrumented.reports[0]
+        self.assertEqual(report.operation, "SearchMany")
+        self.assertTrue(all(result.cost_report is report for result in result_list))
+        self.assertEqual(report["result_bytes"], 8 * sum(len(self.db[keyword]) for keyword in keywords))
+        self.assertEqual(report["ske_decrypt_calls"], sum((len(self.db[keyword]) + 3) // 4 for keyword in keywords))
+        # uninstrumented calls are not accounted
+        self.assertIsNone(scheme.Search(edb, tokens[0]).cost_report)
+
+
+if __name__ == '__main__':
+    unittest.main()
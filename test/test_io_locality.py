@@ -0,0 +1,66 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_io_locality.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import unittest
+
+import schemes.CJJ14.PiBas.config
+from analysis.io_locality import SimulatedBlockDevice, measure_io
+from test.tools.faker import fake_db_for_inverted_index_based_sse
+
+
+class TestIOLocality(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = fake_db_for_inverted_index_based_sse(16, 8, 100, db_w_size_range=(1, 100))
+
+    def test_device(self):
+        device = SimulatedBlockDevice(page_size=100)
+        self.assertEqual(device.allocate(150), 0)
+        self.assertEqual(device.allocate(10), 200)
+        device.read(0, 10)  # not in a query
+        device.begin_query()
+        device.read(50, 100)  # pages 0, 1
+        device.read(120, 10)  # page 1
+        device.read(200, 1)  # page 2
+        device.read(550, 60)  # pages 5, 6
+        report = device.end_query()
+        self.assertEqual(report.pages_touched, 5)
+        self.assertEqual(report.contiguous_reads, 2)
+        self.assertEqual(report.read_calls, 4)
+        self.assertEqual(report.bytes_requested, 171)
+        self.assertIsNone(report.read_efficiency)
+        report.result_bytes = 50
+        self.assertEqual(report.read_efficiency, 10)
+
+    def test_pi_bas(self):
+        config_dict = dict(schemes.CJJ14.PiBas.config.DEFAULT_CONFIG, param_identifier_size=8)
+        keyword = max(self.db, key=lambda kw: len(self.db[kw]))
+        report, = measure_io("CJJ14.PiBas", self.db, [keyword], config_dict=config_dict, page_size=64)
+        # the 32-byte labels probed and the 32-byte ciphertext for each identifier,
+        # the probing of the missing counter stops at an empty slot
+        self.assertGreaterEqual(report.read_calls, 2 * len(self.db[keyword]))
+        self.assertEqual(report.bytes_requested, 32 * report.read_calls)
+        self.assertGreaterEqual(report.pages_touched, len(self.db[keyword]))
+        self.assertEqual(report.result_bytes, 8 * len(self.db[keyword]))
+
+    def test_locality(self):
+        # the list of a keyword is packed in a few contiguous reads by the schemes with locality
+        keywords = sorted(self.db, key=lambda kw: len(self.db[kw]))[-10:]
+        pi_bas_reports = measure_io("CJJ14.PiBas", self.db, keywords, page_size=64)
+        for scheme_name in ("CJJ14.Pi2Lev", "CT14.Pi", "ANSS16.Scheme3", "DP17.Pi"):
+            reports = measure_io(scheme_name, self.db, keywords, page_size=64)
+            for report, pi_bas_report in zip(reports, pi_bas_reports):
+                self.assertGreater(report.result_bytes, 0)
+                self.assertLess(report.contiguous_reads, pi_bas_report.contiguous_reads, scheme_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_label_table.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import os
+import pickle
+import unittest
+
+from toolkit.data_structures.label_table import LabelTable
+
+
+def _fake_pairs(count: int, label_size: int, value_size: int) -> list:
+    return [(os.urandom(label_size), os.urandom(value_size)) for _ in range(count)]
+
+
+class TestLabelTable(unittest.TestCase):
+    def test_get(self):
+        for count, label_size in [(0, 32), (1, 32), (2, 32), (1000, 32), (1000, 3)]:
+            pairs = _fake_pairs(count, label_size, 48)
+            table = LabelTable.from_pairs(pairs)
+            expected = dict(pairs)
+            self.assertEqual(len(table), len(expected))
+            self.assertGreater(table.capacity, len(table))
+            self.assertEqual(dict(table.items()), expected)
+            self.assertEqual(set(table), set(expected))
+            for label, value in expected.items():
+                self.assertEqual(table.get(label), value)
+                self.assertEqual(table[label], value)
+                self.assertIn(label, table)
+            for _ in range(100):
+                label = os.urandom(label_size)
+                if label not in expected:
+                    self.assertIsNone(table.get(label))
+                    self.assertNotIn(label, table)
+                    with self.assertRaises(KeyError):
+                        _ = table[label]
+            # the labels of other sizes are never found
+            self.assertIsNone(table.get(os.urandom(label_size + 1)))
+
+    def test_duplicate_labels(self):
+        label = os.urandom(16)
+        table = LabelTable.from_pairs([(label, b"a" * 4), (os.urandom(16), b"b" * 4), (label, b"c" * 4)])
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table[label], b"c" * 4)
+
+    def test_int_labels(self):
+        pairs = [(address, os.urandom(24)) for address in range(0, 3000, 3)]
+        table = LabelTable.from_pairs(pairs)
+        self.assertEqual(table.label_size, 2)
+        for address, value in pairs:
+            self.assertEqual(table[address], value)
+            self.assertEqual(table[address.to_bytes(2, "big")], value)
+        self.assertNotIn(1, table)
+        self.assertNotIn(1 << 16, table)
+        self.assertNotIn(-1, table)
+
+        table = LabelTable.from_pairs(pairs, label_size=8)
+        self.assertEqual(table[2997], pairs[-1][1])
+
+    def test_pickle(self):
+        table = LabelTable.from_pairs(_fake_pairs(100, 32, 16))
+        loaded = pickle.loads(pickle.dumps(table))
+        self.assertEqual(loaded, table)
+        self.assertEqual(loaded.nbytes, table.capacity * (1 + 32 + 16))
+        self.assertNotEqual(table, LabelTable.from_pairs(_fake_pairs(100, 32, 16)))
+        self.assertNotEqual(table, dict(table.items()))
+
+        empty = LabelTable.from_pairs([])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(pickle.loads(pickle.dumps(empty)), empty)
+
+    def test_buffer(self):
+        table = LabelTable.from_pairs(_fake_pairs(500, 32, 16))
+        buffer = b"header" + table.to_bytes()
+        loaded = LabelTable.from_buffer(buffer, 6)
+        self.assertEqual(loaded, table)
+        self.assertEqual((len(loaded), loaded.capacity), (len(table), table.capacity))
+        for label, value in table.items():
+            self.assertEqual(loaded[label], value)
+        self.assertNotIn(os.urandom(32), loaded)
+        with self.assertRaises(ValueError):
+            LabelTable.from_buffer(buffer[:-1], 6)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            LabelTable.from_pairs(_fake_pairs(10, 32, 16), max_load_factor=1)
+        with self.assertRaises(ValueError):  # labels of different sizes
+            LabelTable.from_pairs([(os.urandom(32), b"x"), (os.urandom(31), b"y")])
+        with self.assertRaises(ValueError):  # values of different sizes
+            LabelTable.from_pairs([(os.urandom(32), b"x"), (os.urandom(32), b"yy")])
+        with self.assertRaises(ValueError):
+            LabelTable(0, 16, bytearray(1), bytearray(0), bytearray(16))
+        with self.assertRaises(ValueError):
+            LabelTable(32, 16, bytearray(2), bytearray(32), bytearray(32))
+
+
+if __name__ == '__main__':
+    unittest.main()
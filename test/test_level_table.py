@@ -0,0 +1,78 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_level_table.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import mmap
+import os
+import pickle
+import tempfile
+import unittest
+
+from toolkit.data_structures.level_table import LevelTable
+
+
+def _fake_pairs(count: int, label_size: int, value_size: int) -> list:
+    return [(os.urandom(label_size), os.urandom(value_size)) for _ in range(count)]
+
+
+class TestLevelTable(unittest.TestCase):
+    def test_get(self):
+        for count, label_size in [(0, 32), (1, 32), (2, 32), (1000, 32), (1000, 3)]:
+            pairs = _fake_pairs(count, label_size, 48)
+            table = LevelTable.from_pairs(pairs, label_size, 48)
+            expected = dict(pairs)
+            self.assertEqual(len(table), len(expected))
+            for label, value in expected.items():
+                self.assertEqual(table.get(label), value)
+                self.assertEqual(table[label], value)
+            for _ in range(100):
+                label = os.urandom(label_size)
+                if label not in expected:
+                    self.assertIsNone(table.get(label))
+                    self.assertNotIn(label, table)
+            self.assertIsNone(table.get(b"short"))
+            self.assertEqual(sorted(expected.items()), list(table.items()))
+
+    def test_duplicated_labels(self):
+        pairs = [(b"\x01" * 4, b"a"), (b"\x00" * 4, b"b"), (b"\x01" * 4, b"c")]
+        table = LevelTable.from_pairs(pairs)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table[b"\x01" * 4], b"c")
+
+    def test_clustered_labels(self):
+        # the labels share a long common prefix, interpolation search degenerates but must stay correct
+        pairs = [(b"\x00" * 12 + i.to_bytes(4, 'big'), i.to_bytes(4, 'big')) for i in range(0, 3000, 3)]
+        table = LevelTable.from_pairs(pairs)
+        for label, value in pairs:
+            self.assertEqual(table.get(label), value)
+        self.assertIsNone(table.get(b"\x00" * 12 + (1).to_bytes(4, 'big')))
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, LevelTable.from_pairs, [(b"ab", b"c"), (b"abc", b"d")])
+        self.assertRaises(ValueError, LevelTable.from_pairs, [(b"ab", b"c"), (b"ac", b"dd")])
+        self.assertRaises(ValueError, LevelTable.from_pairs, [])
+
+    def test_serialization(self):
+        table = LevelTable.from_pairs(_fake_pairs(100, 32, 64))
+        self.assertEqual(table, pickle.loads(pickle.dumps(table)))
+
+        buffer = b"prefix" + table.to_bytes()
+        self.assertEqual(LevelTable.size_in_buffer(buffer, 6), len(buffer) - 6)
+        self.assertEqual(table, LevelTable.from_buffer(buffer, 6))
+
+        with tempfile.TemporaryFile() as f:
+            f.write(buffer)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mapped_table = LevelTable.from_buffer(mm, 6)
+                for label, value in table.items():
+                    self.assertEqual(mapped_table.get(label), value)
+                del mapped_table
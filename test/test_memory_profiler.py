@@ -0,0 +1,77 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_memory_profiler.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import sys
+import unittest
+
+import schemes.CJJ14.PiBas.config
+from analysis.memory_profiler import deep_size, profile_memory
+from test.tools.faker import fake_db_for_inverted_index_based_sse
+from toolkit.data_structures.label_table import DEFAULT_MAX_LOAD_FACTOR
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = fake_db_for_inverted_index_based_sse(16, 8, 50, db_w_size_range=(1, 40))
+        self.total_size = sum(len(id_list) for id_list in self.db.values())
+
+    def test_deep_size(self):
+        shared = b"x" * 100
+        obj = {b"k1": shared, b"k2": shared, b"k3": [shared, b"y" * 10]}
+        usage = deep_size(obj)
+        self.assertEqual(usage.raw_bytes, 6 + 100 + 10)
+        self.assertEqual(usage.object_count, 7)
+        self.assertEqual(usage.deep_bytes, sum(map(sys.getsizeof, [obj, b"k1", b"k2", b"k3", shared, obj[b"k3"],
+                                                                   obj[b"k3"][1]])))
+        # the seen objects are skipped
+        self.assertEqual(deep_size([shared], {id(shared)}).raw_bytes, 0)
+
+    def test_pi_bas(self):
+        config_dict = dict(schemes.CJJ14.PiBas.config.DEFAULT_CONFIG, param_identifier_size=8)
+        report = profile_memory("CJJ14.PiBas", self.db, config_dict=config_dict)
+        self.assertEqual([component.name for component in report.components], ["D"])
+        # an occupancy byte, a 32-byte label and a 32-byte ciphertext (IV || one block) for each slot of D
+        capacity = int(self.total_size / DEFAULT_MAX_LOAD_FACTOR) + 1
+        self.assertEqual(report.raw_bytes, capacity * (1 + 32 + 32))
+        self.assertGreater(report.overhead_ratio, 1)
+        self.assertAlmostEqual(report.bytes_per_posting, report.deep_bytes / self.total_size)
+        self.assertGreaterEqual(report.traced_peak_bytes, report.traced_retained_bytes)
+        self.assertGreater(report.traced_retained_bytes, report.raw_bytes)
+
+    def test_levels(self):
+        report = profile_memory("CT14.Pi", self.db)
+        names = [component.name for component in report.components]
+        self.assertEqual(names[0], "HT_list")
+        self.assertEqual(names[1:], [f"HT_list[{i}]" for i in range(len(names) - 1)])
+
+        config_dict = schemes.load_sse_module("CT14.Pi").SSEConfig.get_default_config()
+        scheme = schemes.load_sse_module("CT14.Pi").SSEScheme(config_dict)
+        edb_bytes = scheme.EDBSetup(scheme.KeyGen(), self.db).serialize()
+        loaded_report = profile_memory("CT14.Pi", config_dict=config_dict, edb_bytes=edb_bytes)
+        self.assertIsNone(loaded_report.bytes_per_posting)
+        # the serialized bytes and the loaded tables coexist
+        self.assertGreater(loaded_report.traced_peak_bytes, loaded_report.traced_retained_bytes)
+
+        with self.assertRaises(ValueError):
+            profile_memory("CT14.Pi", edb_bytes=edb_bytes)
+
+    def test_warm_up(self):
+        # the first list is of a power-of-two length, on which alone [CT14] cannot be built
+        db = {b"a" * 16: [i.to_bytes(8, "big") for i in range(4)],
+              b"b" * 16: [i.to_bytes(8, "big") for i in range(3)]}
+        report = profile_memory("CT14.Pi", db)
+        self.assertEqual(report.total_size, 7)
+        self.assertGreater(report.raw_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_page_aligned_array.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import os
+import tempfile
+import unittest
+
+from data_persistence.page_aligned_array import PageAlignedBytesArray, PAGE_SIZE
+
+
+class TestPageAlignedBytesArray(unittest.TestCase):
+    def test_read_write_and_reopen(self):
+        item_size, array_len = 5000, 20
+        items = [os.urandom(item_size) for _ in range(array_len)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            local_path = os.path.join(temp_dir, "array")
+            arr = PageAlignedBytesArray.create(local_path, item_size=item_size, array_len=array_len)
+            self.assertEqual(arr[3], b"\x00" * item_size)  # never written
+
+            arr[:] = items
+            arr[-1] = b"short"
+            items[-1] = b"short" + b"\x00" * (item_size - 5)
+            self.assertEqual(list(arr), items)
+            self.assertEqual(arr[2:8:3], items[2:8:3])
+
+            # each item is aligned to pages
+            self.assertEqual(os.path.getsize(local_path), PAGE_SIZE + array_len * 2 * PAGE_SIZE)
+
+            arr.close()
+            self.assertRaises(ValueError, arr.__getitem__, 0)
+            self.assertRaises(FileExistsError, PageAlignedBytesArray.create, local_path,
+                              item_size=item_size, array_len=array_len)
+
+            arr = PageAlignedBytesArray.open(local_path)
+            self.assertEqual((arr.item_size, len(arr)), (item_size, array_len))
+            self.assertEqual(list(arr), items)
+            self.assertEqual(arr.get_batch([5, 0, -1]), [items[5], items[0], items[-1]])
+            self.assertRaises(IndexError, arr.__getitem__, array_len)
+            self.assertRaises(ValueError, arr.__setitem__, 0, b"\x00" * (item_size + 1))
+
+            arr.release()
+            self.assertFalse(os.path.exists(local_path))
@@ -335,6 +335,29 @@ class TestSPFLBArray(unittest.TestCase):
                 self.assertEqual(self.persistent_array[test_slice],
                                  self.inmemory_array[test_slice])
 
+    def test_get_batch(self):
+        """ Test whether get_batch returns the items in the order of the given indices,
+        including unsorted, duplicated, negative and contiguous indices
+        """
+        test_cases = [
+            [],
+            [0],
+            [self.test_array_size - 1, 0, -1],
+            list(range(self.test_array_size)),
+            list(range(self.test_array_size - 1, -1, -3)),
+            [5, 5, 4, 4, 500, 99, 100, 101],
+        ]
+        for _ in range(100):
+            test_cases.append([random.randint(-self.test_array_size, self.test_array_size - 1)
+                               for _ in range(random.randint(1, 50))])
+
+        for indices in test_cases:
+            self.assertEqual(self.persistent_array.get_batch(indices),
+                             [self.inmemory_array[index] for index in indices])
+
+        with self.assertRaises(IndexError):
+            self.persistent_array.get_batch([0, self.test_array_size])
+
     def _mock_setitem_slice_version_like_persistent_array(self,
                                                           list_: typing.List[bytes],
                                                           slice_: slice,
@@ -0,0 +1,43 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_random_access_set.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import random
+import unittest
+
+from toolkit.data_structures.random_access_set import RandomAccessSet
+
+
+class TestRandomAccessSet(unittest.TestCase):
+    def test_add_and_discard(self):
+        ras, expected = RandomAccessSet(range(100)), set(range(100))
+        for _ in range(1000):
+            item = random.randint(0, 150)
+            if random.random() < 0.5:
+                ras.add(item)
+                expected.add(item)
+            else:
+                ras.discard(item)
+                expected.discard(item)
+            self.assertEqual(len(ras), len(expected))
+            self.assertEqual(set(ras), expected)
+            self.assertEqual(item in ras, item in expected)
+
+    def test_choice(self):
+        ras = RandomAccessSet(range(10))
+        for item in range(0, 10, 2):
+            ras.discard(item)
+        chosen = {ras.choice() for _ in range(1000)}
+        self.assertEqual(chosen, {1, 3, 5, 7, 9})
+
+        for item in range(10):
+            ras.discard(item)
+        self.assertRaises(IndexError, ras.choice)
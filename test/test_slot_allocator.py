@@ -0,0 +1,81 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_slot_allocator.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import os
+import unittest
+
+from toolkit.prp.small_domain_prp import SmallDomainPRP
+from toolkit.slot_allocator import PRPSlotAllocator
+
+
+class TestSmallDomainPRP(unittest.TestCase):
+    def test_permutation(self):
+        for domain_size in [1, 2, 3, 5, 16, 17, 100, 1000, 4097]:
+            prp = SmallDomainPRP(domain_size, os.urandom(32))
+            outputs = [prp(x) for x in range(domain_size)]
+            self.assertEqual(sorted(outputs), list(range(domain_size)))
+
+    def test_inverse(self):
+        for domain_size in [1, 7, 255, 256, 1001]:
+            prp = SmallDomainPRP(domain_size, os.urandom(32))
+            for x in range(domain_size):
+                self.assertEqual(prp.inverse(prp(x)), x)
+
+    def test_determinism(self):
+        key = os.urandom(32)
+        prp1, prp2 = SmallDomainPRP(1000, key), SmallDomainPRP(1000, key)
+        self.assertListEqual([prp1(x) for x in range(1000)], [prp2(x) for x in range(1000)])
+
+    def test_out_of_domain(self):
+        prp = SmallDomainPRP(10)
+        self.assertRaises(ValueError, prp, 10)
+        self.assertRaises(ValueError, prp, -1)
+        self.assertRaises(ValueError, SmallDomainPRP, 0)
+        self.assertRaises(ValueError, SmallDomainPRP, 10, None, 0)
+        self.assertRaises(ValueError, SmallDomainPRP, 10, None, 256)
+
+
+class TestPRPSlotAllocator(unittest.TestCase):
+    def test_allocate_all_slots(self):
+        slot_count, first_slot = 1234, 1
+        allocator = PRPSlotAllocator(slot_count, first_slot=first_slot)
+        slots = [allocator.allocate() for _ in range(slot_count)]
+        self.assertEqual(sorted(slots), list(range(first_slot, first_slot + slot_count)))
+        self.assertRaises(IndexError, allocator.allocate)
+
+    def test_reserve(self):
+        key = os.urandom(32)
+        sequential_allocator = PRPSlotAllocator(500, key=key)
+        sequential_slots = [sequential_allocator.allocate() for _ in range(500)]
+
+        allocator = PRPSlotAllocator(500, key=key)
+        counter_ranges = [allocator.reserve(count) for count in (100, 1, 299, 100)]
+        self.assertEqual(allocator.allocated_count, 500)
+        self.assertRaises(IndexError, allocator.reserve, 1)
+        self.assertRaises(ValueError, allocator.reserve, -1)
+        self.assertEqual(allocator.allocated_count, 500)
+
+        # the ranges can be processed in any order (e.g. by parallel workers)
+        reserved_slots = []
+        for counter_range in reversed(counter_ranges):
+            reserved_slots = [allocator.slot_of(counter) for counter in counter_range] + reserved_slots
+        self.assertListEqual(sequential_slots, reserved_slots)
+
+    def test_empty(self):
+        allocator = PRPSlotAllocator(0, first_slot=1)
+        self.assertRaises(IndexError, allocator.allocate)
+
+    def test_reserve_negative_count(self):
+        allocator = PRPSlotAllocator(10)
+        allocator.reserve(5)
+        self.assertRaises(ValueError, allocator.reserve, -3)
+        self.assertEqual(allocator.allocated_count, 5)
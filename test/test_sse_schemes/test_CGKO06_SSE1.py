@@ -10,6 +10,8 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: 
 """
+import os
+import tempfile
 import unittest
 
 import schemes.CGKO06.SSE1.config
@@ -121,3 +123,71 @@ class TestSSE1(unittest.TestCase):
                                                     scheme.config))
 
             self.assertEqual(db[keyword], result.result)
+
+    def test_persistent_storage(self):
+        keyword_count = 10
+
+        config_dict = dict(schemes.CGKO06.SSE1.config.DEFAULT_CONFIG)
+        config_dict["param_s"] = 2 ** 12
+        config_dict["param_dictionary_size"] = 2 ** 10
+
+        db = fake_db_for_inverted_index_based_sse(config_dict["param_l"],
+                                                  config_dict["param_identifier_size"],
+                                                  keyword_count,
+                                                  db_w_size_range=(1, 200))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_dict["param_storage_path"] = os.path.join(temp_dir, "client_edb")
+            scheme = SSE1(config_dict)
+            key = scheme.KeyGen()
+            encrypted_index = scheme.EDBSetup(key, db)
+            self.assertTrue(os.path.exists(config_dict["param_storage_path"] + "_T"))
+            self.assertEqual(len(encrypted_index.A), config_dict["param_s"])
+            self.assertEqual(len(encrypted_index.T), config_dict["param_dictionary_size"])
+
+            # deserialize to another location, e.g. on the server side
+            server_config_dict = dict(config_dict, param_storage_path=os.path.join(temp_dir, "server_edb"))
+            server_scheme = SSE1(server_config_dict)
+            server_encrypted_index = SSE1EncryptedDatabase.deserialize(encrypted_index.serialize(),
+                                                                       server_scheme.config)
+            self.assertEqual(encrypted_index, server_encrypted_index)
+
+            for keyword in db:
+                token = scheme.TokenGen(key, keyword)
+                self.assertEqual(db[keyword], scheme.Search(encrypted_index, token).result)
+                self.assertEqual(db[keyword], server_scheme.Search(server_encrypted_index, token).result)
+
+            for edb in (encrypted_index, server_encrypted_index):
+                edb.A.release()
+                edb.T.release()
+
+    def test_parallel_encryption(self):
+        keyword_count = 50
+
+        config_dict = dict(schemes.CGKO06.SSE1.config.DEFAULT_CONFIG)
+        config_dict["param_worker_count"] = 2
+
+        db = fake_db_for_inverted_index_based_sse(config_dict["param_l"],
+                                                  config_dict["param_identifier_size"],
+                                                  keyword_count,
+                                                  db_w_size_range=(1, 100))
+
+        progress_list = []
+        scheme = SSE1(config_dict, progress_callback=lambda *progress: progress_list.append(progress))
+        key = scheme.KeyGen()
+        encrypted_index = scheme.EDBSetup(key, db)
+        self.assertEqual(progress_list[-1], ("node", keyword_count, keyword_count))
+
+        for keyword in db:
+            token = scheme.TokenGen(key, keyword)
+            result = scheme.Search(encrypted_index, token)
+            self.assertEqual(db[keyword], result.result)
+
+    def test_token_gen_many(self):
+        config_dict = schemes.CGKO06.SSE1.config.DEFAULT_CONFIG
+        keywords = [os.urandom(config_dict["param_l"]) for _ in range(20)]
+
+        scheme = SSE1(config_dict)
+        key = scheme.KeyGen()
+        self.assertEqual([scheme.TokenGen(key, keyword) for keyword in keywords], scheme.TokenGenMany(key, keywords))
+        self.assertEqual([], scheme.TokenGenMany(key, []))
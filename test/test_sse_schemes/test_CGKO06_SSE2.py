@@ -120,3 +120,52 @@ class TestSSE2(unittest.TestCase):
                                                     scheme.config))
 
             self.assertEqual(db[keyword], result.result)
+
+    def test_token_stream(self):
+        keyword_count = 20
+
+        config_dict = dict(schemes.CGKO06.SSE2.config.DEFAULT_CONFIG)
+        config_dict["param_token_batch_size"] = 4
+
+        db = fake_db_for_inverted_index_based_sse(
+            config_dict["param_l"], config_dict["param_identifier_size"],
+            keyword_count)
+
+        schemes.CGKO06.SSE2.config.scan_database_and_update_config_dict(
+            config_dict, database=db)
+
+        scheme = SSE2(config_dict)
+        key = scheme.KeyGen()
+        encrypted_index = scheme.EDBSetup(key, db)
+        for keyword in db:
+            complete_token = scheme.TokenGen(key, keyword)
+
+            result, sent_value_count = [], 0
+            for token in scheme.TokenGenStream(key, keyword):
+                # packed fixed-width format
+                token_bytes = token.serialize()
+                self.assertEqual(len(token_bytes), 5 + len(token.t) * scheme.config.param_token_size)
+                token = SSE2Token.deserialize(token_bytes, scheme.config)
+                self.assertEqual(token.t, complete_token.t[token.start - 1: token.start - 1 + len(token.t)])
+
+                sent_value_count += len(token.t)
+                partial_result, is_finished = scheme.SearchPartial(encrypted_index, token)
+                result.extend(partial_result.result)
+                if is_finished:
+                    break
+
+            self.assertEqual(db[keyword], result)
+            # the stream is stopped early, the number of generated values is O(|DB(w)|)
+            self.assertLessEqual(sent_value_count, 2 * len(db[keyword]) + 4)
+
+    def test_token_gen_many(self):
+        config_dict = dict(schemes.CGKO06.SSE2.config.DEFAULT_CONFIG)
+        db = fake_db_for_inverted_index_based_sse(
+            config_dict["param_l"], config_dict["param_identifier_size"], 20)
+        schemes.CGKO06.SSE2.config.scan_database_and_update_config_dict(config_dict, database=db)
+        keywords = list(db)
+
+        scheme = SSE2(config_dict)
+        key = scheme.KeyGen()
+        self.assertEqual([scheme.TokenGen(key, keyword) for keyword in keywords], scheme.TokenGenMany(key, keywords))
+        self.assertEqual([], scheme.TokenGenMany(key, []))
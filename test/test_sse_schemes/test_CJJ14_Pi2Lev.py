@@ -10,9 +10,12 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: 
 """
+import os
+import tempfile
 import unittest
 
 import schemes.CJJ14.Pi2Lev.config
+from data_persistence.persistent_array import SPFLBArray
 from schemes.CJJ14.Pi2Lev.config import Pi2LevConfig
 from schemes.CJJ14.Pi2Lev.construction import Pi2Lev
 from schemes.CJJ14.Pi2Lev.structures import Pi2LevKey, Pi2LevToken, Pi2LevEncryptedDatabase, Pi2LevResult
@@ -60,6 +63,54 @@ class TestPi2Lev(unittest.TestCase):
             result = scheme._Search(encrypted_index, token)
             self.assertEqual(db[keyword], result.result)
 
+    def test_array_slots_filled_exactly_once(self):
+        keyword_count = 20
+
+        config_dict = schemes.CJJ14.Pi2Lev.config.DEFAULT_CONFIG
+
+        db = fake_db_for_inverted_index_based_sse(
+            TEST_KEYWORD_SIZE,
+            config_dict.get("param_identifier_size"),
+            keyword_count,
+            db_w_size_range=(1, 5000))
+
+        scheme = Pi2Lev(config_dict)
+        key = scheme._Gen()
+
+        encrypted_index = scheme._Enc(key, db)
+        A = encrypted_index.A
+        self.assertIsNone(A[0])  # index of A start at 1
+        self.assertNotIn(None, A[1:])
+        # each ciphertext has its own random IV, so a slot written twice would leave another slot empty
+        self.assertEqual(len(set(A[1:])), len(A) - 1)
+
+    def test_search_with_persistent_array(self):
+        keyword_count = 20
+
+        config_dict = schemes.CJJ14.Pi2Lev.config.DEFAULT_CONFIG
+
+        db = fake_db_for_inverted_index_based_sse(
+            TEST_KEYWORD_SIZE,
+            config_dict.get("param_identifier_size"),
+            keyword_count,
+            db_w_size_range=(1, 5000))
+
+        scheme = Pi2Lev(config_dict)
+        key = scheme._Gen()
+
+        encrypted_index = scheme._Enc(key, db)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # index 0 of A is never used
+            encrypted_index.A = SPFLBArray.from_list([b"" if block is None else block for block in encrypted_index.A],
+                                                     os.path.join(temp_dir, "A"))
+            try:
+                for keyword in db:
+                    token = scheme._Trap(key, keyword)
+                    result = scheme._Search(encrypted_index, token)
+                    self.assertEqual(db[keyword], result.result)
+            finally:
+                encrypted_index.A.release()
+
     def test_interface_correctness(self):
         keyword_count = 1000
 
@@ -117,3 +168,12 @@ class TestPi2Lev(unittest.TestCase):
                                                       scheme.config))
 
             self.assertEqual(db[keyword], result.result)
+
+    def test_token_gen_many(self):
+        config_dict = schemes.CJJ14.Pi2Lev.config.DEFAULT_CONFIG
+        keywords = [os.urandom(TEST_KEYWORD_SIZE) for _ in range(20)]
+
+        scheme = Pi2Lev(config_dict)
+        key = scheme.KeyGen()
+        self.assertEqual([scheme.TokenGen(key, keyword) for keyword in keywords], scheme.TokenGenMany(key, keywords))
+        self.assertEqual([], scheme.TokenGenMany(key, []))
@@ -10,6 +10,8 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: 
 """
+import itertools
+import os
 import unittest
 
 import schemes
@@ -79,6 +81,71 @@ class TestPiBas(unittest.TestCase):
             result = scheme.Search(encrypted_index, token)
             self.assertEqual(db[keyword], result.result)
 
+    def test_search_many(self):
+        keyword_count = 100
+
+        config_dict = schemes.CJJ14.PiBas.config.DEFAULT_CONFIG
+
+        db = fake_db_for_inverted_index_based_sse(TEST_KEYWORD_SIZE,
+                                                  TEST_FILE_ID_SIZE,
+                                                  keyword_count,
+                                                  db_w_size_range=(1, 200))
+
+        scheme = PiBas(config_dict)
+        key = scheme.KeyGen()
+        encrypted_index = scheme.EDBSetup(key, db)
+        keywords = list(db)
+        result_list = scheme.SearchMany(encrypted_index, [scheme.TokenGen(key, keyword) for keyword in keywords])
+        self.assertEqual([db[keyword] for keyword in keywords], [result.result for result in result_list])
+
+    def test_search_iter(self):
+        keyword_count = 100
+
+        config_dict = schemes.CJJ14.PiBas.config.DEFAULT_CONFIG
+
+        db = fake_db_for_inverted_index_based_sse(TEST_KEYWORD_SIZE,
+                                                  TEST_FILE_ID_SIZE,
+                                                  keyword_count,
+                                                  db_w_size_range=(1, 200))
+
+        scheme = PiBas(config_dict)
+        key = scheme.KeyGen()
+        encrypted_index = scheme.EDBSetup(key, db)
+        for keyword in db:
+            token = scheme.TokenGen(key, keyword)
+            self.assertEqual(db[keyword], list(scheme.SearchIter(encrypted_index, token)))
+            self.assertEqual(db[keyword][:3], list(itertools.islice(scheme.SearchIter(encrypted_index, token), 3)))
+
+    def test_search_parallel(self):
+        keyword_count = 10
+
+        config_dict = schemes.CJJ14.PiBas.config.DEFAULT_CONFIG
+
+        db = fake_db_for_inverted_index_based_sse(TEST_KEYWORD_SIZE,
+                                                  TEST_FILE_ID_SIZE,
+                                                  keyword_count,
+                                                  db_w_size_range=(1, 200))
+
+        scheme = PiBas(config_dict)
+        key = scheme.KeyGen()
+        encrypted_index = scheme.EDBSetup(key, db)
+        for keyword in list(db)[:3]:
+            token = scheme.TokenGen(key, keyword)
+            expected = scheme.Search(encrypted_index, token)
+            self.assertEqual(expected, scheme.SearchParallel(encrypted_index, token, 3))
+            self.assertEqual(expected, scheme.SearchParallel(encrypted_index, token, 1))
+
+        # a long-lived pool is reused across the searches
+        pool = scheme.CreateSearchPool(encrypted_index, 3)
+        try:
+            for keyword in db:
+                token = scheme.TokenGen(key, keyword)
+                self.assertEqual(scheme.Search(encrypted_index, token),
+                                 scheme.SearchParallel(encrypted_index, token, 3, pool))
+        finally:
+            pool.terminate()
+            pool.join()
+
     def test_module_loader(self):
         loader = schemes.load_sse_module("CJJ14.PiBas")
         self.assertEqual(loader.SSEScheme, PiBas)
@@ -117,3 +184,12 @@ class TestPiBas(unittest.TestCase):
                                                      scheme.config))
 
             self.assertEqual(db[keyword], result.result)
+
+    def test_token_gen_many(self):
+        config_dict = schemes.CJJ14.PiBas.config.DEFAULT_CONFIG
+        keywords = [os.urandom(TEST_KEYWORD_SIZE) for _ in range(20)]
+
+        scheme = PiBas(config_dict)
+        key = scheme.KeyGen()
+        self.assertEqual([scheme.TokenGen(key, keyword) for keyword in keywords], scheme.TokenGenMany(key, keywords))
+        self.assertEqual([], scheme.TokenGenMany(key, []))
@@ -10,6 +10,7 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: 
 """
+import os
 import unittest
 
 import schemes.CJJ14.PiPack.config
@@ -117,3 +118,43 @@ class TestPiPack(unittest.TestCase):
                                                       scheme.config))
 
             self.assertEqual(db[keyword], result.result)
+
+    def test_search_parallel(self):
+        keyword_count = 10
+
+        config_dict = schemes.CJJ14.PiPack.config.DEFAULT_CONFIG
+
+        db = fake_db_for_inverted_index_based_sse(
+            TEST_KEYWORD_SIZE,
+            config_dict.get("param_identifier_size"),
+            keyword_count,
+            db_w_size_range=(1, 200))
+
+        scheme = PiPack(config_dict)
+        key = scheme.KeyGen()
+        encrypted_index = scheme.EDBSetup(key, db)
+        for keyword in list(db)[:3]:
+            token = scheme.TokenGen(key, keyword)
+            expected = scheme.Search(encrypted_index, token)
+            self.assertEqual(expected, scheme.SearchParallel(encrypted_index, token, 3))
+            self.assertEqual(expected, scheme.SearchParallel(encrypted_index, token, 1))
+
+        # a long-lived pool is reused across the searches
+        pool = scheme.CreateSearchPool(encrypted_index, 3)
+        try:
+            for keyword in db:
+                token = scheme.TokenGen(key, keyword)
+                self.assertEqual(scheme.Search(encrypted_index, token),
+                                 scheme.SearchParallel(encrypted_index, token, 3, pool))
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def test_token_gen_many(self):
+        config_dict = schemes.CJJ14.PiPack.config.DEFAULT_CONFIG
+        keywords = [os.urandom(TEST_KEYWORD_SIZE) for _ in range(20)]
+
+        scheme = PiPack(config_dict)
+        key = scheme.KeyGen()
+        self.assertEqual([scheme.TokenGen(key, keyword) for keyword in keywords], scheme.TokenGenMany(key, keywords))
+        self.assertEqual([], scheme.TokenGenMany(key, []))
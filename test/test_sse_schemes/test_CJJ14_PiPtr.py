@@ -10,6 +10,7 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: 
 """
+import os
 import unittest
 
 import schemes.CJJ14.PiPtr.config
@@ -60,6 +61,27 @@ class TestPiPtr(unittest.TestCase):
             result = scheme._Search(encrypted_index, token)
             self.assertEqual(db[keyword], result.result)
 
+    def test_array_slots_filled_exactly_once(self):
+        keyword_count = 100
+
+        config_dict = schemes.CJJ14.PiPtr.config.DEFAULT_CONFIG
+
+        db = fake_db_for_inverted_index_based_sse(
+            TEST_KEYWORD_SIZE,
+            config_dict.get("param_identifier_size"),
+            keyword_count,
+            db_w_size_range=(1, 200))
+
+        scheme = PiPtr(config_dict)
+        key = scheme._Gen()
+
+        encrypted_index = scheme._Enc(key, db)
+        A = encrypted_index.A
+        self.assertIsNone(A[0])  # index of A start at 1
+        self.assertNotIn(None, A[1:])
+        # each ciphertext has its own random IV, so a slot written twice would leave another slot empty
+        self.assertEqual(len(set(A[1:])), len(A) - 1)
+
     def test_interface_correctness(self):
         keyword_count = 1000
 
@@ -117,3 +139,12 @@ class TestPiPtr(unittest.TestCase):
                                                      scheme.config))
 
             self.assertEqual(db[keyword], result.result)
+
+    def test_token_gen_many(self):
+        config_dict = schemes.CJJ14.PiPtr.config.DEFAULT_CONFIG
+        keywords = [os.urandom(TEST_KEYWORD_SIZE) for _ in range(20)]
+
+        scheme = PiPtr(config_dict)
+        key = scheme.KeyGen()
+        self.assertEqual([scheme.TokenGen(key, keyword) for keyword in keywords], scheme.TokenGenMany(key, keywords))
+        self.assertEqual([], scheme.TokenGenMany(key, []))
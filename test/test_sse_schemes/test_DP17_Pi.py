@@ -10,6 +10,8 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: 
 """
+import os
+import tempfile
 import unittest
 
 import schemes.DP17.Pi.config
@@ -120,3 +122,69 @@ class TestPi(unittest.TestCase):
                                              scheme.config))
 
             self.assertEqual(set(db[keyword]), result.result)
+
+    def test_parallel_encryption(self):
+        keyword_count = 50
+
+        config_dict = dict(schemes.DP17.Pi.config.DEFAULT_CONFIG)
+        config_dict["param_worker_count"] = 2
+
+        db = fake_db_for_inverted_index_based_sse(
+            TEST_KEYWORD_SIZE,
+            config_dict.get("param_identifier_size"),
+            keyword_count,
+            db_w_size_range=(1, 100))
+
+        progress_list = []
+        scheme = Pi(config_dict, progress_callback=lambda *progress: progress_list.append(progress))
+        key = scheme.KeyGen()
+        encrypted_index = scheme.EDBSetup(key, db)
+        bucket_count = sum(len(Ai) for Ai in encrypted_index.A_dict.values())
+        self.assertEqual(progress_list[-1], ("bucket", bucket_count, bucket_count))
+
+        for keyword in db:
+            token = scheme.TokenGen(key, keyword)
+            result = scheme.Search(encrypted_index, token)
+            self.assertEqual(set(db[keyword]), result.result)
+
+    def test_persistent_storage(self):
+        keyword_count = 50
+
+        config_dict = dict(schemes.DP17.Pi.config.DEFAULT_CONFIG)
+        db = fake_db_for_inverted_index_based_sse(
+            TEST_KEYWORD_SIZE,
+            config_dict.get("param_identifier_size"),
+            keyword_count,
+            db_w_size_range=(1, 100))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_dict["param_storage_path"] = os.path.join(temp_dir, "client_edb")
+            scheme = Pi(config_dict)
+            key = scheme.KeyGen()
+            encrypted_index = scheme.EDBSetup(key, db)
+            for i in encrypted_index.A_dict:
+                self.assertTrue(os.path.exists(f"{config_dict['param_storage_path']}_A_{i}"))
+
+            # deserialize to another location, e.g. on the server side
+            server_config_dict = dict(config_dict, param_storage_path=os.path.join(temp_dir, "server_edb"))
+            server_scheme = Pi(server_config_dict)
+            server_encrypted_index = PiEncryptedDatabase.deserialize(encrypted_index.serialize(),
+                                                                     server_scheme.config)
+            self.assertEqual(encrypted_index, server_encrypted_index)
+
+            for keyword in db:
+                token = scheme.TokenGen(key, keyword)
+                self.assertEqual(set(db[keyword]), server_scheme.Search(server_encrypted_index, token).result)
+
+            for edb in (encrypted_index, server_encrypted_index):
+                for Ai in edb.A_dict.values():
+                    Ai.release()
+
+    def test_token_gen_many(self):
+        config_dict = schemes.DP17.Pi.config.DEFAULT_CONFIG
+        keywords = [os.urandom(TEST_KEYWORD_SIZE) for _ in range(20)]
+
+        scheme = Pi(config_dict)
+        key = scheme.KeyGen()
+        self.assertEqual([scheme.TokenGen(key, keyword) for keyword in keywords], scheme.TokenGenMany(key, keywords))
+        self.assertEqual([], scheme.TokenGenMany(key, []))
@@ -0,0 +1,49 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: test_symmetric_encryption.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description:
+"""
+import os
+import unittest
+
+from toolkit.symmetric_encryption.abstraction import AbstractSymmetricEncryption
+from toolkit.symmetric_encryption.aes import AESxCBC
+
+
+class TestAESxCBC(unittest.TestCase):
+    def test_decrypt_concatenated(self):
+        ske = AESxCBC(key_length=32)
+        key, other_key = ske.KeyGen(), ske.KeyGen()
+        messages = [os.urandom(40) for _ in range(100)]
+        cipher_list = [ske.Encrypt(key if i % 3 else other_key, message) for i, message in enumerate(messages)]
+        cipher_len = len(cipher_list[0])
+
+        plaintext_list = ske.DecryptConcatenated(key, b"".join(cipher_list), cipher_len)
+        # the result must be consistent with decrypting the ciphertexts one by one
+        expected_list = AbstractSymmetricEncryption.DecryptConcatenated(ske, key, b"".join(cipher_list), cipher_len)
+        self.assertEqual(plaintext_list, expected_list)
+
+        for i, (message, plaintext) in enumerate(zip(messages, plaintext_list)):
+            if i % 3:
+                self.assertEqual(message, plaintext)
+            else:
+                self.assertNotEqual(message, plaintext)
+
+        self.assertEqual(ske.DecryptConcatenated(key, b"", cipher_len), [])
+        self.assertRaises(ValueError, ske.DecryptConcatenated, key, b"".join(cipher_list)[:-1], cipher_len)
+
+    def test_decrypt_many(self):
+        ske = AESxCBC(key_length=16)
+        key = ske.KeyGen()
+        messages = [os.urandom(length) for length in (0, 1, 15, 16, 17, 100) * 10]
+        cipher_list = [ske.Encrypt(key, message) for message in messages]
+        self.assertEqual(ske.DecryptMany(key, cipher_list), messages)
+        self.assertEqual(ske.DecryptMany(key, []), [])
+        self.assertRaises(ValueError, ske.DecryptMany, key, [cipher_list[0][:-1]])
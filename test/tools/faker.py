@@ -14,8 +14,20 @@ import os
 import random
 
 from toolkit.bits import Bitset
+from toolkit.workload import LENGTH_DISTRIBUTIONS, IDENTIFIER_DISTRIBUTIONS, zipf_list_lengths, fake_zipf_db, \
+    write_zipf_db, iter_zipf_queries, write_zipf_query_log
 
-__all__ = ["fake_db_for_inverted_index_based_sse", "generate_random_bitset"]
+__all__ = [
+    "fake_db_for_inverted_index_based_sse",
+    "generate_random_bitset",
+    "LENGTH_DISTRIBUTIONS",
+    "IDENTIFIER_DISTRIBUTIONS",
+    "zipf_list_lengths",
+    "fake_zipf_db",
+    "write_zipf_db",
+    "iter_zipf_queries",
+    "write_zipf_query_log",
+]
 
 
 def fake_db_for_inverted_index_based_sse(fixed_keyword_size: int,
@@ -35,9 +47,10 @@ def fake_db_for_inverted_index_based_sse(fixed_keyword_size: int,
     db = {}
     for _ in range(distinct_keyword_count):
         keyword = os.urandom(fixed_keyword_size)
-        db[keyword] = []
-        for _ in range(random.randint(*db_w_size_range)):
-            db[keyword].append(os.urandom(fixed_file_id_size))
+        length = random.randint(*db_w_size_range)
+        identifier_block = os.urandom(length * fixed_file_id_size)
+        db[keyword] = [identifier_block[i: i + fixed_file_id_size]
+                       for i in range(0, len(identifier_block), fixed_file_id_size)]
     return db
 
 
@@ -0,0 +1,223 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: label_table.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Compact open-addressing table of fixed-size labels and fixed-size values, e.g. the dict D of [CJJ14]
+"""
+import typing
+
+_HEADER_SIZE = 4 + 8 + 8 + 8  # label size || value size || capacity || item count
+_PREFIX_SIZE = 8  # the number of leading bytes of the labels used to locate their slots
+DEFAULT_MAX_LOAD_FACTOR = 0.75
+
+
+class LabelTable:
+    """ A read-only dictionary whose labels (keys) and values are both of fixed size,
+    stored in contiguous buffers instead of a dict of bytes objects.
+
+    - Layout (capacity slots):
+        * Occupied: one byte for each slot, non-zero if the slot is occupied
+        * Labels: the label of slot i is labels[i * label_size: (i + 1) * label_size]
+        * Values: the value of slot i is values[i * value_size: (i + 1) * value_size]
+
+    Since the labels are (pseudo)random, the home slot of a label is its leading bytes modulo the capacity
+    without hashing, and the collisions are resolved by linear probing.
+    An integer label (e.g. the addresses of [CGKO06] SSE2) is the big-endian bytes of label_size.
+    The buffers of a loaded table can be any bytes-like object supporting slicing, e.g. memoryview of a mmap.
+    """
+
+    __slots__ = ["label_size", "value_size", "_occupied", "_labels", "_values", "_count", "_capacity"]
+
+    def __init__(self, label_size: int, value_size: int, occupied, labels, values, count: int = None):
+        """
+        :param count: (Optional) The number of occupied slots, if None, it is counted from the occupancy buffer
+        """
+        if label_size <= 0:
+            raise ValueError("The label size must be positive.")
+        if value_size < 0:
+            raise ValueError("The value size must be non-negative.")
+        capacity = len(occupied)
+        if capacity == 0 or len(labels) != capacity * label_size or len(values) != capacity * value_size:
+            raise ValueError("The lengths of the buffers do not match the capacity.")
+
+        self.label_size = label_size
+        self.value_size = value_size
+        self._occupied = occupied
+        self._labels = labels
+        self._values = values
+        self._capacity = capacity
+        self._count = capacity - bytes(occupied).count(0) if count is None else count
+
+    @classmethod
+    def from_pairs(cls,
+                   kv_pairs: typing.Iterable[typing.Tuple[typing.Union[bytes, int], bytes]],
+                   label_size: int = None,
+                   value_size: int = None,
+                   max_load_factor: float = DEFAULT_MAX_LOAD_FACTOR) -> 'LabelTable':
+        """ Build a table from (label, value) pairs.
+        If a label appears more than once, the last value is kept, as dict does.
+        :param label_size: (Optional) If None, it is the size of the first label,
+        or the size of the largest one if the labels are integers.
+        :param value_size: (Optional) If None, it is the size of the first value.
+        If there is no pair, the missing sizes are 1 and 0, since nothing can be found anyway.
+        :param max_load_factor: The maximum ratio of the labels to the slots
+        """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("The maximum load factor must be in (0, 1).")
+        kv_pairs = list(kv_pairs)
+        if kv_pairs:
+            if label_size is None:
+                if isinstance(kv_pairs[0][0], int):
+                    label_size = max((max(label for label, _ in kv_pairs).bit_length() + 7) // 8, 1)
+                else:
+                    label_size = len(kv_pairs[0][0])
+            value_size = len(kv_pairs[0][1]) if value_size is None else value_size
+        else:
+            label_size = 1 if label_size is None else label_size
+            value_size = 0 if value_size is None else value_size
+
+        capacity = max(int(len(kv_pairs) / max_load_factor) + 1, 1)
+        table = cls(label_size, value_size,
+                    bytearray(capacity), bytearray(capacity * label_size), bytearray(capacity * value_size))
+        for label, value in kv_pairs:
+            table._insert(table._to_label(label), value)
+        return table
+
+    def _to_label(self, label: typing.Union[bytes, int]) -> typing.Optional[bytes]:
+        """ The label in bytes, None if it cannot be in the table
+        """
+        if isinstance(label, int):
+            if not 0 <= label < 1 << (8 * self.label_size):
+                return None
+            return label.to_bytes(self.label_size, 'big')
+        return label if len(label) == self.label_size else None
+
+    def _home_slot(self, label: bytes) -> int:
+        return int.from_bytes(label[:_PREFIX_SIZE], 'big') % self._capacity
+
+    def _insert(self, label: typing.Optional[bytes], value: bytes):
+        if label is None or len(value) != self.value_size:
+            raise ValueError("The labels and values of a label table must be of fixed size.")
+        slot = self._find_slot(label)
+        if not self._occupied[slot]:
+            if self._count + 1 >= self._capacity:
+                raise ValueError("The label table is full.")
+            self._occupied[slot] = 1
+            self._labels[slot * self.label_size: (slot + 1) * self.label_size] = label
+            self._count += 1
+        self._values[slot * self.value_size: (slot + 1) * self.value_size] = value
+
+    def _find_slot(self, label: bytes) -> int:
+        """ The slot of the label, or the empty slot ending its probe sequence if not found
+        """
+        label_size, labels, occupied, capacity = self.label_size, self._labels, self._occupied, self._capacity
+        slot = self._home_slot(label)
+        while occupied[slot] and labels[slot * label_size: (slot + 1) * label_size] != label:
+            slot += 1
+            if slot == capacity:
+                slot = 0
+        return slot
+
+    def index(self, label: typing.Union[bytes, int]) -> int:
+        """ The slot of the label, or -1 if not found
+        """
+        label = self._to_label(label)
+        if label is None:
+            return -1
+        slot = self._find_slot(label)
+        return slot if self._occupied[slot] else -1
+
+    def value_at(self, slot: int) -> bytes:
+        return bytes(self._values[slot * self.value_size: (slot + 1) * self.value_size])
+
+    def get(self, label: typing.Union[bytes, int], default=None):
+        slot = self.index(label)
+        if slot == -1:
+            return default
+        return self.value_at(slot)
+
+    def __getitem__(self, label: typing.Union[bytes, int]) -> bytes:
+        slot = self.index(label)
+        if slot == -1:
+            raise KeyError(label)
+        return self.value_at(slot)
+
+    def __contains__(self, label) -> bool:
+        return self.index(label) != -1
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for slot in range(self._capacity):
+            if self._occupied[slot]:
+                yield bytes(self._labels[slot * self.label_size: (slot + 1) * self.label_size])
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        for slot in range(self._capacity):
+            if self._occupied[slot]:
+                yield bytes(self._labels[slot * self.label_size: (slot + 1) * self.label_size]), self.value_at(slot)
+
+    def __eq__(self, other):
+        if not isinstance(other, LabelTable):
+            return False
+        return self.label_size == other.label_size and self.value_size == other.value_size and \
+            self._count == other._count and dict(self.items()) == dict(other.items())
+
+    def __reduce__(self):
+        return type(self), (self.label_size, self.value_size,
+                            bytes(self._occupied), bytes(self._labels), bytes(self._values), self._count)
+
+    def __repr__(self):
+        return f"<LabelTable count: {self._count}, capacity: {self._capacity}, " \
+               f"label size: {self.label_size}, value size: {self.value_size}>"
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """ The size of the occupancy, label and value buffers
+        """
+        return len(self._occupied) + len(self._labels) + len(self._values)
+
+    def to_bytes(self) -> bytes:
+        """ Header (label size, value size, capacity, count) || occupancy buffer || label buffer || value buffer
+        """
+        return b''.join([self.label_size.to_bytes(4, 'big'),
+                         self.value_size.to_bytes(8, 'big'),
+                         self._capacity.to_bytes(8, 'big'),
+                         self._count.to_bytes(8, 'big'),
+                         bytes(self._occupied),
+                         bytes(self._labels),
+                         bytes(self._values)])
+
+    @classmethod
+    def from_buffer(cls, buffer, offset: int = 0) -> 'LabelTable':
+        """ Load a table from a buffer produced by `to_bytes`, without copying it,
+        so that the buffer can be a mmap object.
+        """
+        view = memoryview(buffer)
+        label_size = int.from_bytes(view[offset: offset + 4], 'big')
+        value_size = int.from_bytes(view[offset + 4: offset + 12], 'big')
+        capacity = int.from_bytes(view[offset + 12: offset + 20], 'big')
+        count = int.from_bytes(view[offset + 20: offset + 28], 'big')
+
+        occupied_begin = offset + _HEADER_SIZE
+        labels_begin = occupied_begin + capacity
+        values_begin = labels_begin + capacity * label_size
+        values_end = values_begin + capacity * value_size
+        if len(view) < values_end:
+            raise ValueError("The buffer is too short.")
+        return cls(label_size, value_size, view[occupied_begin: labels_begin], view[labels_begin: values_begin],
+                   view[values_begin: values_end], count)
@@ -0,0 +1,193 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: level_table.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Read-only table of fixed-size labels and fixed-size values, e.g. a level of [CT14] and [ANSS16]
+"""
+import typing
+
+_HEADER_SIZE = 4 + 8 + 8  # label size || value size || item count
+_PREFIX_SIZE = 8  # the number of leading bytes of the labels used for interpolation
+
+
+class LevelTable:
+    """ A read-only dictionary whose labels (keys) and values are both of fixed size.
+
+    - Layout:
+        * Labels: all labels in ascending order, concatenated into one buffer
+        * Values: the values in the order of their labels, concatenated into one buffer,
+          i.e., the i-th value is values[i * value_size: (i + 1) * value_size]
+
+    Since the labels are (pseudo)random, they are distributed uniformly,
+    so that a label is located by interpolation search in O(log log n) expected probes.
+    The buffers can be any bytes-like object supporting slicing, e.g. bytes, memoryview of a mmap.
+    """
+
+    __slots__ = ["label_size", "value_size", "_labels", "_values", "_count"]
+
+    def __init__(self, label_size: int, value_size: int, labels, values):
+        if label_size <= 0:
+            raise ValueError("The label size must be positive.")
+        if value_size < 0:
+            raise ValueError("The value size must be non-negative.")
+        if len(labels) % label_size:
+            raise ValueError("The length of the label buffer is not a multiple of the label size.")
+        if len(values) != (len(labels) // label_size) * value_size:
+            raise ValueError("The length of the value buffer does not match the number of labels.")
+
+        self.label_size = label_size
+        self.value_size = value_size
+        self._labels = labels
+        self._values = values
+        self._count = len(labels) // label_size
+
+    @classmethod
+    def from_pairs(cls,
+                   kv_pairs: typing.Iterable[typing.Tuple[bytes, bytes]],
+                   label_size: int = None,
+                   value_size: int = None) -> 'LevelTable':
+        """ Build a table from (label, value) pairs.
+        If a label appears more than once, the last value is kept, as dict does.
+        :param label_size: (Optional) If None, it is the size of the first label.
+        :param value_size: (Optional) If None, it is the size of the first value.
+        """
+        kv_pairs = sorted(kv_pairs, key=lambda pair: pair[0])  # stable, so the last one of equal labels is the last
+        if kv_pairs:
+            label_size = len(kv_pairs[0][0]) if label_size is None else label_size
+            value_size = len(kv_pairs[0][1]) if value_size is None else value_size
+        elif label_size is None or value_size is None:
+            raise ValueError("The label size and value size must be given when there is no pair.")
+
+        label_list, value_list = [], []
+        for label, value in kv_pairs:
+            if len(label) != label_size or len(value) != value_size:
+                raise ValueError("The labels and values of a level table must be of fixed size.")
+            if label_list and label_list[-1] == label:  # duplicated label, overwrite
+                value_list[-1] = value
+                continue
+            label_list.append(label)
+            value_list.append(value)
+
+        return cls(label_size, value_size, b''.join(label_list), b''.join(value_list))
+
+    def _label_at(self, index: int) -> bytes:
+        return bytes(self._labels[index * self.label_size: (index + 1) * self.label_size])
+
+    def _prefix_at(self, index: int) -> int:
+        begin = index * self.label_size
+        return int.from_bytes(self._labels[begin: begin + min(_PREFIX_SIZE, self.label_size)], 'big')
+
+    def index(self, label: bytes) -> int:
+        """ Interpolation search, returns the index of the label, or -1 if not found.
+        """
+        if len(label) != self.label_size or self._count == 0:
+            return -1
+
+        key = int.from_bytes(label[:_PREFIX_SIZE], 'big')
+        low, high = 0, self._count - 1
+        while low <= high:
+            low_key, high_key = self._prefix_at(low), self._prefix_at(high)
+            if key < low_key or key > high_key:
+                return -1
+            if high_key == low_key:
+                mid = low
+            else:
+                mid = low + (key - low_key) * (high - low) // (high_key - low_key)
+
+            mid_label = self._label_at(mid)
+            if mid_label == label:
+                return mid
+            if mid_label < label:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return -1
+
+    def value_at(self, index: int) -> bytes:
+        return bytes(self._values[index * self.value_size: (index + 1) * self.value_size])
+
+    def get(self, label: bytes, default=None):
+        index = self.index(label)
+        if index == -1:
+            return default
+        return self.value_at(index)
+
+    def __getitem__(self, label: bytes) -> bytes:
+        index = self.index(label)
+        if index == -1:
+            raise KeyError(label)
+        return self.value_at(index)
+
+    def __contains__(self, label: bytes) -> bool:
+        return self.index(label) != -1
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._label_at(index)
+
+    def items(self):
+        for index in range(self._count):
+            yield self._label_at(index), self.value_at(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, LevelTable):
+            return False
+        return self.label_size == other.label_size and self.value_size == other.value_size and \
+            bytes(self._labels) == bytes(other._labels) and bytes(self._values) == bytes(other._values)
+
+    def __reduce__(self):
+        return type(self), (self.label_size, self.value_size, bytes(self._labels), bytes(self._values))
+
+    def __repr__(self):
+        return f"<LevelTable count: {self._count}, label size: {self.label_size}, value size: {self.value_size}>"
+
+    @property
+    def nbytes(self) -> int:
+        """ The size of the label buffer and value buffer
+        """
+        return len(self._labels) + len(self._values)
+
+    def to_bytes(self) -> bytes:
+        """ Header (label size, value size, count) || label buffer || value buffer
+        """
+        return b''.join([self.label_size.to_bytes(4, 'big'),
+                         self.value_size.to_bytes(8, 'big'),
+                         self._count.to_bytes(8, 'big'),
+                         bytes(self._labels),
+                         bytes(self._values)])
+
+    @classmethod
+    def from_buffer(cls, buffer, offset: int = 0) -> 'LevelTable':
+        """ Load a table from a buffer produced by `to_bytes`, without copying it,
+        so that the buffer can be a mmap object.
+        """
+        view = memoryview(buffer)
+        label_size = int.from_bytes(view[offset: offset + 4], 'big')
+        value_size = int.from_bytes(view[offset + 4: offset + 12], 'big')
+        count = int.from_bytes(view[offset + 12: offset + 20], 'big')
+
+        labels_begin = offset + _HEADER_SIZE
+        values_begin = labels_begin + count * label_size
+        values_end = values_begin + count * value_size
+        if len(view) < values_end:
+            raise ValueError("The buffer is too short.")
+        return cls(label_size, value_size, view[labels_begin: values_begin], view[values_begin: values_end])
+
+    @staticmethod
+    def size_in_buffer(buffer, offset: int = 0) -> int:
+        """ The number of bytes occupied by the table stored at offset of the buffer
+        """
+        view = memoryview(buffer)
+        label_size = int.from_bytes(view[offset: offset + 4], 'big')
+        value_size = int.from_bytes(view[offset + 4: offset + 12], 'big')
+        count = int.from_bytes(view[offset + 12: offset + 20], 'big')
+        return _HEADER_SIZE + count * (label_size + value_size)
@@ -0,0 +1,59 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: random_access_set.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: A set supporting O(1) insertion, deletion and uniformly random choice
+"""
+import random
+import typing
+
+
+class RandomAccessSet:
+    """ A set of hashable items, stored in a list with an item -> position index.
+    Deleting an item moves the last item of the list into its position (swap-remove),
+    so that the list is always dense and `choice` is a single random index.
+    """
+
+    __slots__ = ["_items", "_positions"]
+
+    def __init__(self, items: typing.Iterable = ()):
+        self._items = []
+        self._positions = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item) -> None:
+        if item in self._positions:
+            return
+        self._positions[item] = len(self._items)
+        self._items.append(item)
+
+    def discard(self, item) -> None:
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        last_item = self._items.pop()
+        if position < len(self._items):  # the deleted item is not the last one, move the last one to its position
+            self._items[position] = last_item
+            self._positions[last_item] = position
+
+    def choice(self, rng: random.Random = random):
+        """ Choose an item uniformly at random.
+        Raises IndexError if the set is empty, as random.choice does.
+        """
+        return rng.choice(self._items)
+
+    def __contains__(self, item) -> bool:
+        return item in self._positions
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
@@ -12,6 +12,7 @@ LIB-SSE CODE
 Database related utility functions,
 such as getting the number of individual keywords, database size, etc.
 """
+import random
 
 
 def get_total_size(db: dict):
@@ -32,6 +33,14 @@ def get_distinct_file_count(db: dict):
     return len(file_set)
 
 
+def get_list_length_histogram(db: dict) -> dict:
+    """Get the histogram of the lengths of the keyword lists, i.e. {|DB(w)|: the number of keywords w}"""
+    histogram = {}
+    for identifier_list in db.values():
+        histogram[len(identifier_list)] = histogram.get(len(identifier_list), 0) + 1
+    return histogram
+
+
 def partition_identifiers_to_blocks(identifier_list: list,
                                     entry_count_in_one_block: int,
                                     identifier_size: int,
@@ -80,6 +89,24 @@ def parse_identifiers_from_block_given_entry_count_in_one_block(
         block, identifier_size)
 
 
+def iterate_padded_database(db: dict, padded_total_size: int):
+    """ A lazy view of db padded with dummy keyword lists, so that its total size is padded_total_size.
+    Nothing is copied: the real lists are yielded as they are, and the dummy lists are described only by their lengths.
+    :return: An iterator of (keyword, identifier_list, list_len),
+    for a dummy list, both keyword and identifier_list are None.
+    """
+    N = 0
+    for keyword, identifier_list in db.items():
+        N += len(identifier_list)
+        yield keyword, identifier_list, len(identifier_list)
+
+    # If N is less than padded_total_size, pad DB by adding some dummy keyword-identifier pairs.
+    while N < padded_total_size:
+        dummy_list_len = random.randint(1, padded_total_size - N)
+        yield None, None, dummy_list_len
+        N += dummy_list_len
+
+
 def convert_database_keyword_to_bytes(db: dict, encoding="utf-8"):
     """Make sure that all keywords in db are strings and all values are hex-strings. """
     result = {}
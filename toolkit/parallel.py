@@ -0,0 +1,95 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: parallel.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Helpers for running independent tasks on a pool of worker processes
+"""
+import multiprocessing
+import multiprocessing.pool
+import typing
+
+# progress_callback(stage, finished_task_num, total_task_num)
+ProgressCallback = typing.Callable[[str, int, typing.Optional[int]], None]
+
+
+def _get_context():
+    """ Prefer fork, so that the workers inherit the state of the parent process without pickling it.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def create_pool(worker_count: int,
+                initializer: typing.Optional[typing.Callable] = None,
+                initargs: tuple = ()) -> multiprocessing.pool.Pool:
+    """ Create a long-lived pool, which can be passed to imap_with_progress several times, e.g. for all the queries
+    of a service, so that the workers are not forked per call. The caller terminates it when it is no longer used.
+    """
+    if worker_count <= 0:
+        raise ValueError("The number of workers must be positive.")
+    return _get_context().Pool(worker_count, initializer=initializer, initargs=initargs)
+
+
+def imap_with_progress(func: typing.Callable,
+                       tasks: typing.Iterable,
+                       worker_count: int = 1,
+                       *,
+                       initializer: typing.Optional[typing.Callable] = None,
+                       initargs: tuple = (),
+                       chunk_size: int = 1,
+                       stage: str = "",
+                       total: typing.Optional[int] = None,
+                       progress_callback: typing.Optional[ProgressCallback] = None,
+                       pool: typing.Optional[multiprocessing.pool.Pool] = None) -> typing.Iterator:
+    """ Apply func to each task and yield the results in the order of the tasks.
+
+    :param func: A module-level function, since it is sent to the worker processes
+    :param tasks: The tasks, which are consumed lazily
+    :param worker_count: The number of worker processes.
+    If it is not greater than 1, the tasks are executed in the current process, and no pool is created.
+    :param initializer: If not None, each worker (or the current process) calls initializer(*initargs) firstly
+    :param initargs: Arguments of initializer
+    :param chunk_size: The number of tasks sent to a worker at once
+    :param stage: The stage name reported to progress_callback
+    :param total: The number of tasks, reported to progress_callback
+    :param progress_callback: If not None, it is called after each task is finished
+    :param pool: If not None, the tasks are executed on this pool (see create_pool), which is neither created
+    nor terminated here. worker_count, initializer and initargs are ignored, since its workers are already initialized.
+    """
+    owned_pool = None  # the pool created for this call, terminated when the call finishes
+    if pool is not None:
+        result_iter = pool.imap(func, tasks, chunksize=chunk_size)
+    elif worker_count <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        result_iter = map(func, tasks)
+    else:
+        owned_pool = create_pool(worker_count, initializer, initargs)
+        result_iter = owned_pool.imap(func, tasks, chunksize=chunk_size)
+
+    try:
+        for finished_num, result in enumerate(result_iter, start=1):
+            if progress_callback is not None:
+                progress_callback(stage, finished_num, total)
+            yield result
+    finally:
+        if owned_pool is not None:
+            owned_pool.terminate()
+            owned_pool.join()
+
+
+def split_into_ranges(length: int, part_count: int) -> typing.List[typing.Tuple[int, int]]:
+    """ Split range(length) into at most part_count contiguous non-empty ranges [begin, end) of almost equal sizes,
+    e.g. the slices of a block decrypted by different workers.
+    """
+    if part_count <= 0:
+        raise ValueError("The number of parts must be positive.")
+    part_count = min(part_count, length)
+    return [(length * i // part_count, length * (i + 1) // part_count) for i in range(part_count)]
@@ -11,6 +11,7 @@ LIB-SSE CODE
 @description: 
 """
 import abc
+import typing
 
 
 class AbstractPRF(metaclass=abc.ABCMeta):
@@ -20,4 +21,10 @@ class AbstractPRF(metaclass=abc.ABCMeta):
         self.message_length = message_length
 
     def __call__(self, key: bytes, message: bytes) -> bytes:
-        raise NotImplementedError("Class AbstractPRF is an abstract class.")
\ No newline at end of file
+        raise NotImplementedError("Class AbstractPRF is an abstract class.")
+
+    def batch(self, key: bytes, messages: typing.Iterable[bytes]) -> typing.List[bytes]:
+        """ Evaluate the PRF on several messages under the same key,
+        the concrete implementation can override it to reuse the keyed state.
+        """
+        return [self(key, message) for message in messages]
\ No newline at end of file
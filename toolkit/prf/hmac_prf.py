@@ -14,6 +14,7 @@ LIB-SSE CODE
 import functools
 import hashlib
 import hmac
+import typing
 
 from toolkit.constants import LENGTH_UNLIMITED, LENGTH_NOT_GIVEN
 from toolkit.prf.abstraction import AbstractPRF
@@ -52,6 +53,31 @@ def _tls_p_hash(key: bytes,
     return res[:output_len]
 
 
+def _keyed_tls_p_hash(keyed_hmac: "hmac.HMAC",
+                      message: bytes,
+                      output_len: int) -> bytes:
+    """
+    The same as _tls_p_hash, but the HMAC keyed by the secret is given,
+    and it is copied instead of being keyed again for each HMAC evaluation
+    """
+    def _hmac(data: bytes) -> bytes:
+        h = keyed_hmac.copy()
+        h.update(data)
+        return h.digest()
+
+    n = (output_len + keyed_hmac.digest_size - 1) // keyed_hmac.digest_size
+
+    res = []
+    a = _hmac(message)  # A(1)
+
+    while n > 0:
+        res.append(_hmac(a + message))
+        a = _hmac(a)
+        n -= 1
+
+    return b"".join(res)[:output_len]
+
+
 class HmacPRF(AbstractPRF):
     """The HMAC function being used as a PRF, described in NIST SP 800-35 Rev. 1."""
 
@@ -89,3 +115,20 @@ class HmacPRF(AbstractPRF):
 
         return _tls_p_hash(key, message, self.output_length,
                            self.hash_func_name)
+
+    def batch(self, key: bytes, messages: typing.Iterable[bytes]) -> typing.List[bytes]:
+        """ Evaluate the PRF on several messages, the HMAC is keyed only once
+        """
+        if self.key_length != LENGTH_UNLIMITED and len(key) != self.key_length:
+            raise ValueError(
+                "The key length of the PRF does not meet the definition.")
+
+        keyed_hmac = hmac.new(key, digestmod=self.hash_func_name)
+        output_list = []
+        for message in messages:
+            if self.message_length != LENGTH_UNLIMITED and len(
+                    message) != self.message_length:
+                raise ValueError(
+                    "The message length of the PRF does not meet the definition")
+            output_list.append(_keyed_tls_p_hash(keyed_hmac, message, self.output_length))
+        return output_list
@@ -10,6 +10,7 @@ LIB-SSE CODE
 @software: PyCharm
 """
 import abc
+import typing
 
 from toolkit.bits import Bitset
 
@@ -30,3 +31,9 @@ class AbstractBitwisePRP(metaclass=abc.ABCMeta):
 
     def __call__(self, key: bytes, message: Bitset) -> Bitset:
         raise NotImplementedError("Class AbstractBitwisePRP is an abstract class.")
+
+    def batch(self, key: Bitset, messages: typing.Iterable[Bitset]) -> typing.List[Bitset]:
+        """ Evaluate the PRP on several messages under the same key,
+        the concrete implementation can override it to reuse the keyed state.
+        """
+        return [self(key, message) for message in messages]
@@ -10,6 +10,8 @@ LIB-SSE CODE
 @software: PyCharm 
 @description: 
 """
+import typing
+
 from toolkit.bits import Bitset
 from toolkit.prp.abstraction import AbstractBitwisePRP
 from toolkit.symmetric_encryption.fpe import BitwiseFFX
@@ -30,3 +32,13 @@ class BitwiseFPEPRP(AbstractBitwisePRP):
             raise ValueError("Message(Input) bit length mismatch for PRP.")
 
         return self.underlying_fpe.encrypt(bytes(key), message)
+
+    def batch(self, key: Bitset, messages: typing.Iterable[Bitset]) -> typing.List[Bitset]:
+        if len(key) != self.key_bit_length:
+            raise ValueError("Key bit length mismatch for PRP.")
+        messages = list(messages)
+        for message in messages:
+            if len(message) != self.message_bit_length:
+                raise ValueError("Message(Input) bit length mismatch for PRP.")
+
+        return self.underlying_fpe.encrypt_many(bytes(key), messages)
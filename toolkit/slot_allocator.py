@@ -0,0 +1,62 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: slot_allocator.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Random slot allocation for arrays of encrypted blocks, e.g. the array A in [CJJ+14]
+"""
+from toolkit.prp.small_domain_prp import SmallDomainPRP
+
+
+class PRPSlotAllocator:
+    """ Allocate the slots [first_slot, first_slot + slot_count) of an array in a random order.
+
+    The i-th allocation (counting from 0) returns first_slot + PRP(i),
+    so that the allocator only keeps a counter instead of a materialized list of free slots.
+    Since `slot_of` is a pure function of the counter, disjoint counter ranges
+    (see `reserve`) can be handed out to parallel workers safely.
+    """
+
+    def __init__(self, slot_count: int, first_slot: int = 0, key: bytes = None):
+        self.slot_count = slot_count
+        self.first_slot = first_slot
+        self._prp = SmallDomainPRP(slot_count, key) if slot_count > 0 else None
+        self._next_counter = 0
+
+    def slot_of(self, counter: int) -> int:
+        """ Returns the slot assigned to the given allocation counter.
+        """
+        if not 0 <= counter < self.slot_count:
+            raise IndexError("No empty slot is left.")
+        return self.first_slot + self._prp(counter)
+
+    def allocate(self) -> int:
+        """ Choose a random empty slot.
+        """
+        slot = self.slot_of(self._next_counter)
+        self._next_counter += 1
+        return slot
+
+    def reserve(self, count: int) -> range:
+        """ Reserve `count` successive allocation counters,
+        the corresponding slots can be obtained by `slot_of` later, even in another process.
+        """
+        if count < 0:
+            raise ValueError("The number of reserved slots must be non-negative.")
+        if self._next_counter + count > self.slot_count:
+            raise IndexError("No empty slot is left.")
+        counters = range(self._next_counter, self._next_counter + count)
+        self._next_counter += count
+        return counters
+
+    @property
+    def allocated_count(self) -> int:
+        return self._next_counter
+
+    def __len__(self):
+        return self.slot_count
@@ -11,6 +11,7 @@ LIB-SSE CODE
 @description: 
 """
 import abc
+import typing
 
 
 class AbstractSymmetricEncryption(metaclass=abc.ABCMeta):
@@ -27,3 +28,25 @@ class AbstractSymmetricEncryption(metaclass=abc.ABCMeta):
 
     def Decrypt(self, key: bytes, cipher_text: bytes) -> bytes:
         pass
+
+    def DecryptMany(self, key: bytes, cipher_texts: typing.Iterable[bytes]) -> typing.List[bytes]:
+        """Decrypt several ciphertexts under the same key,
+        the concrete implementation can override it to reuse the key schedule."""
+        return [self.Decrypt(key, cipher_text) for cipher_text in cipher_texts]
+
+    def DecryptConcatenated(self,
+                            key: bytes,
+                            cipher_buffer: bytes,
+                            cipher_len: int) -> typing.List[typing.Optional[bytes]]:
+        """Decrypt a buffer made of ciphertexts of cipher_len bytes each under the same key.
+        A ciphertext that is not valid under the key gives None instead of raising ValueError,
+        so that the caller can trial-decrypt a buffer of foreign ciphertexts cheaply."""
+        if len(cipher_buffer) % cipher_len:
+            raise ValueError("The length of the buffer is not a multiple of the ciphertext length.")
+        output_list = []
+        for begin in range(0, len(cipher_buffer), cipher_len):
+            try:
+                output_list.append(self.Decrypt(key, cipher_buffer[begin: begin + cipher_len]))
+            except ValueError:
+                output_list.append(None)
+        return output_list
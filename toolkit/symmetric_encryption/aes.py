@@ -11,6 +11,7 @@ LIB-SSE CODE
 @description: 
 """
 import os
+import typing
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
@@ -73,3 +74,72 @@ class AESxCBC(AbstractSymmetricEncryption):
         # PKCS7 Unpadding
         output = pkcs7_unpad(padded_plaintext, algorithms.AES.block_size)
         return output
+
+    def DecryptMany(self, key: bytes, cipher_texts: typing.Iterable[bytes]) -> typing.List[bytes]:
+        if len(key) != self.key_length:
+            raise ValueError("Key length mismatch for AES-CBC.")
+        block_len = algorithms.AES.block_size // 8
+        cipher_texts = list(cipher_texts)
+        for cipher_text in cipher_texts:
+            if self.cipher_length != LENGTH_UNLIMITED and len(cipher_text) != self.cipher_length:
+                raise ValueError("Ciphertext length mismatch for AES-CBC.")
+            if len(cipher_text) < 2 * block_len or len(cipher_text) % block_len:
+                raise ValueError("The AES-CBC ciphertext length needs to be an integer multiple of 16 bytes.")
+        if not cipher_texts:
+            return []
+
+        # The ciphertexts are concatenated and decrypted together, see _decrypt_cbc_buffer
+        plaintext_buffer = self._decrypt_cbc_buffer(key, b''.join(cipher_texts))
+        output_list, begin = [], 0
+        for cipher_text in cipher_texts:
+            end = begin + len(cipher_text) - block_len
+            output_list.append(pkcs7_unpad(plaintext_buffer[begin: end], algorithms.AES.block_size))
+            begin += len(cipher_text)
+        return output_list
+
+    @staticmethod
+    def _decrypt_cbc_buffer(key: bytes, cipher_buffer: bytes) -> bytes:
+        """ Decrypt concatenated ciphertexts (IV || blocks) with one ECB call over the whole buffer.
+        The padded plaintext of the ciphertext beginning at offset o of the buffer is
+        output[o: o + its length - IV length].
+        """
+        # In CBC mode, P_j = D(C_j) ⊕ C_{j-1} where C_0 is IV.
+        # In the buffer, C_{j-1} of each ciphertext block is right before it,
+        # so all blocks are decrypted by one ECB call and one xor of the buffer shifted by a block.
+        # The blocks at the position of IVs are garbage and skipped.
+        block_len = algorithms.AES.block_size // 8
+        decryptor = Cipher(algorithms.AES(key), modes.ECB()).decryptor()
+        decrypted_buffer = decryptor.update(cipher_buffer) + decryptor.finalize()
+        xor_len = len(cipher_buffer) - block_len
+        return (int.from_bytes(decrypted_buffer[block_len:], 'big') ^
+                int.from_bytes(cipher_buffer[:xor_len], 'big')).to_bytes(xor_len, 'big')
+
+    def DecryptConcatenated(self,
+                            key: bytes,
+                            cipher_buffer: bytes,
+                            cipher_len: int) -> typing.List[typing.Optional[bytes]]:
+        if len(key) != self.key_length:
+            raise ValueError("Key length mismatch for AES-CBC.")
+        block_len = algorithms.AES.block_size // 8
+        if cipher_len < 2 * block_len or cipher_len % block_len or len(cipher_buffer) % cipher_len:
+            raise ValueError("The length of the buffer is not a multiple of the ciphertext length.")
+        if self.cipher_length != LENGTH_UNLIMITED and cipher_len != self.cipher_length:
+            raise ValueError("Ciphertext length mismatch for AES-CBC.")
+        if not cipher_buffer:
+            return []
+
+        plaintext_buffer = self._decrypt_cbc_buffer(key, cipher_buffer)
+
+        # The padded plaintext of the ciphertext beginning at offset o is plaintext_buffer[o: o + cipher_len - IV len]
+        padded_len = cipher_len - block_len
+        output_list = []
+        for begin in range(0, len(cipher_buffer), cipher_len):
+            end = begin + padded_len
+            pad_len = plaintext_buffer[end - 1]
+            # PKCS7 Unpadding, invalid padding means that the ciphertext is not encrypted under the key
+            if 0 < pad_len <= block_len and \
+                    plaintext_buffer[end - pad_len: end] == bytes((pad_len,)) * pad_len:
+                output_list.append(plaintext_buffer[begin: end - pad_len])
+            else:
+                output_list.append(None)
+        return output_list
@@ -14,6 +14,7 @@ See https://github.com/emulbreh/pyffx (MIT License)
 import hashlib
 import hmac
 import struct
+import typing
 
 from toolkit.bits import Bitset
 from toolkit.bits_utils import half_bits, half_bits_not_padding
@@ -33,6 +34,11 @@ class BitwiseFFX:
         self.digest_size = self.digest_mod().digest_size
 
     def round(self, key: bytes, i: int, s: Bitset, output_len=0) -> Bitset:
+        return self._keyed_round(hmac.new(key, digestmod=self.digest_mod), i, s, output_len)
+
+    def _keyed_round(self, keyed_hmac, i: int, s: Bitset, output_len=0) -> Bitset:
+        """ The round function, where keyed_hmac is an HMAC object already keyed, which is copied for each hash
+        """
         if output_len == 0:
             output_len = len(s)
 
@@ -41,8 +47,9 @@ class BitwiseFFX:
         i = 0
         result = Bitset(0b0, 0)
         while True:
-            h = hmac.new(key, pre + struct.pack('I', i), self.digest_mod)
-            d = Bitset(int(h.hexdigest(), 16), output_len_per_hash)
+            h = keyed_hmac.copy()
+            h.update(pre + struct.pack('I', i))
+            d = Bitset(int.from_bytes(h.digest(), 'big'), output_len_per_hash)
             result = result + d
             if len(result) >= output_len:
                 break
@@ -59,6 +66,19 @@ class BitwiseFFX:
             a, b = b, c
         return a + b
 
+    def encrypt_many(self, key: bytes, v_list: typing.Iterable[Bitset]) -> typing.List[Bitset]:
+        """ Encrypt several messages under the same key, the keyed HMAC state is computed only once
+        """
+        keyed_hmac = hmac.new(key, digestmod=self.digest_mod)
+        output_list = []
+        for v in v_list:
+            a, b = self.split(v)
+            for i in range(self.rounds):
+                c = a ^ self._keyed_round(keyed_hmac, i, b, len(a))
+                a, b = b, c
+            output_list.append(a + b)
+        return output_list
+
     def decrypt(self, key: bytes, v: Bitset) -> Bitset:
         a, b = self.split(v)
         for i in range(self.rounds - 1, -1, -1):
@@ -0,0 +1,208 @@
+# -*- coding:utf-8 _*-
+"""
+LIB-SSE CODE
+@author: Jeza Chen
+@license: GPL-3.0 License
+@file: workload.py
+@time: 2026/10/19
+@contact: jeza@vip.qq.com
+@site:
+@software: PyCharm
+@description: Synthetic workloads with Zipfian keyword frequencies, i.e. databases and query logs
+"""
+import itertools
+import random
+import typing
+
+__all__ = [
+    "LENGTH_DISTRIBUTIONS",
+    "IDENTIFIER_DISTRIBUTIONS",
+    "zipf_list_lengths",
+    "fake_zipf_db",
+    "write_zipf_db",
+    "iter_zipf_queries",
+    "write_zipf_query_log",
+]
+
+LENGTH_DISTRIBUTIONS = ("zipf", "uniform")
+IDENTIFIER_DISTRIBUTIONS = ("random", "documents")
+_QUERY_CHUNK_SIZE = 1 << 16
+
+
+def zipf_list_lengths(keyword_count: int, total_size: int, exponent: float = 1.0) -> typing.List[int]:
+    """
+    The list lengths of the keywords ranked by frequency, where the length of the i-th keyword
+    is proportional to 1 / i^exponent, each length is at least 1 and they sum to total_size
+    """
+    if keyword_count <= 0 or total_size < keyword_count:
+        raise ValueError("The total size must be at least the number of keywords, which must be positive.")
+    weights = [rank ** -exponent for rank in range(1, keyword_count + 1)]
+    weight_sum = sum(weights)
+    rest_size = total_size - keyword_count
+    lengths = [1 + int(rest_size * weight / weight_sum) for weight in weights]
+    for i in range(total_size - sum(lengths)):  # the rounding remainder, to the most frequent ones
+        lengths[i % keyword_count] += 1
+    return lengths
+
+
+def _keyword_of_rank(rank: int, keyword_count: int) -> str:
+    return f"w{rank:0{len(str(keyword_count))}d}"
+
+
+def _iter_identifier_blocks(keyword_count: int,
+                            total_size: int,
+                            *,
+                            exponent: float,
+                            length_distribution: str,
+                            identifier_size: int,
+                            identifier_distribution: str,
+                            document_count: typing.Optional[int],
+                            rng: random.Random) -> typing.Iterator[typing.Tuple[str, bytes]]:
+    """ Yield (keyword, concatenated identifiers) keyword by keyword, in the order of the ranks
+    """
+    if length_distribution == "zipf":
+        lengths = zipf_list_lengths(keyword_count, total_size, exponent)
+    elif length_distribution == "uniform":
+        mean_length = max(total_size // keyword_count, 1)
+        lengths = (rng.randint(1, 2 * mean_length - 1) for _ in range(keyword_count))
+    else:
+        raise ValueError(f"Unsupported list length distribution {length_distribution}, "
+                         f"it should be one of {', '.join(LENGTH_DISTRIBUTIONS)}.")
+
+    if identifier_distribution == "documents":
+        lengths = list(lengths)
+        document_count = max(lengths) if document_count is None else document_count
+        if document_count < max(lengths) or document_count >= 1 << (8 * identifier_size):
+            raise ValueError("The documents must be at least as many as the longest list, "
+                             "and their numbers must fit in the identifier size.")
+    elif identifier_distribution != "random":
+        raise ValueError(f"Unsupported identifier distribution {identifier_distribution}, "
+                         f"it should be one of {', '.join(IDENTIFIER_DISTRIBUTIONS)}.")
+
+    for rank, length in enumerate(lengths, start=1):
+        if identifier_distribution == "random":
+            identifier_block = rng.randbytes(length * identifier_size)
+        else:
+            identifier_block = b"".join(document.to_bytes(identifier_size, "big")
+                                        for document in rng.sample(range(document_count), length))
+        yield _keyword_of_rank(rank, keyword_count), identifier_block
+
+
+def fake_zipf_db(keyword_count: int,
+                 total_size: int,
+                 *,
+                 exponent: float = 1.0,
+                 length_distribution: str = "zipf",
+                 identifier_size: int = 8,
+                 identifier_distribution: str = "random",
+                 document_count: int = None,
+                 rng: random.Random = None) -> dict:
+    """
+    Generate a database in memory with Zipfian keyword frequencies, see write_zipf_db for the parameters.
+    The keywords are bytes and named by their ranks, e.g. b"w0001" is the most frequent one.
+    """
+    rng = random.Random() if rng is None else rng
+    db = {}
+    for keyword, identifier_block in _iter_identifier_blocks(keyword_count, total_size,
+                                                             exponent=exponent,
+                                                             length_distribution=length_distribution,
+                                                             identifier_size=identifier_size,
+                                                             identifier_distribution=identifier_distribution,
+                                                             document_count=document_count,
+                                                             rng=rng):
+        db[keyword.encode("utf-8")] = [identifier_block[i: i + identifier_size]
+                                       for i in range(0, len(identifier_block), identifier_size)]
+    return db
+
+
+def write_zipf_db(path: str,
+                  keyword_count: int,
+                  total_size: int,
+                  *,
+                  exponent: float = 1.0,
+                  length_distribution: str = "zipf",
+                  identifier_size: int = 8,
+                  identifier_distribution: str = "random",
+                  document_count: int = None,
+                  rng: random.Random = None) -> int:
+    """
+    Generate a database with Zipfian keyword frequencies and write it to path keyword by keyword,
+    in the json format of the client (keyword -> list of hex identifiers), so that it is never held in memory.
+    :param keyword_count: the number of distinct keywords, named by their ranks, e.g. "w0001" is the most frequent one
+    :param total_size: the number of postings (about it if the list lengths are uniform)
+    :param exponent: the exponent of the Zipf's law, the list length of the i-th keyword is proportional to
+    1 / i^exponent
+    :param length_distribution: zipf, or uniform (the list lengths are uniform in [1, 2 * mean - 1])
+    :param identifier_size: (bytes) the size of file identifier
+    :param identifier_distribution: random (uniformly random identifiers, the fastest),
+    or documents (the identifiers of a list are distinct numbers of document_count documents)
+    :param document_count: the number of documents, the length of the longest list by default
+    :return: the number of postings written
+    """
+    rng = random.Random() if rng is None else rng
+    written_size = 0
+    with open(path, "w") as f:
+        f.write("{")
+        for i, (keyword, identifier_block) in enumerate(_iter_identifier_blocks(
+                keyword_count, total_size,
+                exponent=exponent,
+                length_distribution=length_distribution,
+                identifier_size=identifier_size,
+                identifier_distribution=identifier_distribution,
+                document_count=document_count,
+                rng=rng)):
+            # the hex of the concatenated identifiers separated per identifier, without a loop over the identifiers
+            hex_identifiers = identifier_block.hex("|", identifier_size).replace("|", '", "')
+            f.write(f'{"," if i else ""}\n  "{keyword}": ["{hex_identifiers}"]')
+            written_size += len(identifier_block) // identifier_size
+        f.write("\n}\n")
+    return written_size
+
+
+def _iter_zipf_query_chunks(keyword_count: int,
+                            query_count: int,
+                            *,
+                            exponent: float,
+                            correlated: bool,
+                            rng: random.Random) -> typing.Iterator[typing.List[str]]:
+    cum_weights = list(itertools.accumulate(rank ** -exponent for rank in range(1, keyword_count + 1)))
+    keywords = [_keyword_of_rank(rank, keyword_count) for rank in range(1, keyword_count + 1)]
+    if not correlated:
+        rng.shuffle(keywords)
+    for begin in range(0, query_count, _QUERY_CHUNK_SIZE):
+        yield rng.choices(keywords, cum_weights=cum_weights, k=min(_QUERY_CHUNK_SIZE, query_count - begin))
+
+
+def iter_zipf_queries(keyword_count: int,
+                      query_count: int,
+                      *,
+                      exponent: float = 1.0,
+                      correlated: bool = True,
+                      rng: random.Random = None) -> typing.Iterator[str]:
+    """
+    Yield the queried keywords of the databases generated above, the i-th most queried one is queried
+    proportionally to 1 / i^exponent
+    :param correlated: If True, the most queried keywords are the most frequent ones (with the longest lists),
+    otherwise, the query popularity is independent of the list lengths
+    """
+    rng = random.Random() if rng is None else rng
+    for queries in _iter_zipf_query_chunks(keyword_count, query_count,
+                                           exponent=exponent, correlated=correlated, rng=rng):
+        yield from queries
+
+
+def write_zipf_query_log(path: str,
+                         keyword_count: int,
+                         query_count: int,
+                         *,
+                         exponent: float = 1.0,
+                         correlated: bool = True,
+                         rng: random.Random = None):
+    """
+    Write the Zipfian queried keywords to path, one per line, as the query log of the client
+    """
+    rng = random.Random() if rng is None else rng
+    with open(path, "w") as f:
+        for queries in _iter_zipf_query_chunks(keyword_count, query_count,
+                                               exponent=exponent, correlated=correlated, rng=rng):
+            f.write("\n".join(queries) + "\n")